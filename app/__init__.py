@@ -1,14 +1,13 @@
-from flask import Flask
+from flask import Flask, g
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_cors import CORS
 from flask_caching import Cache
 from flask_jwt_extended import JWTManager
-from flask_mail import Mail
-from apscheduler.schedulers.background import BackgroundScheduler
+from datetime import datetime, timezone
+import importlib
 import logging
-from logging.handlers import RotatingFileHandler
 import os
 
 # Initialize extensions
@@ -17,8 +16,34 @@ migrate = Migrate()
 login_manager = LoginManager()
 cache = Cache()
 jwt = JWTManager()
-mail = Mail()
-scheduler = BackgroundScheduler()
+
+# Blueprint modules under app.routes, registered in this order
+BLUEPRINT_MODULES = (
+    'auth', 'stock', 'portfolio', 'watchlist', 'screener',
+    'alerts', 'main', 'admin', 'financial'
+)
+
+def _create_mail():
+    from flask_mail import Mail
+    return Mail()
+
+def _create_scheduler():
+    from apscheduler.schedulers.background import BackgroundScheduler
+    return BackgroundScheduler()
+
+# Rarely used extensions are built on first access (PEP 562) so CLI commands,
+# migrations and workers that never send mail skip importing them.
+_LAZY_EXTENSIONS = {
+    'mail': _create_mail,
+    'scheduler': _create_scheduler,
+}
+
+def __getattr__(name):
+    factory = _LAZY_EXTENSIONS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    extension = globals()[name] = factory()
+    return extension
 
 def create_app(config_name='default'):
     """Application factory pattern"""
@@ -31,13 +56,24 @@ def create_app(config_name='default'):
     # Load configuration
     app.config.from_object(config[config_name])
 
+    from app.models.user import configure_password_hasher
+    configure_password_hasher(app.config)
+
+    # Encode jsonify responses with orjson when it is installed
+    from app.json_provider import ORJSONProvider, ORJSON_AVAILABLE
+    if ORJSON_AVAILABLE:
+        app.json = ORJSONProvider(app)
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     cache.init_app(app)
     jwt.init_app(app)
-    mail.init_app(app)
+
+    # Mail can only send with an account configured (it is also the default sender)
+    if app.config.get('MAIL_SERVER') and app.config.get('MAIL_USERNAME'):
+        __getattr__('mail').init_app(app)
     
     # Configure CORS with proper origins
     if config_name == 'production':
@@ -50,6 +86,15 @@ def create_app(config_name='default'):
     else:
         CORS(app, supports_credentials=True)
 
+    # Compress large responses (Brotli or gzip, as the client accepts) when
+    # Flask-Compress is installed
+    try:
+        from flask_compress import Compress
+    except ImportError:
+        logging.getLogger(__name__).warning("Flask-Compress not available, responses are sent uncompressed")
+    else:
+        Compress(app)
+
     # Configure login manager
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
@@ -60,7 +105,7 @@ def create_app(config_name='default'):
         from app.models import User
         try:
             uid = int(user_id) if isinstance(user_id, str) else user_id
-            return db.session.get(User, uid)
+            return User.get_cached(uid)
         except (ValueError, TypeError):
             return None
 
@@ -71,35 +116,56 @@ def create_app(config_name='default'):
         identity = jwt_data["sub"]
         try:
             uid = int(identity) if isinstance(identity, str) else identity
-            return db.session.get(User, uid)
+            return User.get_cached(uid)
         except (ValueError, TypeError):
             return None
 
+    # One timestamp per request for model defaults (see app.models.timestamps)
+    @app.before_request
+    def set_request_now():
+        g.request_now = datetime.now(timezone.utc)
+
+    # Drop per-request state; the app context (and g) can outlive a single
+    # request, e.g. in tests and CLI commands
+    @app.teardown_request
+    def clear_request_caches(exc):
+        g.pop('_stockcache', None)
+        g.pop('request_now', None)
+        g.pop('request_now_iso', None)
+        g.pop('_jwt_user_id', None)
+
     # Register blueprints
-    from app.routes import auth, stock, portfolio, watchlist, screener, alerts, main, admin, financial
-    app.register_blueprint(auth.bp)
-    app.register_blueprint(stock.bp)
-    app.register_blueprint(portfolio.bp)
-    app.register_blueprint(watchlist.bp)
-    app.register_blueprint(screener.bp)
-    app.register_blueprint(alerts.bp)
-    app.register_blueprint(main.bp)
-    app.register_blueprint(admin.bp)
-    app.register_blueprint(financial.bp)
+    from app.routes.converters import TickerConverter
+    app.url_map.converters['ticker'] = TickerConverter
+    for module_name in BLUEPRINT_MODULES:
+        app.register_blueprint(importlib.import_module(f'app.routes.{module_name}').bp)
 
     # Setup logging
     if not app.debug and not app.testing:
-        if not os.path.exists('logs'):
-            os.mkdir('logs')
-        file_handler = RotatingFileHandler('logs/stockanalyzer.log',
-                                           maxBytes=10240000, backupCount=10)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s '
-            '[in %(pathname)s:%(lineno)d]'))
-        file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
+        # Under Gunicorn every worker would share (and rotate) one file, so logs
+        # stay on Flask's stderr handler for the supervisor to collect
+        log_to_file = app.config.get('LOG_TO_FILE')
+        if log_to_file is None:
+            log_to_file = not os.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn')
+
+        if log_to_file:
+            from logging.handlers import RotatingFileHandler
+            if not os.path.exists('logs'):
+                os.mkdir('logs')
+            file_handler = RotatingFileHandler('logs/stockanalyzer.log',
+                                               maxBytes=10240000, backupCount=10)
+            file_handler.setFormatter(logging.Formatter(
+                '%(asctime)s %(levelname)s: %(message)s '
+                '[in %(pathname)s:%(lineno)d]'))
+            file_handler.setLevel(logging.INFO)
+            app.logger.addHandler(file_handler)
 
         app.logger.setLevel(logging.INFO)
+
+        # Request threads only enqueue records (including those of the
+        # app.* module loggers, which propagate here); a listener thread writes
+        from app.log_queue import enable_queue_logging
+        enable_queue_logging(app.logger)
         app.logger.info('Stock Analyzer startup')
 
     # Initialize data scheduler for historical price updates
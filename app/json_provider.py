@@ -0,0 +1,74 @@
+"""
+orjson-backed JSON provider for jsonify and request.get_json
+"""
+
+import logging
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+# Try to import orjson, fallback to the stdlib json provider
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not available, using standard json")
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Drop-in replacement for Flask's default provider that encodes with orjson.
+
+    Output matches DefaultJSONProvider apart from non-ASCII text being written
+    as UTF-8 instead of \\u escapes and NaN/Infinity becoming null (valid
+    JSON for the frontend): keys are sorted when sort_keys is set,
+    datetimes go through the default hook (HTTP date strings), and anything
+    orjson cannot encode (pretty printing, big ints, custom kwargs) falls
+    back to the stdlib encoder.
+    """
+
+    OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY |
+               orjson.OPT_PASSTHROUGH_DATETIME) if ORJSON_AVAILABLE else 0
+
+    def dumps(self, obj, **kwargs):
+        body = self._encode(obj, **kwargs)
+        if body is None:
+            return super().dumps(obj, **kwargs)
+        return body.decode('utf-8')
+
+    def _encode(self, obj, **kwargs):
+        """Encode obj to UTF-8 bytes with orjson, or None if it cannot"""
+        # jsonify() asks for compact separators, which is all orjson emits
+        options = {k: v for k, v in kwargs.items() if (k, v) != ('separators', (',', ':'))}
+        if options.keys() - {'sort_keys'}:
+            return None
+
+        option = self.OPTIONS
+        if options.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return None
+
+    def response(self, *args, **kwargs):
+        """
+        Build the jsonify() response straight from orjson's bytes, skipping
+        the str round trip the default provider makes. Debug and non-compact
+        responses keep the indented stdlib output.
+        """
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self._encode(obj)
+        if body is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
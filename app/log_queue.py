@@ -0,0 +1,41 @@
+"""
+Hand log records to a background thread so request threads never block on log I/O
+"""
+
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records as they are. The stdlib version
+    formats the message and traceback in prepare() so records can be
+    pickled; the queue here never leaves the process, so that work is left
+    to the listener thread's handlers.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def enable_queue_logging(logger):
+    """
+    Move the logger's handlers behind a queue drained by a QueueListener
+    thread. Logging calls then only enqueue; formatting and writes happen on
+    the listener, which is flushed and stopped at interpreter exit.
+    Returns the listener, or None if the logger has no handlers.
+    """
+    handlers = list(logger.handlers)
+    if not handlers:
+        return None
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(DeferredQueueHandler(log_queue))
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -1,8 +1,44 @@
+import threading
 from functools import wraps
+from cachetools import TTLCache
 from flask import jsonify
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
 from app import db
 from app.models import User
+from app.middleware.jwt_cache import clear_jwt_cache, verify_jwt_cached
+
+# Admin flags keyed by user id, kept for a minute so role changes stay visible
+# without a lookup on every admin request
+_user_cache = TTLCache(maxsize=5000, ttl=60)
+_cache_lock = threading.Lock()
+
+def _get_admin_flag(user_id):
+    """Return the user's is_admin flag, or None if the user does not exist"""
+    with _cache_lock:
+        if user_id in _user_cache:
+            return _user_cache[user_id]
+
+    # Only the flag is needed; skip the rest of the row (including JSON settings)
+    flag = db.session.execute(
+        db.select(User.is_admin).where(User.id == user_id)
+    ).scalar_one_or_none()
+    is_admin = None if flag is None else bool(flag)
+
+    with _cache_lock:
+        _user_cache[user_id] = is_admin
+    return is_admin
+
+def invalidate_admin_cache(user_id=None):
+    """
+    Drop cached admin state after a user is changed or deleted.
+    Clears everything when no user id is given.
+    """
+    if user_id is None:
+        clear_jwt_cache()
+    with _cache_lock:
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(user_id, None)
 
 def admin_required(f):
     """
@@ -13,21 +49,19 @@ def admin_required(f):
     def decorated_function(*args, **kwargs):
         # Verify JWT token exists
         try:
-            verify_jwt_in_request()
+            current_user_id = verify_jwt_cached()
         except Exception as e:
             return jsonify({'error': 'Invalid or missing token'}), 401
 
-        # Get current user
-        current_user_id = get_jwt_identity()
         if not current_user_id:
             return jsonify({'error': 'Authentication required'}), 401
 
         # Check if user exists and is admin
-        user = db.session.get(User, int(current_user_id))
-        if not user:
+        is_admin = _get_admin_flag(current_user_id)
+        if is_admin is None:
             return jsonify({'error': 'User not found'}), 404
 
-        if not user.is_admin:
+        if not is_admin:
             return jsonify({'error': 'Admin privileges required'}), 403
 
         # User is admin, proceed with the request
@@ -41,12 +75,14 @@ def get_admin_user():
     Returns None if user is not authenticated or not an admin.
     """
     try:
-        verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        user = db.session.get(User, int(current_user_id))
+        current_user_id = verify_jwt_cached()
+        if not _get_admin_flag(current_user_id):
+            return None
+
+        user = db.session.get(User, current_user_id)
 
         if user and user.is_admin:
             return user
         return None
     except:
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,13 @@
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+
+def current_user_id():
+    """
+    Return the current request's JWT identity as an int.
+    Tokens store the id as a string; it is parsed once per request and kept
+    on g (cleared in the app's teardown_request).
+    """
+    user_id = g.get('_jwt_user_id')
+    if user_id is None:
+        user_id = g._jwt_user_id = int(get_jwt_identity())
+    return user_id
@@ -0,0 +1,88 @@
+"""
+Short-lived cache of verified access tokens
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+from cachetools import TTLCache
+from flask import g, request
+from flask_jwt_extended import verify_jwt_in_request
+from flask_jwt_extended.config import config as jwt_config
+from flask_jwt_extended.view_decorators import _load_user
+from app.middleware.identity import current_user_id
+
+# Verified tokens keyed by a truncated SHA-256 of the Authorization header (the
+# raw token is never stored). Only successful verifications are cached, and the
+# TTL keeps token expiry and deleted users visible within half a minute.
+_jwt_cache = TTLCache(maxsize=10000, ttl=30)
+_cache_lock = threading.Lock()
+
+def _token_key():
+    """Return the cache key for the request's Authorization header"""
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header:
+        return None
+    return hashlib.sha256(auth_header.encode('utf-8')).hexdigest()[:32]
+
+def verify_jwt_cached():
+    """
+    Verify the request JWT, reusing a recent verification of the same token.
+    On a cache hit the decoded token is restored into the request context so
+    get_jwt_identity(), get_jwt() and current_user_id() keep working in the
+    view; the user_lookup_loader still runs per request (as in
+    verify_jwt_in_request) so get_current_user() gets this request's user.
+    Returns the user id from the token.
+    """
+    key = _token_key()
+    entry = None
+    if key:
+        with _cache_lock:
+            entry = _jwt_cache.get(key)
+
+    if entry and entry['exp'] > time.time():
+        g._jwt_extended_jwt_user = _load_user(entry['header'], entry['data'])
+        g._jwt_extended_jwt_header = entry['header']
+        g._jwt_extended_jwt = entry['data']
+        g._jwt_extended_jwt_location = 'headers'
+        g._jwt_user_id = entry['user_id']
+        return entry['user_id']
+
+    jwt_header, jwt_data = verify_jwt_in_request()
+    user_id = current_user_id()
+
+    if key:
+        with _cache_lock:
+            _jwt_cache[key] = {
+                'user_id': user_id,
+                'header': jwt_header,
+                'data': jwt_data,
+                'exp': jwt_data.get('exp', 0)
+            }
+    return user_id
+
+def clear_jwt_cache():
+    """Forget every cached verification"""
+    with _cache_lock:
+        _jwt_cache.clear()
+
+def require_jwt_cached():
+    """
+    Verify the request JWT with verify_jwt_cached() unless the method is
+    exempt (OPTIONS by default). Usable as a blueprint before_request hook.
+    """
+    if request.method not in jwt_config.exempt_methods:
+        verify_jwt_cached()
+
+def cached_jwt_required(fn):
+    """
+    Drop-in for @jwt_required() on access-token routes that skips the
+    signature check and decode for a token verified in the last 30 seconds.
+    Failed verifications raise the usual Flask-JWT-Extended errors.
+    """
+    @wraps(fn)
+    def decorated_function(*args, **kwargs):
+        require_jwt_cached()
+        return fn(*args, **kwargs)
+
+    return decorated_function
@@ -1,9 +1,10 @@
 from .user import User
 from .portfolio import Portfolio, Transaction
 from .watchlist import Watchlist
-from .alert import Alert
+from .alert import Alert, check_triggers_bulk
 from .stock_cache import StockCache
 from .historical_price import HistoricalPrice, DataCollectionMetadata
+from . import user_counters  # registers the counter listeners
 
 __all__ = ['User', 'Portfolio', 'Transaction', 'Watchlist', 'Alert', 'StockCache',
-           'HistoricalPrice', 'DataCollectionMetadata']
\ No newline at end of file
+           'HistoricalPrice', 'DataCollectionMetadata', 'check_triggers_bulk']
\ No newline at end of file
@@ -1,8 +1,44 @@
-from datetime import datetime, timezone
+import numpy as np
+from sqlalchemy import case, update
+from sqlalchemy.orm.attributes import set_committed_value
 from app import db
+from app.models.serializers import dict_serializer
+from app.models.timestamps import request_now
 
+# Numeric alert type codes used by check_triggers_bulk
+ALERT_TYPE_CODES = {'PRICE_ABOVE': 0, 'PRICE_BELOW': 1, 'PERCENT_CHANGE': 2}
+
+@dict_serializer({
+    'id': 'raw',
+    'ticker': 'raw',
+    'company_name': 'raw',
+    'alert_type': 'raw',
+    'condition_type': ('alert_type', "'above' if {v} == 'PRICE_ABOVE' else 'below'"),  # Simplified for frontend
+    'target_value': 'round2',
+    'target_price': ('target_value', 'round2'),  # Alias
+    'current_value': 'round2_or_none',
+    'current_price': ('current_value', 'round2_or_none'),  # Alias
+    'last_price': ('current_value', 'round2_or_none'),  # Another alias
+    'is_active': 'raw',
+    'is_triggered': 'raw',
+    'triggered': ('is_triggered', 'raw'),  # Alias
+    'triggered_at': 'isoformat',
+    'acknowledged': 'raw',
+    'created_at': 'isoformat',
+    'last_checked': 'isoformat',
+    'notify_email': 'raw',
+    'notify_push': 'raw',
+    'notes': 'raw'
+})
 class Alert(db.Model):
     __tablename__ = 'alerts'
+    __table_args__ = (
+        # Per-user listings filter on active/triggered state and group by ticker
+        db.Index('idx_alerts_user_active', 'user_id', 'is_active', 'is_triggered', 'ticker'),
+        # The alert sweep only reads active, untriggered alerts (partial index on PostgreSQL)
+        db.Index('idx_alerts_ticker_active', 'ticker', 'is_active',
+                 postgresql_where=db.text('is_active AND NOT is_triggered')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -14,7 +50,7 @@ class Alert(db.Model):
     is_triggered = db.Column(db.Boolean, default=False)
     triggered_at = db.Column(db.DateTime)
     acknowledged = db.Column(db.Boolean, default=False)  # NEW: For notification center
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=request_now)
     last_checked = db.Column(db.DateTime)
 
     # Notification settings
@@ -31,8 +67,9 @@ class Alert(db.Model):
         if not self.is_active or self.is_triggered:
             return False
 
+        now = request_now()
         self.current_value = current_price
-        self.last_checked = datetime.now(timezone.utc)
+        self.last_checked = now
 
         triggered = False
         if self.alert_type == 'PRICE_ABOVE':
@@ -45,7 +82,7 @@ class Alert(db.Model):
 
         if triggered:
             self.is_triggered = True
-            self.triggered_at = datetime.now(timezone.utc)
+            self.triggered_at = now
             return True
 
         return False
@@ -56,30 +93,58 @@ class Alert(db.Model):
         self.triggered_at = None
         self.notification_sent = False
 
-    def to_dict(self):
-        """Convert alert to dictionary"""
-        return {
-            'id': self.id,
-            'ticker': self.ticker,
-            'company_name': self.company_name,
-            'alert_type': self.alert_type,
-            'condition_type': 'above' if self.alert_type == 'PRICE_ABOVE' else 'below',  # Simplified for frontend
-            'target_value': round(self.target_value, 2) if self.target_value else 0,
-            'target_price': round(self.target_value, 2) if self.target_value else 0,  # Alias
-            'current_value': round(self.current_value, 2) if self.current_value else None,
-            'current_price': round(self.current_value, 2) if self.current_value else None,  # Alias
-            'last_price': round(self.current_value, 2) if self.current_value else None,  # Another alias
-            'is_active': self.is_active,
-            'is_triggered': self.is_triggered,
-            'triggered': self.is_triggered,  # Alias
-            'triggered_at': self.triggered_at.isoformat() if self.triggered_at else None,
-            'acknowledged': self.acknowledged,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_checked': self.last_checked.isoformat() if self.last_checked else None,
-            'notify_email': self.notify_email,
-            'notify_push': self.notify_push,
-            'notes': self.notes
-        }
-
     def __repr__(self):
-        return f'<Alert {self.ticker} {self.alert_type} {self.target_value}>'
\ No newline at end of file
+        return f'<Alert {self.ticker} {self.alert_type} {self.target_value}>'
+
+def check_triggers_bulk(alerts, price_map, now=None):
+    """
+    Vectorized Alert.check_trigger for a batch of alerts.
+
+    Compares every alert against price_map ({ticker: current_price}) in one
+    NumPy pass and writes the results with two bulk UPDATE statements
+    (the caller commits). Inactive, already triggered and unpriced alerts
+    are skipped. Returns the newly triggered alerts.
+    """
+    alerts = [a for a in alerts
+              if a.is_active and not a.is_triggered and price_map.get(a.ticker) is not None]
+    if not alerts:
+        return []
+
+    if now is None:
+        now = request_now()
+
+    count = len(alerts)
+    targets = np.fromiter((a.target_value for a in alerts), dtype=np.float64, count=count)
+    types = np.fromiter((ALERT_TYPE_CODES.get(a.alert_type, -1) for a in alerts), dtype=np.int8, count=count)
+    prices = np.fromiter((price_map[a.ticker] for a in alerts), dtype=np.float64, count=count)
+
+    above = (types == ALERT_TYPE_CODES['PRICE_ABOVE']) & (prices >= targets)
+    below = (types == ALERT_TYPE_CODES['PRICE_BELOW']) & (prices <= targets)
+    triggered = [alerts[i] for i in np.flatnonzero(above | below)]
+
+    # Record the checked price for every alert in a single statement
+    ticker_prices = {a.ticker: float(price_map[a.ticker]) for a in alerts}
+    db.session.execute(
+        update(Alert)
+        .where(Alert.id.in_([a.id for a in alerts]))
+        .values(current_value=case(ticker_prices, value=Alert.ticker), last_checked=now)
+        .execution_options(synchronize_session=False)
+    )
+
+    if triggered:
+        db.session.execute(
+            update(Alert)
+            .where(Alert.id.in_([a.id for a in triggered]))
+            .values(is_triggered=True, triggered_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    # Mirror the UPDATEs on the loaded objects without marking them dirty
+    for alert in alerts:
+        set_committed_value(alert, 'current_value', ticker_prices[alert.ticker])
+        set_committed_value(alert, 'last_checked', now)
+    for alert in triggered:
+        set_committed_value(alert, 'is_triggered', True)
+        set_committed_value(alert, 'triggered_at', now)
+
+    return triggered
@@ -2,11 +2,25 @@
 Historical Price Model for storing stock price history
 """
 
+import csv
+import io
 from app import db
-from datetime import datetime
+from datetime import date, datetime
 from sqlalchemy import Index, UniqueConstraint
-
-
+from app.models.serializers import dict_serializer
+from app.models.timestamps import request_now
+
+
+@dict_serializer({
+    'date': 'isoformat',
+    'open': 'float_or_none',
+    'high': 'float_or_none',
+    'low': 'float_or_none',
+    'close': 'float_or_none',
+    'adjusted_close': 'float_or_none',
+    'volume': 'int_or_none',
+    'source': 'raw'
+})
 class HistoricalPrice(db.Model):
     """
     Store historical stock prices in local database
@@ -29,29 +43,114 @@ class HistoricalPrice(db.Model):
 
     # Metadata
     source = db.Column(db.String(50))  # 'yfinance', 'alpha_vantage', 'finnhub', 'manual'
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=request_now)
+    updated_at = db.Column(db.DateTime, default=request_now, onupdate=request_now)
 
-    # Unique constraint to prevent duplicate entries
+    # Unique constraint to prevent duplicate entries; its (ticker, date) index
+    # also serves ticker-only and ticker + date range lookups
     __table_args__ = (
         UniqueConstraint('ticker', 'date', name='uq_ticker_date'),
-        Index('idx_ticker', 'ticker'),
         Index('idx_date', 'date'),
-        Index('idx_ticker_date', 'ticker', 'date'),
     )
 
-    def to_dict(self):
-        """Convert to dictionary for JSON serialization"""
-        return {
-            'date': self.date.isoformat() if self.date else None,
-            'open': float(self.open) if self.open else None,
-            'high': float(self.high) if self.high else None,
-            'low': float(self.low) if self.low else None,
-            'close': float(self.close) if self.close else None,
-            'adjusted_close': float(self.adjusted_close) if self.adjusted_close else None,
-            'volume': int(self.volume) if self.volume else None,
-            'source': self.source
-        }
+    # Columns written by bulk_copy, in CSV order
+    BULK_COLUMNS = ('ticker', 'date', 'open', 'high', 'low', 'close',
+                    'adjusted_close', 'volume', 'source', 'created_at', 'updated_at')
+
+    @staticmethod
+    def parse_date(value):
+        """Accept date objects or ISO strings ('2024-01-31' / '2024-01-31 00:00:00')"""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(str(value)[:10])
+
+    @classmethod
+    def _bulk_values(cls, rows):
+        """Normalize row dicts to BULK_COLUMNS tuples, last row per (ticker, date) wins"""
+        now = request_now()
+        values = {}
+        for row in rows:
+            row_date = cls.parse_date(row['date'])
+            volume = row.get('volume')
+            values[(row['ticker'], row_date)] = (
+                row['ticker'], row_date,
+                row.get('open'), row.get('high'), row.get('low'), row.get('close'),
+                row.get('adjusted_close'),
+                int(float(volume)) if volume is not None else None,
+                row.get('source'), now, now
+            )
+        return list(values.values())
+
+    @classmethod
+    def bulk_copy(cls, rows):
+        """
+        Insert many price rows at once, skipping (ticker, date) pairs that
+        already exist. Each row is a dict with ticker, date, close and
+        optional open/high/low/adjusted_close/volume/source.
+
+        PostgreSQL streams the rows with COPY into a temp table and moves
+        them over with INSERT ... SELECT ... ON CONFLICT DO NOTHING; SQLite
+        uses INSERT ... ON CONFLICT DO NOTHING and other databases a plain
+        executemany INSERT. Timestamps are set explicitly.
+        Returns the number of rows inserted.
+        """
+        values = cls._bulk_values(rows)
+        if not values:
+            return 0
+
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            return cls._copy_postgres(values)
+
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(cls.__table__).on_conflict_do_nothing(index_elements=['ticker', 'date'])
+        else:
+            stmt = db.insert(cls.__table__)
+
+        try:
+            result = db.session.execute(stmt, [dict(zip(cls.BULK_COLUMNS, v)) for v in values])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return result.rowcount
+
+    @classmethod
+    def _copy_postgres(cls, values):
+        """COPY values into a temp table, then merge into historical_prices"""
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for value in values:
+            # Empty unquoted fields are read back as NULL by COPY ... CSV
+            writer.writerow('' if v is None else v for v in value)
+        buf.seek(0)
+
+        columns = ', '.join(cls.BULK_COLUMNS)
+        conn = db.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f'CREATE TEMP TABLE tmp_historical_prices ON COMMIT DROP AS '
+                f'SELECT {columns} FROM {cls.__tablename__} WITH NO DATA'
+            )
+            cursor.copy_expert(f'COPY tmp_historical_prices ({columns}) FROM STDIN WITH CSV', buf)
+            cursor.execute(
+                f'INSERT INTO {cls.__tablename__} ({columns}) '
+                f'SELECT {columns} FROM tmp_historical_prices '
+                f'ON CONFLICT (ticker, date) DO NOTHING'
+            )
+            inserted = cursor.rowcount
+            conn.commit()
+            cursor.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return inserted
 
     def __repr__(self):
         return f'<HistoricalPrice {self.ticker} {self.date} ${self.close}>'
@@ -87,8 +186,8 @@ class DataCollectionMetadata(db.Model):
     is_active = db.Column(db.Boolean, default=True)
 
     # Metadata
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=request_now)
+    updated_at = db.Column(db.DateTime, default=request_now, onupdate=request_now)
 
     __table_args__ = (
         Index('idx_metadata_ticker', 'ticker'),
@@ -1,7 +1,23 @@
-from datetime import datetime, timezone
 from app import db
 from sqlalchemy import func
+from app.models.serializers import dict_serializer
+from app.models.timestamps import request_now
 
+@dict_serializer({
+    'id': 'raw',
+    'ticker': 'raw',
+    'shares': 'raw',
+    'avg_price': 'round2',
+    'total_invested': 'round2',
+    'current_price': 'round2',
+    'current_value': 'round2',
+    'gain_loss': 'round2',
+    'gain_loss_percent': 'round2',
+    'company_name': 'raw',
+    'sector': 'raw',
+    'market': 'raw',
+    'last_updated': 'isoformat'
+})
 class Portfolio(db.Model):
     __tablename__ = 'portfolios'
 
@@ -15,7 +31,7 @@ class Portfolio(db.Model):
     current_value = db.Column(db.Float, default=0)
     gain_loss = db.Column(db.Float, default=0)
     gain_loss_percent = db.Column(db.Float, default=0)
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, default=request_now)
 
     # Additional metadata
     company_name = db.Column(db.String(255))
@@ -35,29 +51,28 @@ class Portfolio(db.Model):
             self.gain_loss_percent = (self.gain_loss / self.total_invested) * 100
         else:
             self.gain_loss_percent = 0
-        self.last_updated = datetime.now(timezone.utc)
-
-    def to_dict(self):
-        """Convert portfolio item to dictionary"""
-        return {
-            'id': self.id,
-            'ticker': self.ticker,
-            'shares': self.shares,
-            'avg_price': round(self.avg_price, 2) if self.avg_price else 0,
-            'total_invested': round(self.total_invested, 2) if self.total_invested else 0,
-            'current_price': round(self.current_price, 2) if self.current_price else 0,
-            'current_value': round(self.current_value, 2) if self.current_value else 0,
-            'gain_loss': round(self.gain_loss, 2) if self.gain_loss else 0,
-            'gain_loss_percent': round(self.gain_loss_percent, 2) if self.gain_loss_percent else 0,
-            'company_name': self.company_name,
-            'sector': self.sector,
-            'market': self.market,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None
-        }
+        self.last_updated = request_now()
 
 
+@dict_serializer({
+    'id': 'raw',
+    'ticker': 'raw',
+    'transaction_type': 'raw',
+    'shares': 'raw',
+    'price': 'round2',
+    'total_amount': 'round2',
+    'transaction_date': 'isoformat',
+    'notes': 'raw',
+    'fees': 'round2',
+    'tax': 'round2',
+    'net_amount': 'round2',
+    'created_at': 'isoformat'
+})
 class Transaction(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        db.Index('idx_transactions_user_date', 'user_id', 'transaction_date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -66,9 +81,9 @@ class Transaction(db.Model):
     shares = db.Column(db.Float, nullable=False)
     price = db.Column(db.Float, nullable=False)
     total_amount = db.Column(db.Float, nullable=False)
-    transaction_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    transaction_date = db.Column(db.DateTime, nullable=False, default=request_now)
     notes = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=request_now)
 
     # For tracking fees and taxes
     fees = db.Column(db.Float, default=0)
@@ -80,22 +95,5 @@ class Transaction(db.Model):
         self.total_amount = self.shares * self.price
         self.net_amount = self.total_amount + (self.fees or 0) + (self.tax or 0)
 
-    def to_dict(self):
-        """Convert transaction to dictionary"""
-        return {
-            'id': self.id,
-            'ticker': self.ticker,
-            'transaction_type': self.transaction_type,
-            'shares': self.shares,
-            'price': round(self.price, 2) if self.price else 0,
-            'total_amount': round(self.total_amount, 2) if self.total_amount else 0,
-            'transaction_date': self.transaction_date.isoformat() if self.transaction_date else None,
-            'notes': self.notes,
-            'fees': round(self.fees, 2) if self.fees else 0,
-            'tax': round(self.tax, 2) if self.tax else 0,
-            'net_amount': round(self.net_amount, 2) if self.net_amount else 0,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
-
     def __repr__(self):
         return f'<Transaction {self.transaction_type} {self.shares} {self.ticker}>'
\ No newline at end of file
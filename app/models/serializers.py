@@ -0,0 +1,56 @@
+"""
+Generated to_dict serializers for the API models
+"""
+
+# Expression templates for each field kind; {v} is the attribute value
+FIELD_KINDS = {
+    'raw': '{v}',
+    'round2': 'round({v}, 2) if {v} else 0',
+    'round2_or_none': 'round({v}, 2) if {v} else None',
+    'isoformat': '{v}.isoformat() if {v} else None',
+    'float_or_none': 'float({v}) if {v} else None',
+    'int_or_none': 'int({v}) if {v} else None',
+    'list': '{v} if {v} else []',
+}
+
+def _build_source(fields):
+    """Return the source of a to_dict function for the given field spec"""
+    attributes = {}
+    items = []
+    for key, spec in fields.items():
+        attribute, kind = spec if isinstance(spec, tuple) else (key, spec)
+        template = FIELD_KINDS.get(kind, kind)
+        if '{v}' not in template:
+            raise ValueError(f'Unknown serializer kind for {key!r}: {kind!r}')
+        var = attributes.setdefault(attribute, f'v{len(attributes)}')
+        items.append(f'        {key!r}: {template.format(v=var)},')
+
+    lines = ['def to_dict(self):']
+    lines += [f'    {var} = self.{attribute}' for attribute, var in attributes.items()]
+    lines += ['    return {', *items, '    }']
+    return '\n'.join(lines)
+
+def dict_serializer(fields):
+    """
+    Class decorator that installs a generated to_dict method.
+
+    fields maps each output key to a kind from FIELD_KINDS (or an
+    expression template using {v}), or to an (attribute, kind) tuple when
+    the key is an alias for another attribute. Each attribute is read once
+    and the dict is built in a single literal, so no per-field dispatch
+    happens at call time.
+    """
+    source = _build_source(fields)
+
+    def decorator(cls):
+        namespace = {}
+        exec(compile(source, f'<{cls.__name__}.to_dict>', 'exec'), namespace)
+        to_dict = namespace['to_dict']
+        to_dict.__qualname__ = f'{cls.__name__}.to_dict'
+        to_dict.__module__ = cls.__module__
+        to_dict.__doc__ = f'Convert {cls.__name__} to dictionary'
+        to_dict.__source__ = source
+        cls.to_dict = to_dict
+        return cls
+
+    return decorator
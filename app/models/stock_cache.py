@@ -1,5 +1,27 @@
-from datetime import datetime, timezone, timedelta
-from app import db
+import logging
+from datetime import timezone, timedelta
+from flask import g, has_app_context
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import defer
+from app import db, cache
+from app.models.timestamps import request_now
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for entries in the shared Flask-Caching backend (Redis in production)
+SHARED_CACHE_TIMEOUT = 30
+
+def _request_cache():
+    """
+    Per-request {(ticker, data_type): (data, expires_at)} lookup cache.
+    Returns None outside an application context.
+    """
+    if not has_app_context():
+        return None
+    return g.setdefault('_stockcache', {})
+
+def _shared_cache_key(ticker, data_type):
+    return f'stockcache:{ticker}:{data_type}'
 
 class StockCache(db.Model):
     __tablename__ = 'stock_cache'
@@ -11,60 +33,192 @@ class StockCache(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     ticker = db.Column(db.String(20), nullable=False)
-    data = db.Column(db.JSON, nullable=False)
+    data = db.Column(db.JSON().with_variant(JSONB, 'postgresql'), nullable=False)  # binary JSONB on PostgreSQL
     data_type = db.Column(db.String(50), nullable=False)  # quote, info, history, analysis
-    cached_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    cached_at = db.Column(db.DateTime, default=request_now)
     expires_at = db.Column(db.DateTime, nullable=False)
 
     @classmethod
     def get_cached(cls, ticker, data_type='quote'):
         """Get cached data if not expired"""
-        cache = cls.query.filter_by(ticker=ticker, data_type=data_type).first()
-        if cache:
-            # Make expires_at timezone-aware if it's naive
-            expires_at = cache.expires_at
-            if expires_at.tzinfo is None:
-                expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-            if expires_at > datetime.now(timezone.utc):
-                return cache.data
-        return None
+        return cls.get_cached_bulk([ticker], data_type).get(ticker)
+
+    @classmethod
+    def get_cached_bulk(cls, tickers, data_type='quote'):
+        """
+        Get unexpired cached data for many tickers at once.
+        Returns {ticker: data} for every requested ticker, with None for
+        misses. Tickers not found in the per-request or shared cache are
+        loaded with a single IN query instead of one SELECT per ticker.
+        """
+        now = request_now()
+        results = {}
+        request_cache = _request_cache()
+
+        # Repeated lookups within one request skip the SELECT
+        pending = []
+        for ticker in dict.fromkeys(tickers):
+            entry = request_cache.get((ticker, data_type)) if request_cache is not None else None
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                results[ticker] = entry[0]
+            else:
+                pending.append(ticker)
+        if not pending:
+            return results
+
+        # Then the cache shared by all workers, then the database
+        shared_keys = [_shared_cache_key(ticker, data_type) for ticker in pending]
+        try:
+            shared = cache.get_many(*shared_keys)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {data_type}: {e}")
+            shared = [None] * len(pending)
+
+        found = {}
+        missing = []
+        for ticker, value in zip(pending, shared):
+            if value is not None:
+                found[ticker] = value
+            else:
+                missing.append(ticker)
+
+        if missing:
+            entries = cls.query.filter(cls.data_type == data_type, cls.ticker.in_(missing)).all()
+            to_share = {}
+            timeouts = []
+            for entry in entries:
+                # Make expires_at timezone-aware if it's naive
+                expires_at = entry.expires_at
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+                if expires_at > now:
+                    found[entry.ticker] = (entry.data, expires_at)
+                    # Never keep an entry in the shared cache past its expiry
+                    timeout = min(SHARED_CACHE_TIMEOUT, int((expires_at - now).total_seconds()))
+                    if timeout > 0:
+                        to_share[_shared_cache_key(entry.ticker, data_type)] = (entry.data, expires_at)
+                        timeouts.append(timeout)
+
+            if to_share:
+                try:
+                    cache.set_many(to_share, timeout=min(timeouts))
+                except Exception as e:
+                    logger.warning(f"Shared cache write failed for {data_type}: {e}")
+
+        for ticker in pending:
+            data, expires_at = found.get(ticker, (None, None))
+            results[ticker] = data
+            if request_cache is not None:
+                request_cache[(ticker, data_type)] = (data, expires_at)
+        return results
 
     @classmethod
     def set_cache(cls, ticker, data, data_type='quote', expires_at=None):
         """Set or update cache"""
-        if expires_at is None:
-            expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
-
-        cache = cls.query.filter_by(ticker=ticker, data_type=data_type).first()
-        if cache:
-            cache.data = data
-            cache.cached_at = datetime.now(timezone.utc)
-            cache.expires_at = expires_at
+        return cls.set_cache_bulk([{
+            'ticker': ticker,
+            'data': data,
+            'data_type': data_type,
+            'expires_at': expires_at
+        }])
+
+    @classmethod
+    def set_cache_bulk(cls, rows):
+        """
+        Insert or update many cache entries in one statement.
+        Each row is a dict with ticker, data and optional data_type/expires_at.
+        Uses INSERT ... ON CONFLICT (ticker, data_type) DO UPDATE on
+        PostgreSQL and SQLite, then stores the written entries in the
+        per-request cache. Returns the number of entries written.
+        """
+        now = request_now()
+
+        # ON CONFLICT cannot touch the same row twice in one statement
+        values = {}
+        for row in rows:
+            data_type = row.get('data_type') or 'quote'
+            values[(row['ticker'], data_type)] = {
+                'ticker': row['ticker'],
+                'data': row['data'],
+                'data_type': data_type,
+                'cached_at': now,
+                'expires_at': row.get('expires_at') or now + timedelta(hours=1)
+            }
+        if not values:
+            return 0
+
+        request_cache = _request_cache()
+        if request_cache is not None:
+            for key in values:
+                request_cache.pop(key, None)
+        shared_keys = [_shared_cache_key(*key) for key in values]
+        values = list(values.values())
+
+        dialect = db.session.get_bind(mapper=cls).dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
         else:
-            cache = cls(
-                ticker=ticker,
-                data=data,
-                data_type=data_type,
-                expires_at=expires_at
+            insert = None
+
+        if insert is None:
+            cls._set_cache_rows(values)
+        else:
+            stmt = insert(cls).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['ticker', 'data_type'],
+                set_={
+                    'data': stmt.excluded.data,
+                    'cached_at': stmt.excluded.cached_at,
+                    'expires_at': stmt.excluded.expires_at
+                }
             )
-            db.session.add(cache)
 
+            try:
+                db.session.execute(stmt)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+        # Only after the commit: a reader in another worker could otherwise
+        # load the old row and put it back into the shared cache
         try:
-            db.session.commit()
+            cache.delete_many(*shared_keys)
         except Exception as e:
+            logger.warning(f"Shared cache invalidation failed: {e}")
+
+        # Write through so a get_cached later in this request needs no SELECT
+        if request_cache is not None:
+            for value in values:
+                expires_at = value['expires_at']
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                request_cache[(value['ticker'], value['data_type'])] = (value['data'], expires_at)
+
+        return len(values)
+
+    @classmethod
+    def _set_cache_rows(cls, values):
+        """Row-by-row upsert for databases without ON CONFLICT support"""
+        try:
+            for value in values:
+                cache = cls.query.options(defer(cls.data)).filter_by(
+                    ticker=value['ticker'], data_type=value['data_type']).first()
+                if cache:
+                    cache.data = value['data']
+                    cache.cached_at = value['cached_at']
+                    cache.expires_at = value['expires_at']
+                else:
+                    db.session.add(cls(**value))
+            db.session.commit()
+        except Exception:
             db.session.rollback()
-            # Try to update existing record if unique constraint violation
-            cache = cls.query.filter_by(ticker=ticker, data_type=data_type).first()
-            if cache:
-                cache.data = data
-                cache.cached_at = datetime.now(timezone.utc)
-                cache.expires_at = expires_at
-                db.session.commit()
-            else:
-                raise e
-        
-        return cache
+            raise
+
+        return len(values)
 
     def __repr__(self):
         return f'<StockCache {self.ticker} {self.data_type}>'
\ No newline at end of file
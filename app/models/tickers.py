@@ -0,0 +1,21 @@
+"""
+Ticker symbol normalization shared by routes and services
+"""
+
+import sys
+
+# Width of the ticker columns (String(20))
+TICKER_MAX_LENGTH = 20
+
+def normalize_ticker(ticker):
+    """
+    Return the upper-cased, interned ticker, or None if it is empty or longer
+    than the ticker columns allow. Interned tickers hash once and compare by
+    identity in the dicts and sets keyed on them.
+    """
+    if not isinstance(ticker, str):
+        return None
+    ticker = ticker.strip().upper()
+    if not ticker or len(ticker) > TICKER_MAX_LENGTH:
+        return None
+    return sys.intern(ticker)
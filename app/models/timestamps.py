@@ -0,0 +1,30 @@
+"""
+Request-scoped UTC timestamps for model defaults
+"""
+
+from datetime import datetime, timezone
+from flask import g, has_app_context
+
+def request_now():
+    """
+    Return the UTC time captured when the current request started
+    (g.request_now), or the current UTC time outside a request.
+    Rows created or updated by one request share a single timestamp.
+    """
+    if has_app_context():
+        now = g.get('request_now')
+        if now is not None:
+            return now
+    return datetime.now(timezone.utc)
+
+def request_now_iso():
+    """
+    request_now() as an ISO 8601 string, formatted once per request and
+    kept on g (cleared in the app's teardown_request).
+    """
+    if has_app_context() and g.get('request_now') is not None:
+        iso = g.get('request_now_iso')
+        if iso is None:
+            iso = g.request_now_iso = g.request_now.isoformat()
+        return iso
+    return datetime.now(timezone.utc).isoformat()
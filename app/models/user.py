@@ -1,20 +1,88 @@
-from datetime import datetime, timezone
+import copy
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import defer, make_transient_to_detached
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from app import db
+from app.models.timestamps import request_now
+
+logger = logging.getLogger(__name__)
+
+# Try to import argon2-cffi, fallback to werkzeug hashes
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    ARGON2_AVAILABLE = True
+    # One hasher is shared by all requests; replaced by configure_password_hasher
+    _argon2 = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+except ImportError:
+    ARGON2_AVAILABLE = False
+    logger.warning("argon2-cffi not available, using werkzeug password hashes")
+
+def configure_password_hasher(config):
+    """
+    Apply the ARGON2_* work factors from the app config. Parallelism
+    defaults to 1 because hashes already run side by side on the password
+    pool below.
+    """
+    global _argon2
+    if ARGON2_AVAILABLE:
+        _argon2 = PasswordHasher(
+            time_cost=config.get('ARGON2_TIME_COST', 2),
+            memory_cost=config.get('ARGON2_MEMORY_COST', 65536),
+            parallelism=config.get('ARGON2_PARALLELISM', 1)
+        )
+
+def _argon2_verify(password_hash, password):
+    """Return True if password matches an argon2 hash"""
+    try:
+        return _argon2.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+# Password hashing is CPU-bound (argon2-cffi, or werkzeug's scrypt/PBKDF2 as the
+# fallback; both release the GIL). Running it on a pool sized to the CPU count
+# caps concurrent hashes per process, so a burst of logins on a threaded worker
+# cannot take every core from other requests.
+_password_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                    thread_name_prefix='password-hash')
+
+# Column values of users resolved by the auth loaders, keyed by id. Entries are
+# dropped when a User row is updated or deleted through the ORM; the TTL bounds
+# staleness for changes made by other workers.
+_row_cache = TTLCache(maxsize=5000, ttl=60)
+_row_cache_lock = threading.Lock()
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('idx_users_last_login', 'last_login'),
+        db.Index('idx_users_created_at', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     username = db.Column(db.String(80), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    password_hash_algo = db.Column(db.String(16), nullable=False, server_default='werkzeug',
+                                   default=lambda: 'argon2' if ARGON2_AVAILABLE else 'werkzeug')
+    created_at = db.Column(db.DateTime, default=request_now)
     last_login = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
     is_admin = db.Column(db.Boolean, default=False, nullable=False)
 
+    # Row counts and invested total of the user's content, kept current by
+    # the listeners in app.models.user_counters so admin views need no scan
+    portfolio_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    watchlist_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    alerts_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_invested = db.Column(db.Float, nullable=False, default=0, server_default='0')
+
     # Settings
     preferred_currency = db.Column(db.String(3), default='USD')
     email_notifications = db.Column(db.Boolean, default=True)
@@ -24,27 +92,92 @@ class User(UserMixin, db.Model):
         'layout': 'default'
     })
 
-    # Relationships
-    portfolio = db.relationship('Portfolio', backref='user', lazy='dynamic',
+    # Relationships (loaded once on first access; query the child models
+    # directly for filtered lists and counts)
+    portfolio = db.relationship('Portfolio', backref='user', lazy='select',
                                 cascade='all, delete-orphan')
-    transactions = db.relationship('Transaction', backref='user', lazy='dynamic',
+    transactions = db.relationship('Transaction', backref='user', lazy='select',
                                     cascade='all, delete-orphan')
-    watchlist = db.relationship('Watchlist', backref='user', lazy='dynamic',
+    watchlist = db.relationship('Watchlist', backref='user', lazy='select',
                                  cascade='all, delete-orphan')
-    alerts = db.relationship('Alert', backref='user', lazy='dynamic',
+    alerts = db.relationship('Alert', backref='user', lazy='select',
                               cascade='all, delete-orphan')
 
+    @classmethod
+    def get_cached(cls, user_id):
+        """
+        Get a user by id, skipping the SELECT if it was loaded in the last
+        minute. Cache hits return a detached copy for read-only use (auth
+        loaders) without dashboard_layout; load the user with db.session.get
+        before changing or serializing it.
+        """
+        with _row_cache_lock:
+            values = _row_cache.get(user_id)
+
+        if values is None:
+            user = db.session.get(cls, user_id, options=[defer(cls.dashboard_layout)])
+            if user is not None:
+                loaded = inspect(user).dict
+                values = {attr.key: loaded[attr.key] for attr in cls.__mapper__.column_attrs
+                          if attr.key in loaded}
+                with _row_cache_lock:
+                    _row_cache[user_id] = copy.deepcopy(values)
+            return user
+
+        user = cls(**copy.deepcopy(values))
+        make_transient_to_detached(user)
+        return user
+
+    @staticmethod
+    def invalidate_cache(user_id=None):
+        """Drop a cached user, or every cached user when no id is given"""
+        with _row_cache_lock:
+            if user_id is None:
+                _row_cache.clear()
+            else:
+                _row_cache.pop(user_id, None)
+
+    @classmethod
+    def is_taken(cls, field, value, exclude_id=None):
+        """
+        Return True if a user (other than exclude_id) already has value in
+        the given unique column. Runs a single EXISTS query without loading
+        any row.
+        """
+        query = db.session.query(cls.id).filter(getattr(cls, field) == value)
+        if exclude_id is not None:
+            query = query.filter(cls.id != exclude_id)
+        return db.session.query(query.exists()).scalar()
+
     def set_password(self, password):
-        """Set hashed password"""
-        self.password_hash = generate_password_hash(password)
+        """Set hashed password (Argon2id when argon2-cffi is installed)"""
+        if ARGON2_AVAILABLE:
+            self.password_hash = _password_pool.submit(_argon2.hash, password).result()
+            self.password_hash_algo = 'argon2'
+        else:
+            self.password_hash = _password_pool.submit(generate_password_hash, password).result()
+            self.password_hash_algo = 'werkzeug'
 
     def check_password(self, password):
-        """Check if provided password matches"""
-        return check_password_hash(self.password_hash, password)
+        """
+        Check if provided password matches. A matching werkzeug hash (or an
+        argon2 hash with outdated parameters) is replaced with a fresh argon2
+        hash; the caller's next commit persists it.
+        """
+        if self.password_hash_algo == 'argon2' and ARGON2_AVAILABLE:
+            valid = _password_pool.submit(_argon2_verify, self.password_hash, password).result()
+            needs_rehash = valid and _argon2.check_needs_rehash(self.password_hash)
+        else:
+            valid = _password_pool.submit(check_password_hash, self.password_hash, password).result()
+            needs_rehash = valid and ARGON2_AVAILABLE
+
+        if needs_rehash:
+            self.set_password(password)
+        return valid
 
     def update_last_login(self):
         """Update last login timestamp"""
-        self.last_login = datetime.now(timezone.utc)
+        self.last_login = request_now()
         db.session.commit()
 
     def to_dict(self):
@@ -63,4 +196,9 @@ class User(UserMixin, db.Model):
         }
 
     def __repr__(self):
-        return f'<User {self.username}>'
\ No newline at end of file
+        return f'<User {self.username}>'
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_cached_user(mapper, connection, target):
+    User.invalidate_cache(target.id)
\ No newline at end of file
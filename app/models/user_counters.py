@@ -0,0 +1,69 @@
+"""
+Denormalized per-user counters on the users row, maintained by mapper events
+"""
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, object_session
+from app.models.user import User
+from app.models.portfolio import Portfolio
+from app.models.watchlist import Watchlist
+from app.models.alert import Alert
+
+COUNTER_COLUMNS = ('portfolio_count', 'watchlist_count', 'alerts_count', 'total_invested')
+
+# session.info key holding the ids of users whose counters changed in a flush
+_CHANGED_KEY = 'user_counters_changed'
+
+def _update_user(connection, target, values):
+    """
+    Apply values to the target's owner in the flush's own transaction and
+    note the user so a loaded copy of it is refreshed after the flush
+    """
+    users = User.__table__
+    connection.execute(users.update().where(users.c.id == target.user_id).values(values))
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_KEY, set()).add(target.user_id)
+
+def _invested_total(user_id):
+    """Scalar subquery summing the user's invested amount over positions"""
+    return (select(func.coalesce(func.sum(Portfolio.total_invested), 0))
+            .where(Portfolio.user_id == user_id).scalar_subquery())
+
+def _counter(model, column):
+    """Register insert/delete listeners that step column by one"""
+    users = User.__table__
+
+    @event.listens_for(model, 'after_insert')
+    def _count_insert(mapper, connection, target):
+        _update_user(connection, target, {column: users.c[column] + 1})
+
+    @event.listens_for(model, 'after_delete')
+    def _count_delete(mapper, connection, target):
+        _update_user(connection, target, {column: users.c[column] - 1})
+
+_counter(Portfolio, 'portfolio_count')
+_counter(Watchlist, 'watchlist_count')
+_counter(Alert, 'alerts_count')
+
+@event.listens_for(Portfolio, 'after_insert')
+@event.listens_for(Portfolio, 'after_delete')
+def _sum_invested(mapper, connection, target):
+    _update_user(connection, target, {'total_invested': _invested_total(target.user_id)})
+
+@event.listens_for(Portfolio, 'after_update')
+def _sum_invested_on_change(mapper, connection, target):
+    # Price refreshes update positions constantly; only re-sum on a cost change
+    if inspect(target).attrs.total_invested.history.has_changes():
+        _sum_invested(mapper, connection, target)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _expire_changed_users(session, flush_context):
+    user_ids = session.info.pop(_CHANGED_KEY, None)
+    if not user_ids:
+        return
+    mapper = inspect(User)
+    for user_id in user_ids:
+        user = session.identity_map.get(mapper.identity_key_from_primary_key((user_id,)))
+        if user is not None and not inspect(user).deleted:
+            session.expire(user, COUNTER_COLUMNS)
@@ -1,13 +1,32 @@
-from datetime import datetime, timezone
 from app import db
+from app.models.serializers import dict_serializer
+from app.models.timestamps import request_now
 
+@dict_serializer({
+    'id': 'raw',
+    'ticker': 'raw',
+    'company_name': 'raw',
+    'sector': 'raw',
+    'market': 'raw',
+    'added_at': 'isoformat',
+    'added_price': 'round2_or_none',
+    'current_price': 'round2_or_none',
+    'price_change': 'round2_or_none',
+    'price_change_percent': 'round2_or_none',
+    'market_cap': 'raw',
+    'pe_ratio': 'round2_or_none',
+    'dividend_yield': 'round2_or_none',
+    'tags': 'list',
+    'notes': 'raw',
+    'last_updated': 'isoformat'
+})
 class Watchlist(db.Model):
     __tablename__ = 'watchlists'
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     ticker = db.Column(db.String(20), nullable=False, index=True)
-    added_at = db.Column(db.DateTime, default=datetime.utcnow)
+    added_at = db.Column(db.DateTime, default=request_now)
     notes = db.Column(db.Text)
 
     # Price tracking
@@ -15,7 +34,7 @@ class Watchlist(db.Model):
     current_price = db.Column(db.Float)
     price_change = db.Column(db.Float)
     price_change_percent = db.Column(db.Float)
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, default=request_now)
 
     # Stock metadata
     company_name = db.Column(db.String(255))
@@ -32,34 +51,22 @@ class Watchlist(db.Model):
         db.UniqueConstraint('user_id', 'ticker', name='unique_user_watchlist_ticker'),
     )
 
+    @classmethod
+    def contains(cls, user_id, ticker):
+        """
+        Return True if the user's watchlist already has ticker. Runs a single
+        EXISTS query without loading the row.
+        """
+        query = db.session.query(cls.id).filter_by(user_id=user_id, ticker=ticker)
+        return db.session.query(query.exists()).scalar()
+
     def update_price(self, current_price):
         """Update current price and calculate changes"""
         self.current_price = current_price
         if self.added_price:
             self.price_change = current_price - self.added_price
             self.price_change_percent = (self.price_change / self.added_price) * 100
-        self.last_updated = datetime.now(timezone.utc)
-
-    def to_dict(self):
-        """Convert watchlist item to dictionary"""
-        return {
-            'id': self.id,
-            'ticker': self.ticker,
-            'company_name': self.company_name,
-            'sector': self.sector,
-            'market': self.market,
-            'added_at': self.added_at.isoformat() if self.added_at else None,
-            'added_price': round(self.added_price, 2) if self.added_price else None,
-            'current_price': round(self.current_price, 2) if self.current_price else None,
-            'price_change': round(self.price_change, 2) if self.price_change else None,
-            'price_change_percent': round(self.price_change_percent, 2) if self.price_change_percent else None,
-            'market_cap': self.market_cap,
-            'pe_ratio': round(self.pe_ratio, 2) if self.pe_ratio else None,
-            'dividend_yield': round(self.dividend_yield, 2) if self.dividend_yield else None,
-            'tags': self.tags if self.tags else [],
-            'notes': self.notes,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None
-        }
+        self.last_updated = request_now()
 
     def __repr__(self):
         return f'<Watchlist {self.ticker} for User {self.user_id}>'
\ No newline at end of file
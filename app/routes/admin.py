@@ -2,11 +2,12 @@
 Admin Routes - API endpoints for admin operations
 """
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.middleware.admin_required import admin_required
+from flask_jwt_extended import jwt_required, get_jwt
+from app.middleware.admin_required import admin_required, invalidate_admin_cache
+from app.middleware.identity import current_user_id
+from app.routes.params import bool_arg
 from app.services.admin_service import AdminService
 from app.models import User
-from app import db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,8 +19,11 @@ bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 def check_admin():
     """Check if current user is admin"""
     try:
-        current_user = get_jwt_identity()
-        user = db.session.get(User, int(current_user))
+        # Tokens issued to non-admins say so; no lookup needed to refuse them
+        if get_jwt().get('is_admin') is False:
+            return jsonify({'error': 'Not authorized'}), 403
+
+        user = User.get_cached(current_user_id())
 
         if not user or not user.is_admin:
             return jsonify({'error': 'Not authorized'}), 403
@@ -43,14 +47,16 @@ def get_users():
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 50, type=int), 100)
         search = request.args.get('search', None)
-        is_admin = request.args.get('is_admin', None, type=lambda x: x.lower() == 'true')
+        is_admin = bool_arg('is_admin', default=None)
+        cursor = request.args.get('cursor', None, type=int)
 
         # Get users from service
         result = AdminService.get_users(
             page=page,
             per_page=per_page,
             search=search,
-            is_admin=is_admin
+            is_admin=is_admin,
+            cursor=cursor
         )
 
         return jsonify(result), 200
@@ -92,6 +98,8 @@ def update_user(user_id):
         if not user_data:
             return jsonify({'error': 'User not found'}), 404
 
+        invalidate_admin_cache(user_id)
+
         return jsonify({
             'success': True,
             'message': 'User updated successfully',
@@ -109,7 +117,7 @@ def update_user(user_id):
 def delete_user(user_id):
     """Delete user account"""
     try:
-        admin_id = int(get_jwt_identity())
+        admin_id = current_user_id()
 
         # Delete user
         success = AdminService.delete_user(user_id, admin_id)
@@ -117,6 +125,8 @@ def delete_user(user_id):
         if not success:
             return jsonify({'error': 'User not found'}), 404
 
+        invalidate_admin_cache(user_id)
+
         return jsonify({
             'success': True,
             'message': 'User deleted successfully',
@@ -134,7 +144,7 @@ def delete_user(user_id):
 def toggle_admin_status(user_id):
     """Toggle user's admin status"""
     try:
-        admin_id = int(get_jwt_identity())
+        admin_id = current_user_id()
 
         # Toggle admin status
         result = AdminService.toggle_admin_status(user_id, admin_id)
@@ -142,6 +152,8 @@ def toggle_admin_status(user_id):
         if not result:
             return jsonify({'error': 'User not found'}), 404
 
+        invalidate_admin_cache(user_id)
+
         return jsonify(result), 200
 
     except ValueError as e:
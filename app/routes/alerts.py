@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.middleware.identity import current_user_id
+from app.routes.params import bool_arg
 from app.services import AlertService
+from app.models.tickers import normalize_ticker
 
 bp = Blueprint('alerts', __name__, url_prefix='/api/alerts')
 
@@ -9,8 +12,8 @@ bp = Blueprint('alerts', __name__, url_prefix='/api/alerts')
 def get_alerts():
     """Get user's alerts"""
     try:
-        user_id = get_jwt_identity()
-        active_only = request.args.get('active_only', 'false').lower() == 'true'
+        user_id = current_user_id()
+        active_only = bool_arg('active_only')
 
         alerts = AlertService.get_user_alerts(user_id, active_only)
 
@@ -26,7 +29,7 @@ def get_alerts():
 def create_alert():
     """Create a new alert"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.get_json()
 
         # Validate required fields
@@ -35,6 +38,10 @@ def create_alert():
             if field not in data:
                 return jsonify({'error': f'{field} is required'}), 400
 
+        data['ticker'] = normalize_ticker(data['ticker'])
+        if not data['ticker']:
+            return jsonify({'error': 'Invalid ticker'}), 400
+
         # Validate alert type
         valid_types = ['PRICE_ABOVE', 'PRICE_BELOW', 'PERCENT_CHANGE']
         if data['alert_type'] not in valid_types:
@@ -59,7 +66,7 @@ def create_alert():
 def update_alert(alert_id):
     """Update an alert"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.get_json()
 
         alert = AlertService.update_alert(alert_id, user_id, data)
@@ -80,7 +87,7 @@ def update_alert(alert_id):
 def delete_alert(alert_id):
     """Delete an alert"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
 
         success = AlertService.delete_alert(alert_id, user_id)
 
@@ -99,7 +106,7 @@ def delete_alert(alert_id):
 def get_alert_statistics():
     """Get alert statistics"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         stats = AlertService.get_alert_statistics(user_id)
 
         return jsonify(stats), 200
@@ -129,7 +136,7 @@ def get_triggered_alerts():
     """Get all triggered but unacknowledged alerts"""
     try:
         from app.models.alert import Alert
-        user_id = int(get_jwt_identity())
+        user_id = current_user_id()
         
         alerts = Alert.query.filter_by(
             user_id=user_id,
@@ -150,7 +157,7 @@ def acknowledge_alert(alert_id):
         from app.models.alert import Alert
         from app import db
         
-        user_id = int(get_jwt_identity())
+        user_id = current_user_id()
         alert = Alert.query.filter_by(id=alert_id, user_id=user_id).first()
         
         if not alert:
@@ -1,16 +1,37 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 from app import db
 from app.models import User
+from app.middleware.identity import current_user_id
 from datetime import datetime
 import re
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+_EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
+
+def _conflict_error(email, exclude_id=None):
+    """
+    Error message after a unique violation on users.email or users.username.
+    Only runs on the failure path, so one EXISTS query is cheaper than
+    parsing dialect-specific constraint names.
+    """
+    if email is not None and User.is_taken('email', email, exclude_id=exclude_id):
+        return 'Email already registered'
+    return 'Username already taken'
+
+def token_claims(user):
+    """
+    Extra JWT claims for a user. is_admin lets /api/admin/check answer
+    without a database lookup; admin_required still checks the stored flag.
+    """
+    return {'is_admin': bool(user.is_admin)}
 
 @bp.route('/register', methods=['POST'])
 def register():
@@ -26,14 +47,8 @@ def register():
         if not validate_email(data['email']):
             return jsonify({'error': 'Invalid email format'}), 400
 
-        # Check if user exists
-        if User.query.filter_by(email=data['email']).first():
-            return jsonify({'error': 'Email already registered'}), 400
-
-        if User.query.filter_by(username=data['username']).first():
-            return jsonify({'error': 'Username already taken'}), 400
-
-        # Create new user
+        # Create new user; the unique indexes on email and username reject
+        # duplicates, so the happy path needs no lookup first
         user = User(
             email=data['email'],
             username=data['username'],
@@ -42,11 +57,16 @@ def register():
         user.set_password(data['password'])
 
         db.session.add(user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': _conflict_error(data['email'])}), 400
 
         # Create tokens (identity must be string for JWT)
-        access_token = create_access_token(identity=str(user.id))
-        refresh_token = create_refresh_token(identity=str(user.id))
+        claims = token_claims(user)
+        access_token = create_access_token(identity=str(user.id), additional_claims=claims)
+        refresh_token = create_refresh_token(identity=str(user.id), additional_claims=claims)
 
         return jsonify({
             'message': 'User registered successfully',
@@ -87,8 +107,9 @@ def login():
         user.update_last_login()
 
         # Create tokens (identity must be string for JWT)
-        access_token = create_access_token(identity=str(user.id))
-        refresh_token = create_refresh_token(identity=str(user.id))
+        claims = token_claims(user)
+        access_token = create_access_token(identity=str(user.id), additional_claims=claims)
+        refresh_token = create_refresh_token(identity=str(user.id), additional_claims=claims)
 
         return jsonify({
             'message': 'Login successful',
@@ -105,8 +126,13 @@ def login():
 def refresh():
     """Refresh access token"""
     try:
-        current_user_id = get_jwt_identity()
-        new_access_token = create_access_token(identity=current_user_id)
+        user = User.get_cached(current_user_id())
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+
+        # Claims are re-read so a changed admin status reaches new tokens
+        new_access_token = create_access_token(identity=str(user.id),
+                                               additional_claims=token_claims(user))
 
         return jsonify({
             'access_token': new_access_token
@@ -120,8 +146,7 @@ def refresh():
 def get_profile():
     """Get user profile"""
     try:
-        current_user_id = get_jwt_identity()
-        user = db.session.get(User, int(current_user_id))
+        user = db.session.get(User, current_user_id())
 
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -138,27 +163,21 @@ def get_profile():
 def update_profile():
     """Update user profile"""
     try:
-        current_user_id = get_jwt_identity()
-        user = db.session.get(User, int(current_user_id))
+        user = db.session.get(User, current_user_id())
 
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
         data = request.get_json()
 
-        # Update allowed fields
+        # Update allowed fields (uniqueness is enforced by the database on commit)
         if 'username' in data and data['username'] != user.username:
-            # Check if username is taken
-            if User.query.filter_by(username=data['username']).first():
-                return jsonify({'error': 'Username already taken'}), 400
             user.username = data['username']
 
         if 'email' in data and data['email'] != user.email:
-            # Validate and check if email is taken
+            # Validate email format
             if not validate_email(data['email']):
                 return jsonify({'error': 'Invalid email format'}), 400
-            if User.query.filter_by(email=data['email']).first():
-                return jsonify({'error': 'Email already registered'}), 400
             user.email = data['email']
 
         if 'preferred_currency' in data:
@@ -173,7 +192,11 @@ def update_profile():
         if 'dashboard_layout' in data:
             user.dashboard_layout = data['dashboard_layout']
 
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': _conflict_error(data.get('email'), exclude_id=user.id)}), 400
 
         return jsonify({
             'message': 'Profile updated successfully',
@@ -189,8 +212,10 @@ def update_profile():
 def change_password():
     """Change user password"""
     try:
-        current_user_id = get_jwt_identity()
-        user = db.session.get(User, int(current_user_id))
+        # Only the hash columns are read or written; skip the rest of the row
+        user = db.session.get(User, current_user_id(), options=[
+            load_only(User.password_hash, User.password_hash_algo)
+        ])
 
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -0,0 +1,52 @@
+"""
+Conditional GET support (ETag / If-None-Match) for JSON endpoints
+"""
+
+import hashlib
+import re
+from functools import wraps
+from flask import make_response, request
+
+# Flask-Compress appends the content coding to the ETag of a response it
+# compresses ("<hash>:gzip"), and clients send that tag back
+_CODING_SUFFIX = re.compile(r':(?:gzip|br|deflate|zstd)"')
+
+def _conditional_environ():
+    """
+    The request environ with any content-coding suffix removed from
+    If-None-Match, so tags of compressed responses match the body hash
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match or ':' not in if_none_match:
+        return request.environ
+    return dict(request.environ, HTTP_IF_NONE_MATCH=_CODING_SUFFIX.sub('"', if_none_match))
+
+def etag_json(max_age=None):
+    """
+    Decorator for read-only JSON views. Successful responses get a strong
+    ETag (BLAKE2b of the body) and a private Cache-Control header; a request
+    whose If-None-Match matches is answered with an empty 304, including
+    tags of a compressed copy of the body.
+
+    max_age lets browsers reuse the response for that many seconds without
+    asking; when None they must revalidate every time (no-cache).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or request.method not in ('GET', 'HEAD'):
+                return response
+
+            response.cache_control.private = True
+            if max_age is None:
+                response.cache_control.no_cache = True
+            else:
+                response.cache_control.max_age = max_age
+
+            response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+            return response.make_conditional(_conditional_environ())
+
+        return decorated_function
+
+    return decorator
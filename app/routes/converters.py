@@ -0,0 +1,16 @@
+"""
+URL converters shared by the API blueprints
+"""
+
+from werkzeug.routing import BaseConverter
+from app.models.tickers import TICKER_MAX_LENGTH, normalize_ticker
+
+class TickerConverter(BaseConverter):
+    """
+    <ticker:name> path segment. Over-long symbols do not match the route (404)
+    and views receive the upper-cased, interned ticker.
+    """
+    regex = r'[^/]{1,%d}' % TICKER_MAX_LENGTH
+
+    def to_python(self, value):
+        return normalize_ticker(value) or value
@@ -3,13 +3,41 @@ Financial Health API Endpoints
 Provides Piotroski Score, Altman Z-Score, and Financial Ratios
 """
 
-from flask import Blueprint, jsonify
+import threading
+from cachetools import TTLCache
+from flask import Blueprint, current_app, jsonify
 from app.services.fmp_service import FMPService
 
 bp = Blueprint('financial', __name__, url_prefix='/api/financial')
 
+# Serialized response bodies keyed by (endpoint, ticker). The underlying FMP
+# data changes at most daily, so hot tickers skip the cache lookup and the
+# JSON encoding for a few minutes per worker.
+_response_cache = TTLCache(maxsize=2048, ttl=300)
+_response_cache_lock = threading.Lock()
 
-@bp.route('/score/<ticker>', methods=['GET'])
+
+def _cached_json(key, fetch):
+    """
+    Return a JSON response for fetch(), reusing the encoded body of a recent
+    call with the same key. Returns None when fetch() has no data.
+    """
+    with _response_cache_lock:
+        body = _response_cache.get(key)
+
+    if body is None:
+        data = fetch()
+        if not data:
+            return None
+        # Same bytes jsonify would produce, encoded once
+        body = f"{current_app.json.dumps(data)}\n".encode('utf-8')
+        with _response_cache_lock:
+            _response_cache[key] = body
+
+    return current_app.response_class(body, mimetype='application/json')
+
+
+@bp.route('/score/<ticker:ticker>', methods=['GET'])
 def get_financial_score(ticker):
     """
     Get Piotroski and Altman Z-Score for a stock
@@ -27,18 +55,18 @@ def get_financial_score(ticker):
         }
     """
     try:
-        data = FMPService.get_financial_score(ticker)
+        response = _cached_json(('score', ticker), lambda: FMPService.get_financial_score(ticker))
 
-        if not data:
+        if response is None:
             return jsonify({'error': f'No financial score data available for {ticker}'}), 404
 
-        return jsonify(data), 200
+        return response, 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@bp.route('/ratios/<ticker>', methods=['GET'])
+@bp.route('/ratios/<ticker:ticker>', methods=['GET'])
 def get_financial_ratios(ticker):
     """
     Get comprehensive financial ratios (TTM)
@@ -53,12 +81,12 @@ def get_financial_ratios(ticker):
         - Valuation: priceToEarningsRatio, priceToBookRatio, priceToSalesRatio, pegRatio, evToEbitda
     """
     try:
-        data = FMPService.get_financial_ratios(ticker)
+        response = _cached_json(('ratios', ticker), lambda: FMPService.get_financial_ratios(ticker))
 
-        if not data:
+        if response is None:
             return jsonify({'error': f'No financial ratios data available for {ticker}'}), 404
 
-        return jsonify(data), 200
+        return response, 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,6 +1,8 @@
 from flask import Blueprint, render_template, send_from_directory, current_app, jsonify
 from flask_jwt_extended import jwt_required
 import os
+import threading
+import time
 
 bp = Blueprint('main', __name__)
 
@@ -14,13 +16,36 @@ def admin():
     """Serve the admin dashboard"""
     return render_template('admin.html')
 
+# Seconds a database probe result is reused by the health check, so frequent
+# monitor polls do not each cost a round-trip
+HEALTH_DB_CHECK_TTL = 5
+_last_db_check = {'checked_at': 0.0, 'error': None}
+_db_check_lock = threading.Lock()
+
+def _check_database():
+    """Return None if the database answered SELECT 1 recently, else the error"""
+    from app import db
+    from sqlalchemy import text
+
+    with _db_check_lock:
+        if time.monotonic() - _last_db_check['checked_at'] < HEALTH_DB_CHECK_TTL:
+            return _last_db_check['error']
+
+        try:
+            db.session.execute(text('SELECT 1'))
+            error = None
+        except Exception as e:
+            db.session.rollback()
+            error = str(e)
+
+        _last_db_check['checked_at'] = time.monotonic()
+        _last_db_check['error'] = error
+        return error
+
 @bp.route('/health')
 @bp.route('/api/health')
 def health_check():
     """Health check endpoint for monitoring"""
-    from app import db
-    from sqlalchemy import text
-    
     status = {
         'status': 'healthy',
         'database': 'disconnected',
@@ -28,24 +53,30 @@ def health_check():
     }
     
     # Check database connection
-    try:
-        db.session.execute(text('SELECT 1'))
+    error = _check_database()
+    if error is None:
         status['database'] = 'connected'
         return jsonify(status), 200
-    except Exception as e:
-        status['status'] = 'unhealthy'
-        status['error'] = str(e)
-        return jsonify(status), 503
+
+    status['status'] = 'unhealthy'
+    status['error'] = error
+    return jsonify(status), 503
+
+# The manifest is not versioned, so it is cached for a day rather than marked
+# immutable; the service worker must always be revalidated so updates ship
+MANIFEST_MAX_AGE = 86400
 
 @bp.route('/manifest.json')
 def manifest():
     """Serve PWA manifest"""
-    return send_from_directory(current_app.static_folder, 'manifest.json')
+    return send_from_directory(current_app.static_folder, 'manifest.json',
+                               max_age=MANIFEST_MAX_AGE, conditional=True)
 
 @bp.route('/sw.js')
 def service_worker():
     """Serve service worker"""
-    return send_from_directory(current_app.static_folder, 'sw.js')
+    return send_from_directory(current_app.static_folder, 'sw.js',
+                               max_age=0, conditional=True)
 
 @bp.route('/offline')
 def offline():
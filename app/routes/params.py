@@ -0,0 +1,52 @@
+"""
+Request parameter helpers shared by the API blueprints
+"""
+
+from flask import current_app, request
+
+_TRUE_VALUES = frozenset({'true', '1', 'yes', 'on'})
+
+def is_true(value):
+    """Return True for 'true', '1', 'yes' or 'on' in any case (or a True bool)"""
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in _TRUE_VALUES
+
+def bool_arg(name, default=False):
+    """
+    Read a boolean query parameter. 'true', '1', 'yes' and 'on' (any case)
+    are true, any other value is false, and a missing parameter gives default.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return is_true(value)
+
+def bounded_int(name, default, lo, hi):
+    """
+    Read an integer query parameter clamped to [lo, hi]. A missing parameter
+    gives default; a non-integer value raises ValueError.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return max(lo, min(hi, int(value)))
+    except ValueError:
+        raise ValueError(f'{name} must be an integer') from None
+
+def json_body():
+    """
+    Parse the JSON request body without caching the raw bytes or the parsed
+    value on the request. An empty body gives {}. Non-JSON content types and
+    malformed bodies raise the same errors as request.get_json().
+    """
+    if not request.is_json:
+        return request.on_json_loading_failed(None)
+    body = request.get_data(cache=False)
+    if not body:
+        return {}
+    try:
+        return current_app.json.loads(body)
+    except ValueError as e:
+        return request.on_json_loading_failed(e)
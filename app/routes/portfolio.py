@@ -1,27 +1,31 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.middleware.identity import current_user_id
+from app.middleware.jwt_cache import require_jwt_cached
+from app.routes.conditional import etag_json
+from app.routes.params import bounded_int, json_body
+from app.routes.responses import error_json
 from app.services import PortfolioService
+from app.models.tickers import normalize_ticker
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 bp = Blueprint('portfolio', __name__, url_prefix='/api/portfolio')
 
+# Every portfolio route needs a valid access token; verify it once up front
+bp.before_request(require_jwt_cached)
+
+_REQ_TX_FIELDS = frozenset(('ticker', 'transaction_type', 'shares', 'price'))
+_ALLOWED_TYPES = frozenset(('BUY', 'SELL'))
+
 @bp.route('/', methods=['GET'])
-@jwt_required()
+@etag_json()
 def get_portfolio():
     """Get user's portfolio"""
     try:
-        user_id = get_jwt_identity()
-        
-        # Validate user_id
-        if not user_id:
-            return jsonify({'error': 'Invalid user ID'}), 401
-        
-        # Convert user_id to int if it's a string (JWT stores as string)
-        try:
-            user_id = int(user_id)
-        except (ValueError, TypeError):
-            return jsonify({'error': 'Invalid user ID format'}), 401
-        
+        user_id = current_user_id()
+
         portfolio = PortfolioService.get_portfolio(user_id)
 
         # Ensure proper structure even if error occurred
@@ -41,9 +45,7 @@ def get_portfolio():
         return jsonify(portfolio), 200
 
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"[Portfolio API] Error: {error_details}")
+        logger.exception("[Portfolio API] Failed to get portfolio")
         
         return jsonify({
             'error': f'Failed to get portfolio: {str(e)}',
@@ -58,28 +60,34 @@ def get_portfolio():
         }), 500
 
 @bp.route('/transaction', methods=['POST'])
-@jwt_required()
 def add_transaction():
     """Add a new transaction"""
     try:
-        user_id = get_jwt_identity()
-        data = request.get_json()
+        user_id = current_user_id()
+        data = json_body()
 
         # Validate required fields
-        required = ['ticker', 'transaction_type', 'shares', 'price']
-        for field in required:
-            if field not in data:
-                return jsonify({'error': f'{field} is required'}), 400
+        # Report every missing field at once
+        missing = sorted(_REQ_TX_FIELDS - data.keys())
+        if missing:
+            return jsonify({
+                'error': f"Missing required fields: {', '.join(missing)}",
+                'fields': missing
+            }), 400
+
+        data['ticker'] = normalize_ticker(data['ticker'])
+        if not data['ticker']:
+            return error_json('Invalid ticker', 400)
 
         # Validate transaction type
-        if data['transaction_type'] not in ['BUY', 'SELL']:
-            return jsonify({'error': 'transaction_type must be BUY or SELL'}), 400
+        if data['transaction_type'] not in _ALLOWED_TYPES:
+            return error_json('transaction_type must be BUY or SELL', 400)
 
         # Add transaction
         transaction = PortfolioService.add_transaction(user_id, data)
 
         if not transaction:
-            return jsonify({'error': 'Failed to add transaction. Check if you have sufficient shares for SELL orders.'}), 400
+            return error_json('Failed to add transaction. Check if you have sufficient shares for SELL orders.', 400)
 
         return jsonify({
             'message': 'Transaction added successfully',
@@ -90,13 +98,16 @@ def add_transaction():
         return jsonify({'error': f'Failed to add transaction: {str(e)}'}), 500
 
 @bp.route('/transactions', methods=['GET'])
-@jwt_required()
+@etag_json()
 def get_transactions():
     """Get user's transactions"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         ticker = request.args.get('ticker')
-        limit = int(request.args.get('limit', 50))
+        try:
+            limit = bounded_int('limit', 50, 1, 500)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         transactions = PortfolioService.get_transactions(user_id, ticker, limit)
 
@@ -108,11 +119,11 @@ def get_transactions():
         return jsonify({'error': f'Failed to get transactions: {str(e)}'}), 500
 
 @bp.route('/performance', methods=['GET'])
-@jwt_required()
+@etag_json()
 def get_performance():
     """Get portfolio performance over time"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         period = request.args.get('period', '1M')
 
         performance = PortfolioService.get_portfolio_performance(user_id, period)
@@ -123,7 +134,7 @@ def get_performance():
         return jsonify({'error': f'Failed to get performance: {str(e)}'}), 500
 
 @bp.route('/risk-analytics', methods=['GET'])
-@jwt_required()
+@etag_json()
 def get_risk_analytics():
     """
     Get comprehensive risk analytics for user's portfolio
@@ -162,15 +173,9 @@ def get_risk_analytics():
     }
     """
     try:
-        user_id = get_jwt_identity()
-
-        # Convert user_id to int
-        try:
-            user_id = int(user_id)
-        except (ValueError, TypeError):
-            return jsonify({'error': 'Invalid user ID format'}), 401
+        user_id = current_user_id()
 
-        risk_analytics = PortfolioService.get_risk_analytics(user_id)
+        risk_analytics = PortfolioService.get_risk_analytics_cached(user_id)
 
         # Check if there was an error
         if 'error' in risk_analytics:
@@ -179,9 +184,7 @@ def get_risk_analytics():
         return jsonify(risk_analytics), 200
 
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"[Risk Analytics API] Error: {error_details}")
+        logger.exception("[Risk Analytics API] Failed to calculate risk analytics")
 
         return jsonify({
             'error': f'Failed to calculate risk analytics: {str(e)}',
@@ -0,0 +1,23 @@
+"""
+JSON responses whose bodies never change, encoded once per process
+"""
+
+from flask import current_app
+
+# Encoded bodies by key; only fixed payloads are stored, so this stays small
+_STATIC_BODIES = {}
+
+def static_json(key, build, status=200):
+    """
+    Return a JSON response for build(), encoding it only on the first call
+    for key (with app.json, like jsonify, including the trailing newline).
+    A new Response is made per call since after_request hooks modify it.
+    """
+    body = _STATIC_BODIES.get(key)
+    if body is None:
+        body = _STATIC_BODIES[key] = f"{current_app.json.dumps(build())}\n".encode('utf-8')
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+def error_json(message, status):
+    """Same as jsonify({'error': message}), status for a fixed message"""
+    return static_json(('error', message), lambda: {'error': message}, status)
@@ -1,46 +1,136 @@
-from flask import Blueprint, request, jsonify
+import hashlib
+import threading
+from cachetools import TTLCache
+from flask import Blueprint, current_app, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import ScreenerService
+from app.routes.params import is_true, json_body
+from app.routes.conditional import etag_json
+from app.routes.responses import error_json, static_json
 
 bp = Blueprint('screener', __name__, url_prefix='/api/screener')
 
+def _limit(value):
+    return min(int(value), 100)
+
+def _list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+# (key, default, coercer) for every accepted screening criterion; keys that
+# are missing and have no default are left out of the criteria
+_CRITERIA_SPEC = (
+    ('market', 'USA', str),
+    ('min_market_cap', None, float),
+    ('max_market_cap', None, float),
+    ('min_pe_ratio', None, float),
+    ('max_pe_ratio', None, float),
+    ('min_dividend_yield', None, float),
+    ('max_dividend_yield', None, float),
+    ('min_price', None, float),
+    ('max_price', None, float),
+    ('min_volume', None, float),
+    ('min_beta', None, float),
+    ('max_beta', None, float),
+    ('sectors', (), _list),
+    ('only_profitable', False, is_true),
+    ('min_revenue_growth', None, float),
+    ('prefer_value', False, is_true),
+    ('prefer_growth', False, is_true),
+    ('prefer_dividends', False, is_true),
+    ('prefer_momentum', False, is_true),
+    ('sort_by', 'market_cap', str),
+    ('sort_order', 'desc', str),
+    ('limit', 50, _limit),
+)
+
+# Common sectors
+SECTORS = (
+    'Technology',
+    'Healthcare',
+    'Financial Services',
+    'Consumer Cyclical',
+    'Consumer Defensive',
+    'Energy',
+    'Industrials',
+    'Basic Materials',
+    'Real Estate',
+    'Communication Services',
+    'Utilities'
+)
+
+# Predefined screens by URL name ('Value Stocks' -> 'value_stocks'); the
+# presets are static, so the index is built on first use and kept
+_PRESET_INDEX = None
+
+def _get_preset_index():
+    """Return the preset URL name -> preset mapping, building it once"""
+    global _PRESET_INDEX
+    if _PRESET_INDEX is None:
+        _PRESET_INDEX = {
+            preset['name'].lower().replace(' ', '_'): preset
+            for preset in ScreenerService.get_predefined_screens()
+        }
+    return _PRESET_INDEX
+
+# Screen results by canonical criteria; preset screens and popular filters
+# are identical for every user, so they collapse onto a few entries
+SCREEN_CACHE_TTL = 60
+_SCREEN_CACHE = TTLCache(maxsize=512, ttl=SCREEN_CACHE_TTL)
+_screen_cache_lock = threading.Lock()
+
+def _cached_screen(criteria):
+    """
+    Run ScreenerService.screen_stocks(criteria), reusing the result of an
+    identical screen from the last SCREEN_CACHE_TTL seconds. Empty results
+    are not cached since the service also returns [] when screening fails.
+    """
+    canonical = current_app.json.dumps(criteria, sort_keys=True).encode('utf-8')
+    key = hashlib.blake2b(canonical, digest_size=16).digest()
+    with _screen_cache_lock:
+        results = _SCREEN_CACHE.get(key)
+    if results is not None:
+        return results
+
+    results = ScreenerService.screen_stocks(criteria)
+    if results:
+        with _screen_cache_lock:
+            _SCREEN_CACHE[key] = results
+    return results
+
+def clear_screen_cache():
+    """Drop all cached screen results"""
+    with _screen_cache_lock:
+        _SCREEN_CACHE.clear()
+
+def parse_criteria(data):
+    """
+    Build screening criteria from a request body in one pass over
+    _CRITERIA_SPEC, applying defaults and coercing types. Raises
+    ValueError or TypeError for values that cannot be coerced.
+    """
+    criteria = {}
+    for key, default, coerce in _CRITERIA_SPEC:
+        value = data.get(key)
+        if value is None:
+            value = default
+        if value is not None:
+            criteria[key] = coerce(value)
+    return criteria
+
 @bp.route('/', methods=['POST'])
 def screen_stocks():
     """Screen stocks based on criteria"""
     try:
-        data = request.get_json()
+        data = json_body()
 
         # Build criteria from request
-        criteria = {
-            'market': data.get('market', 'USA'),
-            'min_market_cap': data.get('min_market_cap'),
-            'max_market_cap': data.get('max_market_cap'),
-            'min_pe_ratio': data.get('min_pe_ratio'),
-            'max_pe_ratio': data.get('max_pe_ratio'),
-            'min_dividend_yield': data.get('min_dividend_yield'),
-            'max_dividend_yield': data.get('max_dividend_yield'),
-            'min_price': data.get('min_price'),
-            'max_price': data.get('max_price'),
-            'min_volume': data.get('min_volume'),
-            'min_beta': data.get('min_beta'),
-            'max_beta': data.get('max_beta'),
-            'sectors': data.get('sectors', []),
-            'only_profitable': data.get('only_profitable', False),
-            'min_revenue_growth': data.get('min_revenue_growth'),
-            'prefer_value': data.get('prefer_value', False),
-            'prefer_growth': data.get('prefer_growth', False),
-            'prefer_dividends': data.get('prefer_dividends', False),
-            'prefer_momentum': data.get('prefer_momentum', False),
-            'sort_by': data.get('sort_by', 'market_cap'),
-            'sort_order': data.get('sort_order', 'desc'),
-            'limit': min(data.get('limit', 50), 100)
-        }
-
-        # Remove None values
-        criteria = {k: v for k, v in criteria.items() if v is not None}
+        try:
+            criteria = parse_criteria(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid screening criteria: {str(e)}'}), 400
 
         # Screen stocks
-        results = ScreenerService.screen_stocks(criteria)
+        results = _cached_screen(criteria)
 
         return jsonify({
             'results': results,
@@ -52,13 +142,12 @@ def screen_stocks():
         return jsonify({'error': f'Screening failed: {str(e)}'}), 500
 
 @bp.route('/presets', methods=['GET'])
+@etag_json(max_age=5)
 def get_preset_screens():
     """Get predefined screening strategies"""
     try:
-        presets = ScreenerService.get_predefined_screens()
-
-        return jsonify({
-            'presets': presets
+        return static_json('presets', lambda: {
+            'presets': ScreenerService.get_predefined_screens()
         }), 200
 
     except Exception as e:
@@ -68,14 +157,13 @@ def get_preset_screens():
 def apply_preset_screen(preset_name):
     """Apply a predefined screening strategy"""
     try:
-        presets = ScreenerService.get_predefined_screens()
-        preset = next((p for p in presets if p['name'].lower().replace(' ', '_') == preset_name.lower()), None)
+        preset = _get_preset_index().get(preset_name.lower())
 
         if not preset:
-            return jsonify({'error': 'Preset not found'}), 404
+            return error_json('Preset not found', 404)
 
-        # Apply preset criteria
-        results = ScreenerService.screen_stocks(preset['criteria'])
+        # Apply preset criteria (a copy; the indexed preset is shared)
+        results = _cached_screen(dict(preset['criteria']))
 
         return jsonify({
             'preset': preset['name'],
@@ -88,26 +176,12 @@ def apply_preset_screen(preset_name):
         return jsonify({'error': f'Failed to apply preset: {str(e)}'}), 500
 
 @bp.route('/sectors', methods=['GET'])
+@etag_json(max_age=5)
 def get_sectors():
     """Get list of available sectors"""
     try:
-        # Common sectors
-        sectors = [
-            'Technology',
-            'Healthcare',
-            'Financial Services',
-            'Consumer Cyclical',
-            'Consumer Defensive',
-            'Energy',
-            'Industrials',
-            'Basic Materials',
-            'Real Estate',
-            'Communication Services',
-            'Utilities'
-        ]
-
-        return jsonify({
-            'sectors': sectors
+        return static_json('sectors', lambda: {
+            'sectors': list(SECTORS)
         }), 200
 
     except Exception as e:
@@ -1,12 +1,78 @@
-from flask import Blueprint, request, jsonify
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from flask import Blueprint, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services import StockService, AIService
+from app.services import StockService, ScreenerService
+from app import cache
+from app.models import StockCache
+from app.models.timestamps import request_now_iso
+from app.services.ai_service import get_ai_service
 from app.services.news_service import NewsService
-from datetime import datetime, timezone
+from app.services.short_data_service import ShortDataService
+from app.services.short_squeeze_analyzer import ShortSqueezeAnalyzer
+from app.routes.params import bounded_int
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 bp = Blueprint('stock', __name__, url_prefix='/api/stock')
 
-@bp.route('/<ticker>', methods=['GET'])
+# Worker threads for the independent provider calls of the analysis endpoints
+ANALYSIS_WORKERS = 10
+_analysis_pool = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS,
+                                    thread_name_prefix='stock-analysis')
+
+def _call_in_app_context(app, fn, *args, **kwargs):
+    with app.app_context():
+        return fn(*args, **kwargs)
+
+# Background warm-up of the shared cache; never waited on by a request
+PREFETCH_WORKERS = 4
+PREFETCH_FLAG_TIMEOUT = 300
+_prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS,
+                                    thread_name_prefix='stock-prefetch')
+
+def _submit(fn, *args, **kwargs):
+    """
+    Run fn on the analysis pool with an app context (and so its own
+    database session). Tasks must not wait on other tasks of the pool.
+    """
+    app = current_app._get_current_object()
+    return _analysis_pool.submit(_call_in_app_context, app, fn, *args, **kwargs)
+
+# MockDataService, loaded by _mock_data() the first time a fallback needs it
+_mock_data_service = None
+
+def _mock_data():
+    """Return MockDataService, importing it once; only provider failures need it"""
+    global _mock_data_service
+    if _mock_data_service is None:
+        from app.services.mock_data_service import MockDataService
+        _mock_data_service = MockDataService
+    return _mock_data_service
+
+def _prefetch_analysis_inputs(ticker):
+    """
+    Start fetching the news sentiment and short data that analyze-with-ai
+    needs, which usually follows a stock page load, so they are in the
+    shared cache by then. A flag in the shared cache keeps workers from
+    prefetching the same ticker more than once per PREFETCH_FLAG_TIMEOUT.
+    """
+    if not current_app.config.get('STOCK_PREFETCH'):
+        return
+    try:
+        if not cache.add(f'prefetch:{ticker}', 1, timeout=PREFETCH_FLAG_TIMEOUT):
+            return
+    except Exception as e:
+        logger.warning(f"Prefetch flag failed for {ticker}: {e}")
+        return
+
+    app = current_app._get_current_object()
+    _prefetch_pool.submit(_call_in_app_context, app, NewsService.get_aggregated_sentiment, ticker, days=7)
+    _prefetch_pool.submit(_call_in_app_context, app, ShortDataService.get_short_data, ticker)
+
+@bp.route('/<ticker:ticker>', methods=['GET'])
 def get_stock_info(ticker):
     """Get comprehensive stock information"""
     try:
@@ -22,18 +88,20 @@ def get_stock_info(ticker):
         # Get fundamental analysis
         fundamental = StockService.get_fundamental_analysis(ticker)
 
+        _prefetch_analysis_inputs(ticker)
+
         return jsonify({
             'ticker': ticker.upper(),
             'info': stock_info,
             'technical_indicators': technical,
             'fundamental_analysis': fundamental,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': request_now_iso()
         }), 200
 
     except Exception as e:
         return jsonify({'error': f'Failed to get stock info: {str(e)}'}), 500
 
-@bp.route('/<ticker>/history', methods=['GET'])
+@bp.route('/<ticker:ticker>/history', methods=['GET'])
 def get_price_history(ticker):
     """Get historical price data"""
     try:
@@ -53,7 +121,7 @@ def get_price_history(ticker):
     except Exception as e:
         return jsonify({'error': f'Failed to get price history: {str(e)}'}), 500
 
-@bp.route('/<ticker>/analyze-with-ai', methods=['GET'])
+@bp.route('/<ticker:ticker>/analyze-with-ai', methods=['GET'])
 def analyze_with_ai_get(ticker):
     """Analyze stock with AI assistance (GET method) - Enhanced with analyst data, insider transactions, and news sentiment"""
     try:
@@ -65,21 +133,24 @@ def analyze_with_ai_get(ticker):
                 'message': 'Unable to fetch stock data. Please check ticker symbol and try again.'
             }), 404
 
+        # The provider calls below are independent; run them concurrently
+        technical_future = _submit(StockService.calculate_technical_indicators, ticker)
+        fundamental_future = _submit(StockService.get_fundamental_analysis, ticker)
+        news_future = _submit(NewsService.get_aggregated_sentiment, ticker, days=7)
+        short_future = _submit(ShortDataService.get_short_data, ticker)
+
         # Get additional analysis data (these might be None, handle gracefully)
-        technical = StockService.calculate_technical_indicators(ticker)
-        fundamental = StockService.get_fundamental_analysis(ticker)
+        technical = technical_future.result()
+        fundamental = fundamental_future.result()
 
         # Get aggregated news sentiment
-        from app.services.news_service import NewsService
         news_sentiment = None
         try:
-            news_sentiment = NewsService.get_aggregated_sentiment(ticker, days=7)
+            news_sentiment = news_future.result()
         except Exception as e:
-            import logging
-            logging.error(f"Failed to get news sentiment for {ticker}: {str(e)}")
+            logger.error(f"Failed to get news sentiment for {ticker}: {str(e)}")
 
         # Analyze short squeeze potential
-        from app.services.short_squeeze_analyzer import ShortSqueezeAnalyzer
         squeeze_analysis = None
         try:
             squeeze_analysis = ShortSqueezeAnalyzer.analyze_squeeze_potential(
@@ -88,25 +159,21 @@ def analyze_with_ai_get(ticker):
                 {'volume': stock_info.get('volume', 0)}
             )
         except Exception as e:
-            import logging
-            logging.error(f"Failed to analyze squeeze potential for {ticker}: {str(e)}")
+            logger.error(f"Failed to analyze squeeze potential for {ticker}: {str(e)}")
 
         # Try to get actual short data from ChartExchange
-        from app.services.short_data_service import ShortDataService
         short_data = None
         try:
-            short_data = ShortDataService.get_short_data(ticker)
+            short_data = short_future.result()
             # If we have real short data, enhance the squeeze analysis
             if short_data and squeeze_analysis:
                 squeeze_analysis['real_short_data'] = short_data
                 squeeze_analysis['note'] = 'Enhanced with actual short interest data from ChartExchange.com'
         except Exception as e:
-            import logging
-            logging.error(f"Failed to get short data for {ticker}: {str(e)}")
+            logger.error(f"Failed to get short data for {ticker}: {str(e)}")
 
         # Generate AI analysis with enhanced data
-        ai_service = AIService()
-        ai_analysis = ai_service.analyze_stock_with_ai(
+        ai_analysis = get_ai_service().analyze_stock_with_ai(
             stock_info,
             technical if technical else {},
             fundamental if fundamental else {},
@@ -127,15 +194,12 @@ def analyze_with_ai_get(ticker):
             ai_analysis['squeeze_analysis'] = squeeze_analysis
         if news_sentiment:
             ai_analysis['news_sentiment'] = news_sentiment
-        ai_analysis['timestamp'] = datetime.now(timezone.utc).isoformat()
+        ai_analysis['timestamp'] = request_now_iso()
 
         return jsonify(ai_analysis), 200
 
     except Exception as e:
-        import logging
-        import traceback
-        logging.error(f"AI analysis failed for {ticker}: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"AI analysis failed for {ticker}")
         return jsonify({
             'error': f'AI analysis failed: {str(e)}',
             'ticker': ticker
@@ -161,7 +225,6 @@ def analyze_with_ai():
         fundamental = StockService.get_fundamental_analysis(ticker)
 
         # Analyze short squeeze potential
-        from app.services.short_squeeze_analyzer import ShortSqueezeAnalyzer
         squeeze_analysis = ShortSqueezeAnalyzer.analyze_squeeze_potential(
             stock_info,
             technical,
@@ -169,7 +232,6 @@ def analyze_with_ai():
         )
 
         # Try to get actual short data from ChartExchange
-        from app.services.short_data_service import ShortDataService
         short_data = ShortDataService.get_short_data(ticker)
 
         # If we have real short data, enhance the squeeze analysis
@@ -178,8 +240,7 @@ def analyze_with_ai():
             squeeze_analysis['note'] = 'Enhanced with actual short interest data from ChartExchange.com'
 
         # Generate AI analysis
-        ai_service = AIService()
-        ai_analysis = ai_service.analyze_stock_with_ai(
+        ai_analysis = get_ai_service().analyze_stock_with_ai(
             stock_info,
             technical,
             fundamental,
@@ -191,7 +252,7 @@ def analyze_with_ai():
 
         # Add squeeze analysis to response
         ai_analysis['squeeze_analysis'] = squeeze_analysis
-        ai_analysis['timestamp'] = datetime.now(timezone.utc).isoformat()
+        ai_analysis['timestamp'] = request_now_iso()
 
         return jsonify(ai_analysis), 200
 
@@ -211,29 +272,58 @@ def get_batch_quotes():
         if len(tickers) > 20:
             return jsonify({'error': 'Maximum 20 tickers allowed per request'}), 400
 
+        # Each distinct ticker once (order preserved): cached entries in one
+        # query, uncached ones fetched concurrently on the stock info pool
+        stock_infos = StockService.get_stock_infos(list(dict.fromkeys(tickers)))
+        found = [(ticker, info) for ticker, info in stock_infos.items() if info]
+
+        # Price changes for the whole batch at once; missing prices count as 0
+        # and there is no percent change without a previous close
+        curr = np.array([info.get('current_price') or 0 for _, info in found], dtype=float)
+        prev = np.array([info.get('previous_close') or 0 for _, info in found], dtype=float)
+        change = curr - prev
+        change_percent = np.divide(change * 100, prev, out=np.zeros_like(change), where=prev != 0)
+
         results = {}
-        for ticker in tickers:
-            stock_info = StockService.get_stock_info(ticker)
-            if stock_info:
-                results[ticker] = {
-                    'ticker': ticker.upper(),
-                    'company_name': stock_info.get('company_name'),
-                    'current_price': stock_info.get('current_price'),
-                    'change': stock_info.get('current_price', 0) - stock_info.get('previous_close', 0),
-                    'change_percent': ((stock_info.get('current_price', 0) - stock_info.get('previous_close', 0)) /
-                                      stock_info.get('previous_close', 1) * 100) if stock_info.get('previous_close') else 0,
-                    'volume': stock_info.get('volume'),
-                    'market_cap': stock_info.get('market_cap')
-                }
+        for (ticker, stock_info), diff, percent in zip(found, change.tolist(), change_percent.tolist()):
+            results[ticker] = {
+                'ticker': ticker.upper(),
+                'company_name': stock_info.get('company_name'),
+                'current_price': stock_info.get('current_price'),
+                'change': diff,
+                'change_percent': percent,
+                'volume': stock_info.get('volume'),
+                'market_cap': stock_info.get('market_cap')
+            }
 
         return jsonify({
             'quotes': results,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': request_now_iso()
         }), 200
 
     except Exception as e:
         return jsonify({'error': f'Failed to get batch quotes: {str(e)}'}), 500
 
+# Searchable tickers with their upper-case form, computed once
+_SEARCH_TICKERS = tuple(
+    (ticker, ticker.upper())
+    for ticker in ScreenerService.US_STOCKS + ScreenerService.DAX_STOCKS
+)
+
+def _search_entry(ticker, info=None):
+    """Search suggestion for ticker from its cached stock info, if any"""
+    info = info or {}
+    return {
+        'ticker': ticker,
+        'company_name': info.get('company_name', ticker),
+        'exchange': info.get('exchange', 'XETRA' if ticker.endswith('.DE') else 'NASDAQ'),
+        'sector': info.get('sector')
+    }
+
+# Suggestions by ticker, kept in memory and refreshed whenever a search
+# finds newer cached info, so suggestions never need a provider call
+_SEARCH_INDEX = {ticker: _search_entry(ticker) for ticker, _ in _SEARCH_TICKERS}
+
 @bp.route('/search', methods=['GET'])
 def search_stocks():
     """Search for stocks by name or ticker"""
@@ -243,43 +333,17 @@ def search_stocks():
         if not query or len(query) < 2:
             return jsonify({'error': 'Search query must be at least 2 characters'}), 400
 
-        # This is a simplified search - in production, you'd have a proper search index
-        # For now, we'll check against known tickers
-        from app.services.screener_service import ScreenerService
+        # Known tickers containing the query, in list order (at most 10)
+        query_upper = query.upper()
+        tickers = list(islice((ticker for ticker, upper in _SEARCH_TICKERS if query_upper in upper), 10))
 
-        # Enhanced search with mock data fallback for better performance
-        from app.services.mock_data_service import MockDataService
-
-        all_tickers = ScreenerService.US_STOCKS + ScreenerService.DAX_STOCKS
-        matches = []
-
-        # First, try to find direct ticker matches without API calls
-        for ticker in all_tickers:
-            if query.upper() in ticker.upper():
-                # Try to get cached data first
-                from app.models import StockCache
-                cached = StockCache.get_cached(ticker, 'info')
-
-                if cached:
-                    # Use cached data
-                    matches.append({
-                        'ticker': ticker,
-                        'company_name': cached.get('company_name', ticker),
-                        'exchange': cached.get('exchange', 'NASDAQ'),
-                        'sector': cached.get('sector', 'Technology')
-                    })
-                else:
-                    # Use mock data for fast response (no API calls)
-                    mock_info = MockDataService.get_mock_stock_info(ticker)
-                    matches.append({
-                        'ticker': ticker,
-                        'company_name': mock_info.get('company_name'),
-                        'exchange': mock_info.get('exchange'),
-                        'sector': mock_info.get('sector')
-                    })
-
-                if len(matches) >= 10:  # Limit results
-                    break
+        # Cached info for all matches in one lookup updates their entries
+        cached_infos = StockCache.get_cached_bulk(tickers, 'info')
+        for ticker in tickers:
+            cached = cached_infos.get(ticker)
+            if cached:
+                _SEARCH_INDEX[ticker] = _search_entry(ticker, cached)
+        matches = [_SEARCH_INDEX[ticker] for ticker in tickers]
 
         return jsonify({
             'results': matches,
@@ -289,36 +353,42 @@ def search_stocks():
     except Exception as e:
         return jsonify({'error': f'Search failed: {str(e)}'}), 500
 
+# Screens behind the value, growth and dividend picks of get_recommendations
+_RECOMMENDATION_SCREENS = {
+    'value': {
+        'max_pe_ratio': 15,
+        'min_market_cap': 1000000000,
+        'prefer_value': True,
+        'limit': 5,
+        'sort_by': 'score'
+    },
+    'growth': {
+        'min_revenue_growth': 0.15,
+        'prefer_growth': True,
+        'min_market_cap': 1000000000,
+        'limit': 5,
+        'sort_by': 'score'
+    },
+    'dividend': {
+        'min_dividend_yield': 0.03,
+        'prefer_dividends': True,
+        'limit': 5,
+        'sort_by': 'dividend_yield'
+    },
+}
+
 @bp.route('/recommendations', methods=['GET'])
 def get_recommendations():
     """Get stock recommendations"""
     try:
-        # Get top performing stocks based on our analysis
-        from app.services.screener_service import ScreenerService
-
-        # Get different types of recommendations
-        value_stocks = ScreenerService.screen_stocks({
-            'max_pe_ratio': 15,
-            'min_market_cap': 1000000000,
-            'prefer_value': True,
-            'limit': 5,
-            'sort_by': 'score'
-        })
-
-        growth_stocks = ScreenerService.screen_stocks({
-            'min_revenue_growth': 0.15,
-            'prefer_growth': True,
-            'min_market_cap': 1000000000,
-            'limit': 5,
-            'sort_by': 'score'
-        })
-
-        dividend_stocks = ScreenerService.screen_stocks({
-            'min_dividend_yield': 0.03,
-            'prefer_dividends': True,
-            'limit': 5,
-            'sort_by': 'dividend_yield'
-        })
+        # The three screens are independent; run them concurrently
+        futures = {
+            name: _submit(ScreenerService.screen_stocks, dict(criteria))
+            for name, criteria in _RECOMMENDATION_SCREENS.items()
+        }
+        value_stocks = futures['value'].result()
+        growth_stocks = futures['growth'].result()
+        dividend_stocks = futures['dividend'].result()
 
         return jsonify({
             'recommendations': {
@@ -326,180 +396,265 @@ def get_recommendations():
                 'growth_picks': growth_stocks[:3],
                 'dividend_picks': dividend_stocks[:3]
             },
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': request_now_iso()
         }), 200
 
     except Exception as e:
         return jsonify({'error': f'Failed to get recommendations: {str(e)}'}), 500
 
+def _analyze_recommendation(ticker, market, stock_info=None, fundamental=None, technical=None,
+                            fetch_missing=True):
+    """
+    Score one ticker for get_ai_recommendations from its technical and
+    fundamental data; values already looked up in bulk can be passed in.
+    With fetch_missing=False, values not passed in are not fetched again
+    (falling back to mock data where needed).
+    Returns (recommendation or None, whether the stock info had to come
+    from mock data).
+    """
+    failed = False
+    try:
+        # Get stock info
+        if not stock_info and fetch_missing:
+            stock_info = StockService.get_stock_info(ticker)
+        if not stock_info:
+            failed = True
+            # Use mock data if API fails
+            stock_info = _mock_data().get_mock_stock_info(ticker)
+
+        # Get fundamental analysis
+        if not fundamental and fetch_missing:
+            fundamental = StockService.get_fundamental_analysis(ticker)
+        if not fundamental:
+            # Use mock fundamental if API fails
+            fundamental = _mock_data().get_mock_fundamental_analysis(ticker)
+
+        # Get technical indicators
+        if not technical and fetch_missing:
+            technical = StockService.calculate_technical_indicators(ticker)
+
+        # FAST: Calculate recommendation based on technical + fundamental scores
+        # No AI call = much faster!
+        overall_score = fundamental.get('overall_score', 50)
+        
+        # Determine recommendation based on scores (adjusted thresholds)
+        rec_type = 'HOLD'
+        confidence = 70
+        
+        if overall_score >= 60:  # Lowered from 65
+            rec_type = 'BUY'
+            confidence = min(95, 65 + (overall_score - 60) * 2)
+        elif overall_score <= 40:  # Lowered from 35
+            rec_type = 'SELL'
+            confidence = min(95, 65 + (40 - overall_score) * 2)
+        else:
+            confidence = 55
+        
+        # Check RSI for additional signal
+        if technical and technical.get('rsi'):
+            rsi = technical['rsi']
+            if rsi > 70 and rec_type != 'BUY':
+                rec_type = 'SELL'
+                confidence = min(95, confidence + 15)
+            elif rsi < 30 and rec_type != 'SELL':
+                rec_type = 'BUY'
+                confidence = min(95, confidence + 15)
+            elif rsi > 60 and overall_score < 50:
+                # Overbought but weak fundamentals
+                rec_type = 'SELL'
+            elif rsi < 40 and overall_score > 50:
+                # Oversold but strong fundamentals
+                rec_type = 'BUY'
+
+        # Create summary based on scores
+        summary = f"Score: {overall_score:.0f}/100. "
+        if rec_type == 'BUY':
+            summary += "Strong fundamentals and technical indicators suggest buying opportunity."
+        elif rec_type == 'SELL':
+            summary += "Weak fundamentals or overbought conditions suggest caution."
+        else:
+            summary += "Mixed signals. Hold current positions."
+
+        return {
+            'ticker': ticker,
+            'company_name': stock_info.get('company_name', ticker),
+            'current_price': stock_info.get('current_price'),
+            'recommendation': rec_type,
+            'confidence': int(confidence),
+            'overall_score': overall_score,
+            'market': market,
+            'summary': summary
+        }, failed
+
+    except Exception as e:
+        logger.warning(f"Error analyzing {ticker}: {str(e)}")
+        return None, failed
+
+# Top US stocks to analyze (S&P 500 leaders + trending)
+_RECOMMENDATION_US_STOCKS = [
+    'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA',
+    'JPM', 'V', 'MA', 'HD', 'DIS', 'NFLX'
+]
+
+# Top German stocks (DAX) - reduced list
+_RECOMMENDATION_DE_STOCKS = [
+    'SAP', 'SIE.DE', 'ALV.DE', 'BMW.DE', 'DAI.DE'
+]
+
+def _recommendation_tickers():
+    """Return the tickers scored by the AI recommendations"""
+    all_stocks = _RECOMMENDATION_US_STOCKS + _RECOMMENDATION_DE_STOCKS
+    return all_stocks[:15]  # Reduced to 15 for faster loading
+
+def _recommendation_market(ticker):
+    return 'US' if ticker in _RECOMMENDATION_US_STOCKS else 'DE'
+
+def _submit_recommendations():
+    """
+    Start the recommendation analysis of every ticker on the analysis pool
+    and return the futures, each resolving to (recommendation|None, failed)
+    """
+    # OPTIMIZATION: Skip AI analysis for speed, use technical + fundamental scores only
+    tickers = _recommendation_tickers()
+
+    # Whatever is cached for the tickers, in one round trip per kind of data
+    calls = [(ticker,) for ticker in tickers]
+    stock_infos = StockCache.get_cached_bulk(tickers, 'info')
+    fundamentals = StockService.get_fundamental_analysis.cached_many(calls)
+    technicals = StockService.calculate_technical_indicators.cached_many(calls)
+
+    # Each ticker's remaining provider calls run on the analysis pool
+    return [
+        _submit(_analyze_recommendation, ticker, _recommendation_market(ticker),
+                stock_infos.get(ticker), fundamental, technical)
+        for ticker, fundamental, technical in zip(tickers, fundamentals, technicals)
+    ]
+
+def _recommendations_summary(recommendations, failed_count):
+    """Build the top buys/sells response from the analyzed recommendations"""
+    # Sort by confidence score
+    recommendations.sort(key=lambda x: x['confidence'], reverse=True)
+
+    # Get top 10 buys and top 10 sells
+    buy_recs = [r for r in recommendations if r['recommendation'] == 'BUY'][:10]
+    sell_recs = [r for r in recommendations if r['recommendation'] == 'SELL'][:10]
+
+    # If we have too few recommendations due to API failures, add mock data
+    if len(buy_recs) < 5 or len(sell_recs) < 3:
+        MockDataService = _mock_data()
+
+        # Add mock buy recommendations
+        mock_buy_tickers = ['NVDA', 'AMD', 'CRM', 'ADBE', 'ORCL', 'IBM', 'INTC']
+        for ticker in mock_buy_tickers:
+            if len(buy_recs) >= 10:
+                break
+            if not any(r['ticker'] == ticker for r in recommendations):
+                mock_info = MockDataService.get_mock_stock_info(ticker)
+                mock_fundamental = MockDataService.get_mock_fundamental_analysis(ticker)
+
+                buy_recs.append({
+                    'ticker': ticker,
+                    'company_name': mock_info.get('company_name', ticker),
+                    'current_price': mock_info.get('current_price'),
+                    'recommendation': 'BUY',
+                    'confidence': 75 + len(buy_recs),
+                    'overall_score': mock_fundamental.get('overall_score', 65),
+                    'market': 'US',
+                    'summary': f"Score: {mock_fundamental.get('overall_score', 65):.0f}/100. Mock data: Strong fundamentals suggest buying opportunity."
+                })
+
+        # Add mock sell recommendations
+        mock_sell_tickers = ['SNAP', 'PINS', 'ROKU', 'BYND', 'SPCE']
+        for ticker in mock_sell_tickers:
+            if len(sell_recs) >= 10:
+                break
+            if not any(r['ticker'] == ticker for r in recommendations):
+                mock_info = MockDataService.get_mock_stock_info(ticker)
+                mock_fundamental = MockDataService.get_mock_fundamental_analysis(ticker)
+
+                sell_recs.append({
+                    'ticker': ticker,
+                    'company_name': mock_info.get('company_name', ticker),
+                    'current_price': mock_info.get('current_price'),
+                    'recommendation': 'SELL',
+                    'confidence': 70 + len(sell_recs),
+                    'overall_score': mock_fundamental.get('overall_score', 35),
+                    'market': 'US',
+                    'summary': f"Score: {mock_fundamental.get('overall_score', 35):.0f}/100. Mock data: Weak fundamentals suggest caution."
+                })
+
+    logger.info(f"[AI-RECS] Analysis complete: {len(buy_recs)} BUY, {len(sell_recs)} SELL from {len(recommendations)} total")
+    logger.info(f"[AI-RECS] Failed API calls: {failed_count}")
+
+    return {
+        'top_buys': buy_recs[:10],  # Ensure max 10
+        'top_sells': sell_recs[:10],  # Ensure max 10
+        'analyzed_count': len(recommendations),
+        'using_mock_data': failed_count > 5,  # Indicate if using mock data
+        'timestamp': request_now_iso()
+    }
+
 @bp.route('/ai-recommendations', methods=['POST'])
 @jwt_required(optional=True)
 def get_ai_recommendations():
     """Get AI-powered top buy/sell recommendations - FAST VERSION without AI analysis"""
     logger.info("[AI-RECS] Starting AI recommendations analysis")
     try:
-        # OPTIMIZATION: Skip AI analysis for speed, use technical + fundamental scores only
-        # Top US stocks to analyze (S&P 500 leaders + trending)
-        us_stocks = [
-            'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA',
-            'JPM', 'V', 'MA', 'HD', 'DIS', 'NFLX'
-        ]
-
-        # Top German stocks (DAX) - reduced list
-        german_stocks = [
-            'SAP', 'SIE.DE', 'ALV.DE', 'BMW.DE', 'DAI.DE'
-        ]
-
-        all_stocks = us_stocks + german_stocks
-
         # Analyze stocks WITHOUT AI for speed (use technical + fundamental only)
         recommendations = []
         failed_count = 0
 
-        for ticker in all_stocks[:15]:  # Reduced to 15 for faster loading
-            try:
-                # Get stock info
-                stock_info = StockService.get_stock_info(ticker)
-                if not stock_info:
-                    failed_count += 1
-                    # Use mock data if API fails
-                    from app.services.mock_data_service import MockDataService
-                    stock_info = MockDataService.get_mock_stock_info(ticker)
+        # All inputs in one bulk lookup, then scored in memory
+        tickers = _recommendation_tickers()
+        analysis = StockService.get_bulk_analysis(tickers)
+        for ticker in tickers:
+            data = analysis[ticker]
+            recommendation, failed = _analyze_recommendation(
+                ticker, _recommendation_market(ticker), data['info'], data['fundamental'],
+                data['technical'], fetch_missing=False)
+            failed_count += failed
+            if recommendation:
+                recommendations.append(recommendation)
 
-                # Get fundamental analysis
-                fundamental = StockService.get_fundamental_analysis(ticker)
-                if not fundamental:
-                    # Use mock fundamental if API fails
-                    from app.services.mock_data_service import MockDataService
-                    fundamental = MockDataService.get_mock_fundamental_analysis(ticker)
+        return jsonify(_recommendations_summary(recommendations, failed_count)), 200
 
-                # Get technical indicators
-                technical = StockService.calculate_technical_indicators(ticker)
-
-                # FAST: Calculate recommendation based on technical + fundamental scores
-                # No AI call = much faster!
-                overall_score = fundamental.get('overall_score', 50)
-                
-                # Determine recommendation based on scores (adjusted thresholds)
-                rec_type = 'HOLD'
-                confidence = 70
-                
-                if overall_score >= 60:  # Lowered from 65
-                    rec_type = 'BUY'
-                    confidence = min(95, 65 + (overall_score - 60) * 2)
-                elif overall_score <= 40:  # Lowered from 35
-                    rec_type = 'SELL'
-                    confidence = min(95, 65 + (40 - overall_score) * 2)
-                else:
-                    confidence = 55
-                
-                # Check RSI for additional signal
-                if technical and technical.get('rsi'):
-                    rsi = technical['rsi']
-                    if rsi > 70 and rec_type != 'BUY':
-                        rec_type = 'SELL'
-                        confidence = min(95, confidence + 15)
-                    elif rsi < 30 and rec_type != 'SELL':
-                        rec_type = 'BUY'
-                        confidence = min(95, confidence + 15)
-                    elif rsi > 60 and overall_score < 50:
-                        # Overbought but weak fundamentals
-                        rec_type = 'SELL'
-                    elif rsi < 40 and overall_score > 50:
-                        # Oversold but strong fundamentals
-                        rec_type = 'BUY'
-
-                # Create summary based on scores
-                summary = f"Score: {overall_score:.0f}/100. "
-                if rec_type == 'BUY':
-                    summary += "Strong fundamentals and technical indicators suggest buying opportunity."
-                elif rec_type == 'SELL':
-                    summary += "Weak fundamentals or overbought conditions suggest caution."
-                else:
-                    summary += "Mixed signals. Hold current positions."
-
-                recommendations.append({
-                    'ticker': ticker,
-                    'company_name': stock_info.get('company_name', ticker),
-                    'current_price': stock_info.get('current_price'),
-                    'recommendation': rec_type,
-                    'confidence': int(confidence),
-                    'overall_score': overall_score,
-                    'market': 'US' if ticker in us_stocks else 'DE',
-                    'summary': summary
-                })
+    except Exception as e:
+        logger.exception("[AI-RECS] Failed to generate AI recommendations")
+        return jsonify({'error': f'Failed to generate AI recommendations: {str(e)}'}), 500
 
-            except Exception as e:
-                print(f"Error analyzing {ticker}: {str(e)}")
-                continue
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {current_app.json.dumps(data)}\n\n"
 
-        # Sort by confidence score
-        recommendations.sort(key=lambda x: x['confidence'], reverse=True)
-
-        # Get top 10 buys and top 10 sells
-        buy_recs = [r for r in recommendations if r['recommendation'] == 'BUY'][:10]
-        sell_recs = [r for r in recommendations if r['recommendation'] == 'SELL'][:10]
-
-        # If we have too few recommendations due to API failures, add mock data
-        if len(buy_recs) < 5 or len(sell_recs) < 3:
-            from app.services.mock_data_service import MockDataService
-
-            # Add mock buy recommendations
-            mock_buy_tickers = ['NVDA', 'AMD', 'CRM', 'ADBE', 'ORCL', 'IBM', 'INTC']
-            for ticker in mock_buy_tickers:
-                if len(buy_recs) >= 10:
-                    break
-                if not any(r['ticker'] == ticker for r in recommendations):
-                    mock_info = MockDataService.get_mock_stock_info(ticker)
-                    mock_fundamental = MockDataService.get_mock_fundamental_analysis(ticker)
-
-                    buy_recs.append({
-                        'ticker': ticker,
-                        'company_name': mock_info.get('company_name', ticker),
-                        'current_price': mock_info.get('current_price'),
-                        'recommendation': 'BUY',
-                        'confidence': 75 + len(buy_recs),
-                        'overall_score': mock_fundamental.get('overall_score', 65),
-                        'market': 'US',
-                        'summary': f"Score: {mock_fundamental.get('overall_score', 65):.0f}/100. Mock data: Strong fundamentals suggest buying opportunity."
-                    })
-
-            # Add mock sell recommendations
-            mock_sell_tickers = ['SNAP', 'PINS', 'ROKU', 'BYND', 'SPCE']
-            for ticker in mock_sell_tickers:
-                if len(sell_recs) >= 10:
-                    break
-                if not any(r['ticker'] == ticker for r in recommendations):
-                    mock_info = MockDataService.get_mock_stock_info(ticker)
-                    mock_fundamental = MockDataService.get_mock_fundamental_analysis(ticker)
-
-                    sell_recs.append({
-                        'ticker': ticker,
-                        'company_name': mock_info.get('company_name', ticker),
-                        'current_price': mock_info.get('current_price'),
-                        'recommendation': 'SELL',
-                        'confidence': 70 + len(sell_recs),
-                        'overall_score': mock_fundamental.get('overall_score', 35),
-                        'market': 'US',
-                        'summary': f"Score: {mock_fundamental.get('overall_score', 35):.0f}/100. Mock data: Weak fundamentals suggest caution."
-                    })
-
-        logger.info(f"[AI-RECS] Analysis complete: {len(buy_recs)} BUY, {len(sell_recs)} SELL from {len(recommendations)} total")
-        logger.info(f"[AI-RECS] Failed API calls: {failed_count}")
+@bp.route('/ai-recommendations/stream', methods=['POST'])
+@jwt_required(optional=True)
+def stream_ai_recommendations():
+    """
+    Same analysis as /ai-recommendations as Server-Sent Events: a
+    'recommendation' event for each ticker as soon as it is analyzed, then
+    a 'summary' event with the full /ai-recommendations response (or an
+    'error' event)
+    """
+    logger.info("[AI-RECS] Starting streamed AI recommendations analysis")
+    futures = _submit_recommendations()
 
-        return jsonify({
-            'top_buys': buy_recs[:10],  # Ensure max 10
-            'top_sells': sell_recs[:10],  # Ensure max 10
-            'analyzed_count': len(recommendations),
-            'using_mock_data': failed_count > 5,  # Indicate if using mock data
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        }), 200
+    def generate():
+        failed_count = 0
+        try:
+            for future in as_completed(futures):
+                recommendation, failed = future.result()
+                failed_count += failed
+                if recommendation:
+                    yield _sse_event('recommendation', recommendation)
+
+            # Ticker order, so ties rank as in /ai-recommendations
+            recommendations = [rec for rec, _ in (future.result() for future in futures) if rec]
+            yield _sse_event('summary', _recommendations_summary(recommendations, failed_count))
+        except Exception as e:
+            logger.exception("[AI-RECS] Failed to stream AI recommendations")
+            yield _sse_event('error', {'error': f'Failed to generate AI recommendations: {str(e)}'})
 
-    except Exception as e:
-        logger.error(f"[AI-RECS] ERROR: {str(e)}")
-        import traceback
-        logger.error(f"[AI-RECS] Traceback: {traceback.format_exc()}")
-        return jsonify({'error': f'Failed to generate AI recommendations: {str(e)}'}), 500
+    return current_app.response_class(stream_with_context(generate()), mimetype='text/event-stream',
+                                      headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @bp.route('/compare', methods=['POST'])
 def compare_stocks():
@@ -527,21 +682,30 @@ def compare_stocks():
         comparison_data = []
         price_histories = []
 
-        for ticker in tickers:
+        # Start every provider call for every ticker at once (a flat set of
+        # tasks, so no task waits on another task of the pool)
+        pending = [(ticker, {
+            'info': _submit(StockService.get_stock_info, ticker),
+            'fundamental': _submit(StockService.get_fundamental_analysis, ticker),
+            'technical': _submit(StockService.calculate_technical_indicators, ticker),
+            'history': _submit(StockService.get_price_history, ticker, period),
+        }) for ticker in tickers]
+
+        for ticker, calls in pending:
             try:
                 # Get basic stock info
-                stock_info = StockService.get_stock_info(ticker)
+                stock_info = calls['info'].result()
                 if not stock_info:
                     continue
 
                 # Get fundamental analysis
-                fundamental = StockService.get_fundamental_analysis(ticker)
+                fundamental = calls['fundamental'].result()
 
                 # Get technical indicators
-                technical = StockService.calculate_technical_indicators(ticker)
+                technical = calls['technical'].result()
 
                 # Get price history
-                history = StockService.get_price_history(ticker, period)
+                history = calls['history'].result()
 
                 comparison_data.append({
                     'ticker': ticker.upper(),
@@ -562,17 +726,18 @@ def compare_stocks():
                 if history and history.get('data'):
                     # Normalize price history for comparison (percentage change from start)
                     hist_data = history['data']
-                    if len(hist_data) > 0:
-                        start_price = float(hist_data[0]['close'])
-                        normalized_data = []
-                        
-                        for point in hist_data:
-                            normalized_data.append({
-                                'date': point['date'],
-                                'close': float(point['close']),
-                                'normalized': ((float(point['close']) - start_price) / start_price * 100),
-                                'volume': int(point.get('volume', 0))
-                            })
+                    # Whole series at once; float/int conversion matches float() and int()
+                    closes = np.array([point['close'] for point in hist_data], dtype=float)
+                    if len(closes) > 0 and closes[0] != 0:
+                        volumes = np.array([point.get('volume', 0) for point in hist_data],
+                                           dtype=float).astype(np.int64)
+                        normalized = (closes - closes[0]) / closes[0] * 100
+
+                        normalized_data = [
+                            {'date': point['date'], 'close': close, 'normalized': change, 'volume': volume}
+                            for point, close, change, volume in zip(
+                                hist_data, closes.tolist(), normalized.tolist(), volumes.tolist())
+                        ]
 
                         price_histories.append({
                             'ticker': ticker.upper(),
@@ -590,13 +755,13 @@ def compare_stocks():
             'comparison': comparison_data,
             'price_histories': price_histories,
             'period': period,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': request_now_iso()
         }), 200
 
     except Exception as e:
         return jsonify({'error': f'Failed to compare stocks: {str(e)}'}), 500
 
-@bp.route('/<ticker>/news', methods=['GET'])
+@bp.route('/<ticker:ticker>/news', methods=['GET'])
 def get_stock_news(ticker):
     """
     Get latest news for a stock with sentiment analysis
@@ -612,8 +777,11 @@ def get_stock_news(ticker):
     - categories: News categories breakdown
     """
     try:
-        limit = min(int(request.args.get('limit', 10)), 50)
-        days = min(int(request.args.get('days', 7)), 30)
+        try:
+            limit = bounded_int('limit', 10, 1, 50)
+            days = bounded_int('days', 7, 1, 30)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         news_data = NewsService.get_company_news(ticker, days=days, limit=limit)
         
@@ -637,7 +805,10 @@ def get_market_news():
     - news: List of general market news articles
     """
     try:
-        limit = min(int(request.args.get('limit', 20)), 50)
+        try:
+            limit = bounded_int('limit', 20, 1, 50)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         news_data = NewsService.get_market_news(limit=limit)
         
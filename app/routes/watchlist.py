@@ -1,29 +1,93 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.middleware.identity import current_user_id
+from app import cache, db
 from app.models import Watchlist
+from app.models.tickers import normalize_ticker
+from app.models.timestamps import request_now
 from app.services import StockService
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import logging
+
+logger = logging.getLogger(__name__)
 
 bp = Blueprint('watchlist', __name__, url_prefix='/api/watchlist')
 
+# Seconds a stored watchlist price is served before a refresh is started
+WATCHLIST_PRICE_TTL = 60
+REFRESH_WORKERS = 4
+_refresh_pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS,
+                                   thread_name_prefix='watchlist-refresh')
+
+def refresh_watchlist_prices(user_id):
+    """
+    Fetch current prices for a user's watchlist (cached quotes in one
+    query, the rest concurrently) and store them in one commit
+    """
+    watchlist_items = Watchlist.query.filter_by(user_id=user_id).all()
+    stock_infos = StockService.get_stock_infos([item.ticker for item in watchlist_items])
+    updated = False
+    for item in watchlist_items:
+        stock_info = stock_infos.get(item.ticker)
+        if stock_info and stock_info.get('current_price'):
+            item.update_price(stock_info['current_price'])
+            updated = True
+    if updated:
+        # The flush sends the UPDATEs as one executemany batch
+        db.session.commit()
+
+def _refresh_in_app_context(app, user_id):
+    with app.app_context():
+        try:
+            refresh_watchlist_prices(user_id)
+        except Exception:
+            db.session.rollback()
+            logger.exception(f"Watchlist price refresh failed for user {user_id}")
+
+def _schedule_price_refresh(user_id):
+    """
+    Refresh the user's prices on the background pool. A flag in the shared
+    cache starts at most one refresh per user every WATCHLIST_PRICE_TTL
+    seconds, across workers.
+    """
+    try:
+        if not cache.add(f'watchlist-refresh:{user_id}', 1, timeout=WATCHLIST_PRICE_TTL):
+            return False
+    except Exception as e:
+        logger.warning(f"Watchlist refresh flag failed for user {user_id}: {e}")
+        return False
+    _refresh_pool.submit(_refresh_in_app_context, current_app._get_current_object(), user_id)
+    return True
+
+def _is_stale(item, stale_before):
+    last_updated = item.last_updated
+    if last_updated is None:
+        return True
+    if last_updated.tzinfo is None:
+        last_updated = last_updated.replace(tzinfo=timezone.utc)
+    return last_updated < stale_before
+
 @bp.route('/', methods=['GET'])
 @jwt_required()
 def get_watchlist():
-    """Get user's watchlist"""
+    """
+    Get user's watchlist with the stored prices. Prices older than
+    WATCHLIST_PRICE_TTL are refreshed in the background, so the response
+    never waits on the data providers; prices_refreshing tells the client
+    to poll again for the new ones.
+    """
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         watchlist_items = Watchlist.query.filter_by(user_id=user_id).all()
 
-        # Update current prices
-        for item in watchlist_items:
-            stock_info = StockService.get_stock_info(item.ticker)
-            if stock_info and stock_info.get('current_price'):
-                item.update_price(stock_info['current_price'])
-                db.session.commit()
+        stale_before = request_now() - timedelta(seconds=WATCHLIST_PRICE_TTL)
+        refreshing = (any(_is_stale(item, stale_before) for item in watchlist_items)
+                      and _schedule_price_refresh(user_id))
 
         return jsonify({
-            'items': [item.to_dict() for item in watchlist_items]
+            'items': [item.to_dict() for item in watchlist_items],
+            'prices_refreshing': refreshing
         }), 200
 
     except Exception as e:
@@ -34,17 +98,18 @@ def get_watchlist():
 def add_to_watchlist():
     """Add stock to watchlist"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.get_json()
 
         if not data.get('ticker'):
             return jsonify({'error': 'Ticker is required'}), 400
 
-        ticker = data['ticker'].upper()
+        ticker = normalize_ticker(data['ticker'])
+        if not ticker:
+            return jsonify({'error': 'Invalid ticker'}), 400
 
         # Check if already in watchlist
-        existing = Watchlist.query.filter_by(user_id=user_id, ticker=ticker).first()
-        if existing:
+        if Watchlist.contains(user_id, ticker):
             return jsonify({'error': 'Stock already in watchlist'}), 400
 
         # Get stock info
@@ -80,15 +145,15 @@ def add_to_watchlist():
         db.session.rollback()
         return jsonify({'error': f'Failed to add to watchlist: {str(e)}'}), 500
 
-@bp.route('/<ticker>', methods=['DELETE'])
+@bp.route('/<ticker:ticker>', methods=['DELETE'])
 @jwt_required()
 def remove_from_watchlist(ticker):
     """Remove stock from watchlist"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         watchlist_item = Watchlist.query.filter_by(
             user_id=user_id,
-            ticker=ticker.upper()
+            ticker=ticker
         ).first()
 
         if not watchlist_item:
@@ -105,17 +170,17 @@ def remove_from_watchlist(ticker):
         db.session.rollback()
         return jsonify({'error': f'Failed to remove from watchlist: {str(e)}'}), 500
 
-@bp.route('/<ticker>', methods=['PUT'])
+@bp.route('/<ticker:ticker>', methods=['PUT'])
 @jwt_required()
 def update_watchlist_item(ticker):
     """Update watchlist item (notes, tags)"""
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         data = request.get_json()
 
         watchlist_item = Watchlist.query.filter_by(
             user_id=user_id,
-            ticker=ticker.upper()
+            ticker=ticker
         ).first()
 
         if not watchlist_item:
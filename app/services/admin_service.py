@@ -3,22 +3,34 @@ Admin Service - Handles all admin-related business logic
 """
 from typing import Dict, List, Any, Optional
 from app import db
-from app.models import User, Portfolio, Transaction, Watchlist, Alert
+from app.models import User, Transaction
 from sqlalchemy import func
+from sqlalchemy.orm import raiseload
 from datetime import datetime, timezone, timedelta
 import logging
+from app.services.shared_cache import shared_cached
 
 logger = logging.getLogger(__name__)
 
+# Seconds the system stats stay in the shared cache
+SYSTEM_STATS_CACHE_TTL = 30
+
 class AdminService:
     """Service for admin operations"""
 
     @staticmethod
     def get_users(page: int = 1, per_page: int = 50, search: str = None,
-                  is_admin: bool = None) -> Dict[str, Any]:
-        """Get paginated list of users with optional filters"""
+                  is_admin: bool = None, cursor: int = None) -> Dict[str, Any]:
+        """
+        Get paginated list of users with optional filters.
+        When cursor (next_cursor from the previous page) is given, uses
+        keyset pagination on the id instead of OFFSET, and the response
+        carries next_cursor without the page totals.
+        """
         try:
-            query = User.query
+            # Stats are loaded in bulk; raiseload turns any lazy relationship
+            # load from to_dict into an error instead of a query per user
+            query = User.query.options(raiseload('*'))
 
             # Apply search filter
             if search:
@@ -33,77 +45,95 @@ class AdminService:
             if is_admin is not None:
                 query = query.filter(User.is_admin == is_admin)
 
+            if cursor is not None:
+                # Seek past the previous page; ids grow with creation date,
+                # so this keeps the newest-first order
+                users = query.filter(User.id < cursor).order_by(
+                    User.id.desc()).limit(per_page + 1).all()
+                has_more = len(users) > per_page
+                users = users[:per_page]
+                return {
+                    'users': AdminService._users_with_stats(users),
+                    'per_page': per_page,
+                    'next_cursor': users[-1].id if has_more else None
+                }
+
             # Order by creation date (newest first)
             query = query.order_by(User.created_at.desc())
 
             # Paginate
             pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
-            # Build user data with stats
-            users_data = []
-            for user in pagination.items:
-                # Get portfolio value
-                portfolio_value = db.session.query(
-                    func.sum(Portfolio.total_invested)
-                ).filter_by(user_id=user.id).scalar() or 0
-
-                # Get counts
-                portfolio_count = Portfolio.query.filter_by(user_id=user.id).count()
-                watchlist_count = Watchlist.query.filter_by(user_id=user.id).count()
-                alerts_count = Alert.query.filter_by(user_id=user.id).count()
-
-                user_dict = user.to_dict()
-                user_dict.update({
-                    'portfolio_count': portfolio_count,
-                    'total_portfolio_value': float(portfolio_value),
-                    'watchlist_count': watchlist_count,
-                    'alerts_count': alerts_count
-                })
-                users_data.append(user_dict)
-
             return {
-                'users': users_data,
+                'users': AdminService._users_with_stats(pagination.items),
                 'total': pagination.total,
                 'page': pagination.page,
                 'per_page': pagination.per_page,
-                'total_pages': pagination.pages
+                'total_pages': pagination.pages,
+                'next_cursor': pagination.items[-1].id if pagination.has_next else None
             }
 
         except Exception as e:
             logger.error(f"Error getting users: {str(e)}")
             raise
 
+    @staticmethod
+    def _users_with_stats(users: List[User]) -> List[Dict[str, Any]]:
+        """
+        Serialize users with their portfolio, watchlist and alert stats,
+        read from the counter columns on each user row
+        """
+        users_data = []
+        for user in users:
+            user_dict = user.to_dict()
+            user_dict.update({
+                'portfolio_count': user.portfolio_count,
+                'total_portfolio_value': float(user.total_invested or 0),
+                'watchlist_count': user.watchlist_count,
+                'alerts_count': user.alerts_count
+            })
+            users_data.append(user_dict)
+
+        return users_data
+
+    @staticmethod
+    def _count_rows(model, *criteria):
+        """Scalar subquery counting the rows of model matching criteria"""
+        return db.select(func.count(model.id)).where(*criteria).scalar_subquery()
+
+    @staticmethod
+    def _sum_column(column):
+        """Scalar subquery summing column over its table, 0 when empty"""
+        return db.select(func.coalesce(func.sum(column), 0)).scalar_subquery()
+
     @staticmethod
     def get_user_details(user_id: int) -> Optional[Dict[str, Any]]:
         """Get detailed user information"""
         try:
-            user = db.session.get(User, user_id)
+            user = db.session.get(User, user_id, options=[raiseload('*')])
             if not user:
                 return None
 
-            # Get portfolio stats
-            portfolio_positions = Portfolio.query.filter_by(user_id=user_id).all()
-            total_value = sum(p.total_invested for p in portfolio_positions)
-            total_invested = sum(p.total_invested for p in portfolio_positions)
+            # Stored counters cover everything but transactions
+            transactions_count = db.session.execute(
+                db.select(AdminService._count_rows(Transaction, Transaction.user_id == user_id))
+            ).scalar_one()
+            total_invested = user.total_invested or 0
+            total_value = total_invested
 
             # Calculate total return (simplified)
             total_return = 0  # Would need current prices to calculate actual return
 
-            # Get counts
-            transactions_count = Transaction.query.filter_by(user_id=user_id).count()
-            watchlist_count = Watchlist.query.filter_by(user_id=user_id).count()
-            alerts_count = Alert.query.filter_by(user_id=user_id).count()
-
             user_data = user.to_dict()
             user_data.update({
                 'portfolio': {
-                    'positions': len(portfolio_positions),
+                    'positions': user.portfolio_count,
                     'total_value': float(total_value),
                     'total_invested': float(total_invested),
                     'total_return': float(total_return)
                 },
-                'watchlist_count': watchlist_count,
-                'alerts_count': alerts_count,
+                'watchlist_count': user.watchlist_count,
+                'alerts_count': user.alerts_count,
                 'transactions_count': transactions_count
             })
 
@@ -124,21 +154,13 @@ class AdminService:
             # Update allowed fields
             if 'username' in data:
                 # Check if username is already taken
-                existing = User.query.filter(
-                    User.username == data['username'],
-                    User.id != user_id
-                ).first()
-                if existing:
+                if User.is_taken('username', data['username'], exclude_id=user_id):
                     raise ValueError("Username already taken")
                 user.username = data['username']
 
             if 'email' in data:
                 # Check if email is already taken
-                existing = User.query.filter(
-                    User.email == data['email'],
-                    User.id != user_id
-                ).first()
-                if existing:
+                if User.is_taken('email', data['email'], exclude_id=user_id):
                     raise ValueError("Email already taken")
                 user.email = data['email']
 
@@ -218,40 +240,36 @@ class AdminService:
             raise
 
     @staticmethod
+    @shared_cached('admin_stats', SYSTEM_STATS_CACHE_TTL)
     def get_system_stats() -> Dict[str, Any]:
-        """Get system-wide statistics"""
+        """
+        Get system-wide statistics, counted in one query and kept in the
+        shared cache for SYSTEM_STATS_CACHE_TTL seconds
+        """
         try:
-            # User stats
-            total_users = User.query.count()
-            admin_count = User.query.filter_by(is_admin=True).count()
-
-            # Activity stats (last 24 hours)
-            yesterday = datetime.now(timezone.utc) - timedelta(days=1)
-            active_today = User.query.filter(User.last_login >= yesterday).count()
-
-            # Activity stats (last 7 days)
-            week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-            active_week = User.query.filter(User.last_login >= week_ago).count()
-            new_users_week = User.query.filter(User.created_at >= week_ago).count()
-
-            # Content stats
-            total_portfolios = Portfolio.query.count()
-            total_transactions = Transaction.query.count()
-            total_watchlist = Watchlist.query.count()
-            total_alerts = Alert.query.count()
-
-            return {
-                'total_users': total_users,
-                'active_users_today': active_today,
-                'active_users_week': active_week,
-                'admin_count': admin_count,
-                'new_users_week': new_users_week,
-                'total_portfolios': total_portfolios,
-                'total_transactions': total_transactions,
-                'total_watchlist_items': total_watchlist,
-                'total_alerts': total_alerts,
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            }
+            now = datetime.now(timezone.utc)
+            yesterday = now - timedelta(days=1)
+            week_ago = now - timedelta(days=7)
+
+            count = AdminService._count_rows
+            total = AdminService._sum_column
+            stats = db.session.execute(db.select(
+                # User stats
+                count(User).label('total_users'),
+                count(User, User.is_admin == True).label('admin_count'),
+                # Activity stats (last 24 hours / 7 days)
+                count(User, User.last_login >= yesterday).label('active_users_today'),
+                count(User, User.last_login >= week_ago).label('active_users_week'),
+                count(User, User.created_at >= week_ago).label('new_users_week'),
+                # Content stats (from the per-user counters)
+                total(User.portfolio_count).label('total_portfolios'),
+                count(Transaction).label('total_transactions'),
+                total(User.watchlist_count).label('total_watchlist_items'),
+                total(User.alerts_count).label('total_alerts')
+            )).one()._asdict()
+
+            stats['timestamp'] = now.isoformat()
+            return stats
 
         except Exception as e:
             logger.error(f"Error getting system stats: {str(e)}")
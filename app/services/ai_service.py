@@ -1,11 +1,28 @@
 import os
 import json
-import requests
 from typing import Dict, Any, Optional
 import logging
+import threading
+from app.services.http_client import http_session
 
 logger = logging.getLogger(__name__)
 
+_shared_ai_service = None
+_shared_ai_service_lock = threading.Lock()
+
+def get_ai_service():
+    """
+    Return the process-wide AIService. It is created on first use, after
+    the environment (and so the API keys) has been loaded, and keeps no
+    per-call state, so threads can share it.
+    """
+    global _shared_ai_service
+    if _shared_ai_service is None:
+        with _shared_ai_service_lock:
+            if _shared_ai_service is None:
+                _shared_ai_service = AIService()
+    return _shared_ai_service
+
 class AIService:
     """Service for AI-enhanced stock analysis using OpenAI or Google Gemini API"""
 
@@ -111,7 +128,7 @@ Provide realistic estimates based on your knowledge. If you don't have data, use
             logger.info(f"Fetching AI fallback data for {ticker}")
 
             if self.provider == 'google':
-                response = requests.post(
+                response = http_session.post(
                     self.api_url,
                     json={
                         "contents": [{
@@ -125,7 +142,7 @@ Provide realistic estimates based on your knowledge. If you don't have data, use
                     timeout=60
                 )
             else:  # OpenAI
-                response = requests.post(
+                response = http_session.post(
                     self.api_url,
                     headers=self.headers,
                     json={
@@ -206,7 +223,7 @@ Base the data on realistic price movements for this stock. Use your knowledge of
             logger.info(f"Fetching AI fallback historical data for {ticker} ({period})")
 
             if self.provider == 'google':
-                response = requests.post(
+                response = http_session.post(
                     self.api_url,
                     json={
                         "contents": [{"parts": [{"text": prompt}]}],
@@ -218,7 +235,7 @@ Base the data on realistic price movements for this stock. Use your knowledge of
                     timeout=60
                 )
             else:
-                response = requests.post(
+                response = http_session.post(
                     self.api_url,
                     headers=self.headers,
                     json={
@@ -280,6 +297,7 @@ Base the data on realistic price movements for this stock. Use your knowledge of
         
         try:
             prompt = self._create_analysis_prompt(stock_data, technical_indicators, fundamental_analysis, short_data, news_sentiment)
+            provider, provider_name = self.provider, self.provider_name
 
             # Try primary provider (Gemini or OpenAI based on configured keys)
             if self.provider == 'google':
@@ -290,9 +308,9 @@ Base the data on realistic price movements for this stock. Use your knowledge of
                     logger.warning(f"Gemini failed for {ticker}, trying OpenAI fallback")
                     analysis_text = self._call_openai(prompt)
                     if analysis_text:
-                        # Temporarily switch provider info for this response
-                        self.provider = 'openai'
-                        self.provider_name = 'OpenAI GPT-4 (Fallback)'
+                        # Switch provider info for this response only
+                        provider = 'openai'
+                        provider_name = 'OpenAI GPT-4 (Fallback)'
 
             else:  # openai
                 analysis_text = self._call_openai(prompt)
@@ -319,8 +337,8 @@ Base the data on realistic price movements for this stock. Use your knowledge of
                 'ai_analysis': structured_analysis,
                 'raw_analysis': analysis_text,
                 'confidence_score': self._calculate_confidence_score(stock_data, technical_indicators, fundamental_analysis),
-                'provider': self.provider,
-                'provider_name': self.provider_name,  # NEW: Human-readable name
+                'provider': provider,
+                'provider_name': provider_name,  # NEW: Human-readable name
                 'timestamp': None  # Will be set by the caller
             }
 
@@ -361,7 +379,7 @@ Your analysis is sought after by institutional investors, hedge funds, and indiv
                 }
             }
 
-            response = requests.post(self.api_url, json=payload, timeout=90)
+            response = http_session.post(self.api_url, json=payload, timeout=90)
 
             if response.status_code == 200:
                 result = response.json()
@@ -429,7 +447,7 @@ Your analysis is sought after by institutional investors, hedge funds, and indiv
                 "max_tokens": 4000
             }
 
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=90)
+            response = http_session.post(self.api_url, headers=self.headers, json=payload, timeout=90)
 
             if response.status_code == 200:
                 result = response.json()
@@ -887,7 +905,7 @@ Provide:
                 "max_tokens": 800
             }
 
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=30)
+            response = http_session.post(self.api_url, headers=self.headers, json=payload, timeout=30)
 
             if response.status_code == 200:
                 result = response.json()
@@ -1,13 +1,18 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from app import db, mail
-from app.models import Alert, User
+from sqlalchemy import select, update
+from sqlalchemy.orm import load_only, raiseload
+from app import db
+from app.models import Alert, User, check_triggers_bulk
+from app.models.tickers import normalize_ticker
 from app.services.stock_service import StockService
-from flask_mail import Message
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Alerts locked and evaluated per transaction in check_alerts
+ALERT_CHECK_BATCH_SIZE = 500
+
 class AlertService:
     """Service for managing price alerts"""
 
@@ -22,7 +27,7 @@ class AlertService:
 
             alert = Alert(
                 user_id=user_id,
-                ticker=alert_data['ticker'].upper(),
+                ticker=normalize_ticker(alert_data['ticker']),
                 alert_type=alert_data['alert_type'],
                 target_value=float(alert_data['target_value']),
                 current_value=stock_info.get('current_price'),
@@ -43,32 +48,53 @@ class AlertService:
             return None
 
     @staticmethod
-    def check_alerts() -> List[Alert]:
-        """Check all active alerts and trigger if conditions are met"""
+    def check_alerts(batch_size: int = ALERT_CHECK_BATCH_SIZE) -> List[Alert]:
+        """
+        Check all active alerts and trigger if conditions are met.
+
+        Alerts are processed in id order, batch_size at a time, each batch
+        in its own transaction. On PostgreSQL the batch rows are locked
+        with FOR UPDATE SKIP LOCKED, so several workers can check alerts
+        at once: each one skips rows another has claimed, and a triggered
+        alert is no longer selected once its batch commits. Notifications
+        are sent after the commit, so no row stays locked during their I/O.
+        """
         triggered_alerts = []
+        last_id = 0
 
         try:
-            active_alerts = Alert.query.filter_by(is_active=True, is_triggered=False).all()
-
-            # Group alerts by ticker for efficiency
-            alerts_by_ticker = {}
-            for alert in active_alerts:
-                if alert.ticker not in alerts_by_ticker:
-                    alerts_by_ticker[alert.ticker] = []
-                alerts_by_ticker[alert.ticker].append(alert)
-
-            # Check each ticker
-            for ticker, alerts in alerts_by_ticker.items():
-                stock_info = StockService.get_stock_info(ticker)
-                if stock_info and stock_info.get('current_price'):
-                    current_price = stock_info['current_price']
-
-                    for alert in alerts:
-                        if alert.check_trigger(current_price):
-                            triggered_alerts.append(alert)
-                            AlertService._send_alert_notification(alert)
+            while True:
+                active_alerts = db.session.scalars(
+                    select(Alert)
+                    .where(Alert.is_active.is_(True), Alert.is_triggered.is_(False), Alert.id > last_id)
+                    .order_by(Alert.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                ).all()
+                if not active_alerts:
+                    break
+                last_id = active_alerts[-1].id
+
+                # Fetch one price per distinct ticker in a single batch
+                stock_infos = StockService.get_stock_infos([alert.ticker for alert in active_alerts])
+                price_map = {
+                    ticker: info['current_price']
+                    for ticker, info in stock_infos.items()
+                    if info and info.get('current_price')
+                }
 
-            db.session.commit()
+                # Evaluate the batch in one vectorized pass
+                triggered = check_triggers_bulk(active_alerts, price_map)
+                triggered_ids = [alert.id for alert in triggered]
+
+                # Committing releases the batch's row locks
+                db.session.commit()
+                triggered_alerts.extend(triggered)
+                if triggered_ids:
+                    AlertService._notify_triggered(triggered_ids)
+
+                if len(active_alerts) < batch_size:
+                    break
 
         except Exception as e:
             logger.error(f"Error checking alerts: {str(e)}")
@@ -77,12 +103,42 @@ class AlertService:
         return triggered_alerts
 
     @staticmethod
-    def _send_alert_notification(alert: Alert) -> None:
-        """Send notification for triggered alert"""
+    def _notify_triggered(alert_ids: List[int]) -> None:
+        """
+        Send the notifications of a committed batch of triggered alerts,
+        then mark the ones sent with a single UPDATE
+        """
+        # Reload the committed alerts and their users in one query each
+        alerts = db.session.scalars(
+            select(Alert).where(Alert.id.in_(alert_ids)).order_by(Alert.id)
+        ).all()
+        db.session.scalars(
+            select(User)
+            .options(load_only(User.email, User.username, User.email_notifications, User.push_notifications))
+            .where(User.id.in_({alert.user_id for alert in alerts}))
+        ).all()
+
+        sent_ids = [alert.id for alert in alerts if AlertService._send_alert_notification(alert)]
+        if not sent_ids:
+            return
         try:
-            user = db.session.get(User, alert.user_id)
+            db.session.execute(
+                update(Alert).where(Alert.id.in_(sent_ids)).values(notification_sent=True)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error marking alert notifications sent: {str(e)}")
+
+    @staticmethod
+    def _send_alert_notification(alert: Alert) -> bool:
+        """Send notification for triggered alert; returns True once handled"""
+        try:
+            user = db.session.get(User, alert.user_id, options=[
+                load_only(User.email, User.username, User.email_notifications, User.push_notifications)
+            ])
             if not user:
-                return
+                return False
 
             if alert.notify_email and user.email_notifications:
                 AlertService._send_email_notification(user, alert)
@@ -90,16 +146,19 @@ class AlertService:
             if alert.notify_push and user.push_notifications:
                 AlertService._send_push_notification(user, alert)
 
-            alert.notification_sent = True
-            db.session.commit()
+            return True
 
         except Exception as e:
             logger.error(f"Error sending notification for alert {alert.id}: {str(e)}")
+            return False
 
     @staticmethod
     def _send_email_notification(user: User, alert: Alert) -> None:
         """Send email notification"""
         try:
+            from flask_mail import Message
+            from app import mail
+
             subject = f"Price Alert Triggered: {alert.ticker}"
 
             body = f"""
@@ -142,7 +201,8 @@ Stock Analyzer Team
     def get_user_alerts(user_id: int, active_only: bool = False) -> List[Dict[str, Any]]:
         """Get all alerts for a user"""
         try:
-            query = Alert.query.filter_by(user_id=user_id)
+            # No relationship is needed to serialize alerts; fail loudly if one is
+            query = Alert.query.options(raiseload('*')).filter_by(user_id=user_id)
 
             if active_only:
                 query = query.filter_by(is_active=True)
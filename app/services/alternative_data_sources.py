@@ -1,12 +1,12 @@
 """
 Alternative data sources for stock information when Yahoo Finance is unavailable
 """
-import requests
 import os
 import logging
 import time
 from typing import Dict, Optional, Any, Tuple
 from datetime import datetime
+from app.services.http_client import http_session
 
 logger = logging.getLogger(__name__)
 
@@ -132,7 +132,7 @@ class AlphaVantageService:
                 'apikey': api_key
             }
 
-            response = requests.get(AlphaVantageService.BASE_URL, params=params, timeout=10)
+            response = http_session.get(AlphaVantageService.BASE_URL, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -185,7 +185,7 @@ class AlphaVantageService:
                 'apikey': api_key
             }
 
-            response = requests.get(AlphaVantageService.BASE_URL, params=params, timeout=10)
+            response = http_session.get(AlphaVantageService.BASE_URL, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -230,7 +230,7 @@ class AlphaVantageService:
                 'apikey': api_key
             }
 
-            response = requests.get(AlphaVantageService.BASE_URL, params=params, timeout=10)
+            response = http_session.get(AlphaVantageService.BASE_URL, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -288,7 +288,7 @@ class FinnhubService:
                 'token': api_key
             }
 
-            response = requests.get(f"{FinnhubService.BASE_URL}/quote", params=params, timeout=10)
+            response = http_session.get(f"{FinnhubService.BASE_URL}/quote", params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -330,7 +330,7 @@ class FinnhubService:
                 'token': api_key
             }
 
-            response = requests.get(f"{FinnhubService.BASE_URL}/stock/profile2", params=params, timeout=10)
+            response = http_session.get(f"{FinnhubService.BASE_URL}/stock/profile2", params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -379,7 +379,7 @@ class TwelveDataService:
                 'apikey': api_key
             }
 
-            response = requests.get(f"{TwelveDataService.BASE_URL}/time_series", params=params, timeout=10)
+            response = http_session.get(f"{TwelveDataService.BASE_URL}/time_series", params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -425,7 +425,7 @@ class TwelveDataService:
                 'apikey': api_key
             }
 
-            response = requests.get(f"{TwelveDataService.BASE_URL}/quote", params=params, timeout=10)
+            response = http_session.get(f"{TwelveDataService.BASE_URL}/quote", params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -577,8 +577,8 @@ class FallbackDataService:
         # Ultimate fallback: Use AI for historical data
         logger.warning(f"All API sources failed for historical data {ticker}, attempting AI fallback...")
         try:
-            from app.services.ai_service import AIService
-            ai_service = AIService()
+            from app.services.ai_service import get_ai_service
+            ai_service = get_ai_service()
 
             # Map outputsize to period
             period_map = {
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from threading import Thread
 import atexit
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
@@ -40,6 +41,18 @@ class DataSchedulerService:
 
         # Start scheduler on app startup
         if not self.scheduler.running:
+            # Jobs are I/O-bound (API calls, DB writes), so a thread pool lets
+            # them run side by side; late runs within the grace time still fire
+            self.scheduler.configure(
+                executors={
+                    'default': ThreadPoolExecutor(app.config.get('SCHEDULER_MAX_WORKERS', 5))
+                },
+                job_defaults={
+                    'coalesce': True,
+                    'max_instances': 1,
+                    'misfire_grace_time': app.config.get('SCHEDULER_MISFIRE_GRACE_TIME', 60)
+                }
+            )
             self.scheduler.start()
             self.is_running = True
 
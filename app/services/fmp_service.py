@@ -8,9 +8,16 @@ import requests
 import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
+from app.models import StockCache
+from app.models.timestamps import request_now
+from app.services.http_client import http_session
 
 logger = logging.getLogger(__name__)
 
+# Scores come from quarterly filings and TTM ratios change at most daily, so
+# responses are kept in StockCache for a day
+FMP_CACHE_TTL = timedelta(hours=24)
+
 
 class FMPService:
     """Service for accessing Financial Modeling Prep API"""
@@ -50,7 +57,7 @@ class FMPService:
             url = f"{FMPService.BASE_URL}{endpoint}"
             logger.debug(f"FMP API request: {url}")
 
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -73,6 +80,15 @@ class FMPService:
             logger.error(f"Unexpected error in FMP API request: {e}")
             return None
 
+    @staticmethod
+    def _store(ticker: str, data: Dict[str, Any], data_type: str) -> None:
+        """Cache an FMP response for FMP_CACHE_TTL; failures only cost a later API call"""
+        try:
+            StockCache.set_cache(ticker.upper(), data, data_type,
+                                 expires_at=request_now() + FMP_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Could not cache {data_type} for {ticker}: {e}")
+
     @staticmethod
     def get_financial_score(ticker: str) -> Optional[Dict[str, Any]]:
         """
@@ -94,6 +110,10 @@ class FMPService:
                 "efficiency": 2
             }
         """
+        cached = StockCache.get_cached(ticker.upper(), 'financial_score')
+        if cached:
+            return cached
+
         endpoint = "/v4/score"
         params = {'symbol': ticker.upper()}
 
@@ -106,7 +126,7 @@ class FMPService:
         # FMP returns list, take first element
         score_data = data[0] if isinstance(data, list) else data
 
-        return {
+        score = {
             'symbol': score_data.get('symbol', ticker.upper()),
             'piotroskiScore': score_data.get('piotroskiScore'),
             'altmanZScore': score_data.get('altmanZScore'),
@@ -115,6 +135,9 @@ class FMPService:
             'efficiency': score_data.get('efficiency')
         }
 
+        FMPService._store(ticker, score, 'financial_score')
+        return score
+
     @staticmethod
     def get_financial_ratios(ticker: str) -> Optional[Dict[str, Any]]:
         """
@@ -126,6 +149,10 @@ class FMPService:
         Returns:
             Dict with financial ratios or None on error
         """
+        cached = StockCache.get_cached(ticker.upper(), 'financial_ratios')
+        if cached:
+            return cached
+
         endpoint = f"/v3/ratios-ttm/{ticker.upper()}"
 
         data = FMPService._make_request(endpoint)
@@ -135,4 +162,6 @@ class FMPService:
             return None
 
         # FMP returns list, take first element
-        return data[0] if isinstance(data, list) else data
+        ratios = data[0] if isinstance(data, list) else data
+        FMPService._store(ticker, ratios, 'financial_ratios')
+        return ratios
@@ -327,11 +327,11 @@ class HistoricalDataService:
                 HistoricalPrice.query.filter_by(ticker=ticker).all()
             }
 
-            new_count = 0
             updated_count = 0
+            new_rows = []
 
             for point in data:
-                point_date = point['date']
+                point_date = HistoricalPrice.parse_date(point['date'])
 
                 if point_date in existing_dates:
                     # Update existing record
@@ -345,22 +345,12 @@ class HistoricalDataService:
                     existing.updated_at = datetime.now()
                     updated_count += 1
                 else:
-                    # Create new record (add to session individually to avoid bulk_save_objects constraint issues)
-                    new_record = HistoricalPrice(
-                        ticker=ticker,
-                        date=point_date,
-                        open=point.get('open'),
-                        high=point.get('high'),
-                        low=point.get('low'),
-                        close=point.get('close'),
-                        volume=point.get('volume'),
-                        source=source
-                    )
-                    db.session.add(new_record)
-                    new_count += 1
-
-            # Commit all changes at once
+                    # New rows are written in one COPY/multi-row INSERT below
+                    new_rows.append({**point, 'ticker': ticker, 'date': point_date, 'source': source})
+
+            # Commit updates, then bulk insert the new dates
             db.session.commit()
+            new_count = HistoricalPrice.bulk_copy(new_rows)
 
             total_stored = new_count + updated_count
             logger.info(f"[Historical] Stored {total_stored} points for {ticker} ({new_count} new, {updated_count} updated)")
@@ -0,0 +1,61 @@
+"""
+Shared HTTP session for upstream provider calls
+"""
+
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+# Most requests in flight to one provider host at a time, across all threads
+UPSTREAM_CONCURRENCY = int(os.environ.get('UPSTREAM_CONCURRENCY', 8))
+# Upper bound of the random delay before waiting for a busy host's slot
+UPSTREAM_JITTER = 0.05
+
+class ThrottledSession(requests.Session):
+    """
+    Session that allows at most max_concurrency requests per host at once,
+    so concurrent route fan-out cannot trip provider rate limits. A request
+    that finds its host busy sleeps a random jitter first, which spreads out
+    bursts instead of releasing them together.
+    """
+
+    def __init__(self, max_concurrency):
+        super().__init__()
+        self.max_concurrency = max_concurrency
+        self._slots = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, url):
+        host = urlsplit(url).hostname
+        with self._slots_lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self.max_concurrency)
+        return slot
+
+    def request(self, method, url, *args, **kwargs):
+        slot = self._slot(url)
+        if not slot.acquire(blocking=False):
+            time.sleep(random.uniform(0, UPSTREAM_JITTER))
+            slot.acquire()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            slot.release()
+
+def _build_session():
+    """
+    Session whose connections are kept alive and reused across calls and
+    threads, so repeated provider calls skip the TCP and TLS handshakes
+    """
+    session = ThrottledSession(UPSTREAM_CONCURRENCY)
+    adapter = HTTPAdapter(pool_maxsize=UPSTREAM_CONCURRENCY)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+http_session = _build_session()
@@ -2,13 +2,17 @@
 News Service for fetching and analyzing stock news
 """
 import os
-import requests
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 import logging
+from app.services.shared_cache import shared_cached
+from app.services.http_client import http_session
 
 logger = logging.getLogger(__name__)
 
+# Seconds news and sentiment results stay in the shared cache
+NEWS_CACHE_TTL = 600
+
 class NewsService:
     """Service for fetching company news and sentiment analysis"""
     
@@ -16,6 +20,7 @@ class NewsService:
     ALPHA_VANTAGE_API_KEY = os.environ.get('ALPHA_VANTAGE_API_KEY')
     
     @staticmethod
+    @shared_cached('news', NEWS_CACHE_TTL)
     def get_company_news(ticker: str, days: int = 7, limit: int = 10) -> Optional[Dict[str, Any]]:
         """
         Get company-specific news with sentiment
@@ -80,7 +85,7 @@ class NewsService:
                 'token': NewsService.FINNHUB_API_KEY
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 articles = response.json()
@@ -122,7 +127,7 @@ class NewsService:
                 'apikey': NewsService.ALPHA_VANTAGE_API_KEY
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -252,6 +257,7 @@ class NewsService:
         return categories
     
     @staticmethod
+    @shared_cached('market_news', NEWS_CACHE_TTL)
     def get_market_news(limit: int = 20) -> Optional[Dict[str, Any]]:
         """
         Get general market news
@@ -272,7 +278,7 @@ class NewsService:
                 'token': NewsService.FINNHUB_API_KEY
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 articles = response.json()[:limit]
@@ -302,6 +308,7 @@ class NewsService:
             return None
 
     @staticmethod
+    @shared_cached('news_sentiment', NEWS_CACHE_TTL)
     def get_aggregated_sentiment(ticker: str, days: int = 7) -> Dict[str, Any]:
         """
         Get news and aggregate sentiment scores
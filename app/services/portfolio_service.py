@@ -1,15 +1,27 @@
 from typing import Dict, List, Optional, Any
+from concurrent.futures import Future
 from datetime import datetime, timezone, timedelta
+from cachetools import TTLCache
 from sqlalchemy import func
+from sqlalchemy.orm import raiseload
 from app import db
 from app.models import Portfolio, Transaction, User
+from app.models.tickers import normalize_ticker
 from app.services.stock_service import StockService
 from app.services.risk_analytics import RiskAnalytics
 import numpy as np
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Risk metrics per user id, reused by repeated polls until a transaction changes them
+RISK_ANALYTICS_TTL = 60
+_risk_results = TTLCache(maxsize=1024, ttl=RISK_ANALYTICS_TTL)
+# Calculations in progress, so concurrent requests for one user share a result
+_risk_inflight: Dict[int, Future] = {}
+_risk_lock = threading.Lock()
+
 class PortfolioService:
     """Service for portfolio management operations"""
 
@@ -20,7 +32,7 @@ class PortfolioService:
             # Create transaction
             transaction = Transaction(
                 user_id=user_id,
-                ticker=transaction_data['ticker'].upper(),
+                ticker=normalize_ticker(transaction_data['ticker']),
                 transaction_type=transaction_data['transaction_type'],
                 shares=float(transaction_data['shares']),
                 price=float(transaction_data['price']),
@@ -77,6 +89,7 @@ class PortfolioService:
                     return None
 
             db.session.commit()
+            PortfolioService.invalidate_risk_analytics(user_id)
 
             # Update portfolio prices
             if portfolio_item and portfolio_item.shares > 0:
@@ -95,8 +108,9 @@ class PortfolioService:
         try:
             logger.info(f"[Portfolio] Getting portfolio for user {user_id}")
             
-            # Use optimized query with single DB call
-            portfolio_items = Portfolio.query.filter_by(user_id=user_id).all()
+            # Use optimized query with single DB call; raiseload turns any
+            # relationship access from the serializers into an error
+            portfolio_items = Portfolio.query.options(raiseload('*')).filter_by(user_id=user_id).all()
             logger.info(f"[Portfolio] Found {len(portfolio_items)} items")
 
             if not portfolio_items:
@@ -114,12 +128,16 @@ class PortfolioService:
 
             # Update all portfolio items with current prices
             logger.info("[Portfolio] Updating portfolio items with current prices")
+            stock_infos = StockService.get_stock_infos([item.ticker for item in portfolio_items])
             for item in portfolio_items:
                 try:
-                    PortfolioService.update_portfolio_item(item)
+                    stock_info = stock_infos.get(item.ticker)
+                    if stock_info and stock_info.get('current_price'):
+                        item.calculate_metrics(stock_info['current_price'])
                 except Exception as item_error:
                     logger.error(f"[Portfolio] Error updating {item.ticker}: {str(item_error)}")
                     # Continue with other items even if one fails
+            db.session.commit()
 
             # Calculate portfolio summary
             total_value = sum(item.current_value or 0 for item in portfolio_items)
@@ -289,6 +307,55 @@ class PortfolioService:
             logger.error(f"Error calculating portfolio performance: {str(e)}")
             return {'performance_data': [], 'metrics': {}}
 
+    @staticmethod
+    def get_risk_analytics_cached(user_id: int, timeout: float = 30) -> Dict[str, Any]:
+        """
+        get_risk_analytics with a short per-user result cache.
+        Concurrent calls for the same user wait for the one calculation in
+        progress instead of starting their own. Error results are not cached.
+        """
+        with _risk_lock:
+            if user_id in _risk_results:
+                return _risk_results[user_id]
+            future = _risk_inflight.get(user_id)
+            leader = future is None
+            if leader:
+                future = _risk_inflight[user_id] = Future()
+
+        if not leader:
+            return future.result(timeout=timeout)
+
+        try:
+            metrics = PortfolioService.get_risk_analytics(user_id)
+        except BaseException as e:
+            with _risk_lock:
+                if _risk_inflight.get(user_id) is future:
+                    del _risk_inflight[user_id]
+            future.set_exception(e)
+            raise
+
+        with _risk_lock:
+            # Skip the store if a transaction invalidated us mid-calculation
+            if _risk_inflight.get(user_id) is future:
+                del _risk_inflight[user_id]
+                if 'error' not in metrics:
+                    _risk_results[user_id] = metrics
+        future.set_result(metrics)
+        return metrics
+
+    @staticmethod
+    def invalidate_risk_analytics(user_id: int) -> None:
+        """Drop the cached risk metrics for a user after their transactions change"""
+        with _risk_lock:
+            _risk_results.pop(user_id, None)
+            _risk_inflight.pop(user_id, None)
+
+    @staticmethod
+    def clear_risk_analytics_cache() -> None:
+        """Drop all cached risk metrics"""
+        with _risk_lock:
+            _risk_results.clear()
+
     @staticmethod
     def get_risk_analytics(user_id: int) -> Dict[str, Any]:
         """
@@ -11,6 +11,51 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Try to import numba for the drawdown kernel, fallback to NumPy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _drawdown_loop(values):
+    """
+    Single pass over portfolio values returning (max_drawdown,
+    max_drawdown_duration, current_drawdown). Compiled with numba when it is
+    installed; without it the NumPy version in calculate_max_drawdown is used.
+    Edge cases match that version: a NaN value makes the peak, and so every
+    later drawdown and the max drawdown, NaN, and a zero peak gives NaN (or
+    -inf below it) rather than raising ZeroDivisionError.
+    """
+    peak = values[0]
+    max_drawdown = 0.0
+    max_duration = 0
+    duration = 0
+    drawdown = 0.0
+    for i in range(values.shape[0]):
+        value = values[i]
+        # Like np.maximum.accumulate, a NaN becomes the peak for good
+        if value > peak or value != value:
+            peak = value
+        if peak == 0.0:
+            drawdown = np.nan if value == 0.0 else -np.inf
+        else:
+            drawdown = (value - peak) / peak
+        # Like np.min, a NaN drawdown is the maximum from then on
+        if drawdown < max_drawdown or drawdown != drawdown:
+            max_drawdown = drawdown
+        if drawdown < 0:
+            duration += 1
+            if duration > max_duration:
+                max_duration = duration
+        else:
+            duration = 0
+    return max_drawdown, max_duration, drawdown
+
+
+_drawdown_kernel = njit(cache=True)(_drawdown_loop) if NUMBA_AVAILABLE else None
+
 
 class RiskAnalytics:
     """
@@ -298,6 +343,16 @@ class RiskAnalytics:
             }
 
         try:
+            if _drawdown_kernel is not None:
+                max_drawdown, max_duration, current_drawdown = _drawdown_kernel(
+                    np.asarray(portfolio_values, dtype=np.float64)
+                )
+                return {
+                    'max_drawdown': float(max_drawdown),
+                    'max_drawdown_duration': int(max_duration),
+                    'current_drawdown': float(current_drawdown)
+                }
+
             # Calculate running maximum
             running_max = np.maximum.accumulate(portfolio_values)
 
@@ -307,17 +362,10 @@ class RiskAnalytics:
             # Maximum drawdown
             max_drawdown = np.min(drawdowns)
 
-            # Maximum drawdown duration (days in drawdown)
-            in_drawdown = drawdowns < 0
-            max_duration = 0
-            current_duration = 0
-
-            for is_down in in_drawdown:
-                if is_down:
-                    current_duration += 1
-                    max_duration = max(max_duration, current_duration)
-                else:
-                    current_duration = 0
+            # Maximum drawdown duration (longest run of days in drawdown)
+            edges = np.diff(np.concatenate(([0], (drawdowns < 0).view(np.int8), [0])))
+            run_lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+            max_duration = run_lengths.max() if run_lengths.size else 0
 
             # Current drawdown
             current_drawdown = drawdowns[-1]
@@ -395,41 +443,87 @@ class RiskAnalytics:
         """
         try:
             metrics = {}
+            returns = np.asarray(portfolio_returns, dtype=np.float64)
+            portfolio_values = np.asarray(portfolio_values, dtype=np.float64)
+            n = len(returns)
+            days = RiskAnalytics.TRADING_DAYS
+            rf = RiskAnalytics.RISK_FREE_RATE
+            sqrt_days = np.sqrt(days)
+
+            # Moments shared by every metric below, each computed once; the
+            # values match the individual calculate_* methods
+            mean = returns.mean() if n else np.nan
+            std = returns.std() if n else np.nan
+
+            # Sharpe: the std of excess returns equals the std of returns
+            if n < 2 or std == 0:
+                metrics['sharpe_ratio'] = 0.0
+            else:
+                metrics['sharpe_ratio'] = float((mean - rf / days) * days / (std * sqrt_days))
+
+            # Sortino
+            downside = returns[returns < 0.0]
+            if n < 2:
+                metrics['sortino_ratio'] = 0.0
+            elif not downside.size:
+                metrics['sortino_ratio'] = float('inf')  # No downside = infinite Sortino
+            else:
+                downside_std = downside.std() * sqrt_days
+                metrics['sortino_ratio'] = float((mean * days - rf) / downside_std) if downside_std else 0.0
 
-            # Basic metrics
-            metrics['sharpe_ratio'] = RiskAnalytics.calculate_sharpe_ratio(portfolio_returns)
-            metrics['sortino_ratio'] = RiskAnalytics.calculate_sortino_ratio(portfolio_returns)
-
-            # Risk metrics
-            metrics['var_95'] = RiskAnalytics.calculate_var(portfolio_returns, 0.95)
-            metrics['var_99'] = RiskAnalytics.calculate_var(portfolio_returns, 0.99)
-            metrics['cvar_95'] = RiskAnalytics.calculate_cvar(portfolio_returns, 0.95)
+            # VaR at both confidence levels from one percentile call, then CVaR
+            if n < 10:
+                metrics['var_95'] = metrics['var_99'] = metrics['cvar_95'] = 0.0
+            else:
+                var_95, var_99 = np.percentile(returns, [(1 - 0.95) * 100, (1 - 0.99) * 100])
+                tail_losses = returns[returns <= var_95]
+                metrics['var_95'] = float(var_95)
+                metrics['var_99'] = float(var_99)
+                metrics['cvar_95'] = float(tail_losses.mean() if tail_losses.size else var_95)
 
             # Drawdown metrics
             drawdown_metrics = RiskAnalytics.calculate_max_drawdown(portfolio_values)
             metrics.update(drawdown_metrics)
 
             # Volatility
-            metrics['volatility'] = float(portfolio_returns.std() * np.sqrt(RiskAnalytics.TRADING_DAYS))
+            metrics['volatility'] = float(std * sqrt_days)
 
             # Market-relative metrics (if market data available)
             if market_returns is not None and len(market_returns) > 0:
-                metrics['beta'] = RiskAnalytics.calculate_beta(portfolio_returns, market_returns)
-                metrics['alpha'] = RiskAnalytics.calculate_alpha(portfolio_returns, market_returns,
-                                                                 metrics['beta'])
-                metrics['information_ratio'] = RiskAnalytics.calculate_information_ratio(
-                    portfolio_returns, market_returns
-                )
+                market = np.asarray(market_returns, dtype=np.float64)
+                if n < 2 or len(market) < 2:
+                    beta, alpha, info_ratio = 1.0, 0.0, 0.0
+                else:
+                    # Beta and information ratio use the overlapping tail
+                    length = min(n, len(market))
+                    aligned, aligned_market = returns[-length:], market[-length:]
+
+                    market_variance = aligned_market.var()
+                    if market_variance == 0:
+                        beta = 1.0
+                    else:
+                        beta = float(np.cov(aligned, aligned_market)[0, 1] / market_variance)
+
+                    # Jensen's alpha over the full series, as calculate_alpha
+                    expected_return = rf + beta * (market.mean() * days - rf)
+                    alpha = float(mean * days - expected_return)
+
+                    active = aligned - aligned_market
+                    tracking_error = active.std() * sqrt_days
+                    info_ratio = float(active.mean() * days / tracking_error) if tracking_error else 0.0
+
+                metrics['beta'] = beta
+                metrics['alpha'] = alpha
+                metrics['information_ratio'] = info_ratio
             else:
                 metrics['beta'] = None
                 metrics['alpha'] = None
                 metrics['information_ratio'] = None
 
             # Returns
-            metrics['total_return'] = float(portfolio_values[-1] / portfolio_values[0] - 1)
-            metrics['annualized_return'] = float(
-                (portfolio_values[-1] / portfolio_values[0]) ** (252 / len(portfolio_values)) - 1
-            )
+            growth = portfolio_values[-1] / portfolio_values[0]
+            metrics['total_return'] = float(growth - 1)
+            metrics['annualized_return'] = float(growth ** (252 / len(portfolio_values)) - 1)
 
             # Risk-adjusted performance
             metrics['calmar_ratio'] = float(
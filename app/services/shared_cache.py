@@ -0,0 +1,75 @@
+"""
+Memoization of service results in the shared Flask-Caching backend
+"""
+
+import inspect
+import logging
+from functools import wraps
+from flask import has_app_context
+from app import cache
+
+logger = logging.getLogger(__name__)
+
+def shared_cache_key(prefix, *values):
+    """Return the cache key for a call with the given argument values"""
+    return ':'.join(['svc', prefix, *(str(value) for value in values)])
+
+def _call_key(prefix, bound):
+    bound.apply_defaults()
+    return shared_cache_key(prefix, *(value for name, value in bound.arguments.items()
+                                      if name != 'cls'))
+
+def shared_cached(prefix, timeout):
+    """
+    Decorator that keeps a function's results in the app cache (Redis when
+    REDIS_URL is set, so all workers share them) for timeout seconds.
+    None results are not stored, cache errors fall back to calling the
+    function, and calls outside an application context are not cached.
+    Keys use every argument value with defaults applied, so positional and
+    keyword calls share an entry; a classmethod's cls is left out.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not has_app_context():
+                return fn(*args, **kwargs)
+
+            key = _call_key(prefix, signature.bind(*args, **kwargs))
+            try:
+                value = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Shared cache read failed for {key}: {e}")
+                value = None
+            if value is not None:
+                return value
+
+            value = fn(*args, **kwargs)
+            if value is not None:
+                try:
+                    cache.set(key, value, timeout=timeout)
+                except Exception as e:
+                    logger.warning(f"Shared cache write failed for {key}: {e}")
+            return value
+
+        def cached_many(calls):
+            """
+            Look up many calls (argument tuples) with one cache round trip.
+            Returns the cached values in order, None for misses; nothing is
+            computed.
+            """
+            if not calls or not has_app_context():
+                return [None] * len(calls)
+            keys = [_call_key(prefix, signature.bind(*args)) for args in calls]
+            try:
+                return cache.get_many(*keys)
+            except Exception as e:
+                logger.warning(f"Shared cache read failed for {prefix}: {e}")
+                return [None] * len(calls)
+
+        wrapper.uncached = fn
+        wrapper.cached_many = cached_many
+        return wrapper
+
+    return decorator
@@ -7,15 +7,21 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, Optional
 import re
+from app.services.shared_cache import shared_cached
+from app.services.http_client import http_session
 
 logger = logging.getLogger(__name__)
 
+# Seconds fetched short interest data stays in the shared cache
+SHORT_DATA_CACHE_TTL = 1800
+
 class ShortDataService:
     """Service for fetching short interest data from ChartExchange"""
 
     BASE_URL = "https://chartexchange.com/symbol"
 
     @classmethod
+    @shared_cached('short', SHORT_DATA_CACHE_TTL)
     def get_short_data(cls, ticker: str) -> Optional[Dict]:
         """
         Fetch short interest data from ChartExchange
@@ -40,7 +46,7 @@ class ShortDataService:
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 }
 
-                response = requests.get(url, headers=headers, timeout=10)
+                response = http_session.get(url, headers=headers, timeout=10)
 
                 if response.status_code == 200:
                     # Parse the HTML response
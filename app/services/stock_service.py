@@ -2,73 +2,195 @@ import pandas as pd
 import numpy as np
 import requests
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from flask import current_app
 from app.models import StockCache
 from app import cache
 import logging
 from app.services.alternative_data_sources import FallbackDataService, AlphaVantageService
+from app.services.shared_cache import shared_cached
+from app.services.http_client import http_session
 
 logger = logging.getLogger(__name__)
 
+# Seconds derived results stay in the shared cache (stock info itself is
+# cached in StockCache)
+ANALYSIS_CACHE_TTL = 60
+HISTORY_CACHE_TTL = 300
+
+# Worker threads for fetching stock info of tickers that are not cached
+INFO_FETCH_WORKERS = 10
+_info_pool = ThreadPoolExecutor(max_workers=INFO_FETCH_WORKERS,
+                                thread_name_prefix='stock-info')
+
+# Provider fetches in progress by ticker, shared by concurrent cache misses
+INFO_FETCH_TIMEOUT = 30
+_info_inflight: Dict[str, Future] = {}
+_info_lock = threading.Lock()
+
 class StockService:
     """Service for fetching and analyzing stock data"""
 
     @staticmethod
     def get_stock_info(ticker: str) -> Optional[Dict[str, Any]]:
-        """Get comprehensive stock information using Finnhub and Alpha Vantage"""
+        """
+        Get comprehensive stock information using Finnhub and Alpha Vantage.
+        Concurrent cache misses for one ticker share a single provider fetch.
+        """
         try:
             # Check cache first
             cached = StockCache.get_cached(ticker, 'info')
             if cached:
                 return cached
 
-            # Get quote data from fallback sources (Finnhub primary)
-            quote_data = FallbackDataService.get_stock_quote(ticker)
-            if not quote_data:
-                logger.warning(f"Failed to get quote data for {ticker}, using mock data")
-                # Use mock data as last resort
-                from app.services.mock_data_service import MockDataService
-                return MockDataService.get_mock_stock_info(ticker)
-
-            # Try to get additional company information
-            company_data = FallbackDataService.get_company_info(ticker)
+            with _info_lock:
+                future = _info_inflight.get(ticker)
+                leader = future is None
+                if leader:
+                    future = _info_inflight[ticker] = Future()
+
+            if not leader:
+                # Callers may add keys to the result; each gets its own dict
+                info = future.result(timeout=INFO_FETCH_TIMEOUT)
+                return dict(info) if info else info
+
+            try:
+                info = StockService._load_stock_info(ticker)
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with _info_lock:
+                    _info_inflight.pop(ticker, None)
+            future.set_result(info)
+            return info
 
-            # Merge the data
-            processed_info = FallbackDataService.merge_data(quote_data, company_data)
-
-            # Add default values for missing fields
-            processed_info.setdefault('market', 'DAX' if '.DE' in ticker.upper() else 'USA')
-            processed_info.setdefault('sector', 'Unknown')
-            processed_info.setdefault('industry', 'Unknown')
-            processed_info.setdefault('ticker', ticker.upper())
+        except Exception as e:
+            logger.error(f"Error fetching stock info for {ticker}: {str(e)}")
+            return None
 
-            # Get enhanced data: Analyst ratings, price targets, insider transactions
-            analyst_ratings = StockService.get_analyst_ratings(ticker)
-            if analyst_ratings:
-                processed_info['analyst_ratings'] = analyst_ratings
-                logger.info(f"Added analyst ratings for {ticker}")
+    @staticmethod
+    def _load_stock_info(ticker: str) -> Optional[Dict[str, Any]]:
+        """Fetch stock info from the data providers and cache it"""
+        # Get quote data from fallback sources (Finnhub primary)
+        quote_data = FallbackDataService.get_stock_quote(ticker)
+        if not quote_data:
+            logger.warning(f"Failed to get quote data for {ticker}, using mock data")
+            # Use mock data as last resort
+            from app.services.mock_data_service import MockDataService
+            return MockDataService.get_mock_stock_info(ticker)
+
+        # Try to get additional company information
+        company_data = FallbackDataService.get_company_info(ticker)
+
+        # Merge the data
+        processed_info = FallbackDataService.merge_data(quote_data, company_data)
+
+        # Add default values for missing fields
+        processed_info.setdefault('market', 'DAX' if '.DE' in ticker.upper() else 'USA')
+        processed_info.setdefault('sector', 'Unknown')
+        processed_info.setdefault('industry', 'Unknown')
+        processed_info.setdefault('ticker', ticker.upper())
+
+        # Get enhanced data: Analyst ratings, price targets, insider transactions
+        analyst_ratings = StockService.get_analyst_ratings(ticker)
+        if analyst_ratings:
+            processed_info['analyst_ratings'] = analyst_ratings
+            logger.info(f"Added analyst ratings for {ticker}")
+
+        price_target = StockService.get_price_target(ticker)
+        if price_target:
+            processed_info['price_target'] = price_target
+            logger.info(f"Added price target for {ticker}")
+
+        insider_data = StockService.get_insider_transactions(ticker)
+        if insider_data:
+            processed_info['insider_transactions'] = insider_data
+            logger.info(f"Added insider transactions for {ticker}")
+
+        # Cache the result
+        StockCache.set_cache(ticker, processed_info, 'info')
+
+        return processed_info
 
-            price_target = StockService.get_price_target(ticker)
-            if price_target:
-                processed_info['price_target'] = price_target
-                logger.info(f"Added price target for {ticker}")
+    @staticmethod
+    def get_stock_infos(tickers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get stock info for many tickers. Cached entries are loaded in one
+        query; the rest are fetched from the data providers concurrently,
+        so the wait is the slowest fetch rather than the sum of all of them.
+        """
+        stock_infos = StockCache.get_cached_bulk(tickers, 'info')
+        missing = [ticker for ticker, info in stock_infos.items() if not info]
+        if len(missing) == 1:
+            stock_infos[missing[0]] = StockService.get_stock_info(missing[0])
+        elif missing:
+            app = current_app._get_current_object()
+            fetched = _info_pool.map(partial(StockService._fetch_stock_info, app), missing)
+            stock_infos.update(zip(missing, fetched))
+        return stock_infos
 
-            insider_data = StockService.get_insider_transactions(ticker)
-            if insider_data:
-                processed_info['insider_transactions'] = insider_data
-                logger.info(f"Added insider transactions for {ticker}")
+    @staticmethod
+    def get_bulk_analysis(tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get stock info, fundamental analysis and technical indicators for
+        many tickers. Stock info comes from get_stock_infos (one IN query
+        for the cached entries), cached analyses with one shared cache round
+        trip per kind, and the analyses still missing are computed side by
+        side on the info pool.
+        Returns {ticker: {'info', 'fundamental', 'technical'}}, with None
+        for values that could not be fetched.
+        """
+        infos = StockService.get_stock_infos(tickers)
+        calls = [(ticker,) for ticker in tickers]
+        analysis = {
+            ticker: {'info': infos.get(ticker), 'fundamental': fundamental, 'technical': technical}
+            for ticker, fundamental, technical in zip(
+                tickers,
+                StockService.get_fundamental_analysis.cached_many(calls),
+                StockService.calculate_technical_indicators.cached_many(calls))
+        }
 
-            # Cache the result
-            StockCache.set_cache(ticker, processed_info, 'info')
+        # Stock info is in StockCache by now, so these only score and load history
+        app = current_app._get_current_object()
+        methods = {'fundamental': StockService.get_fundamental_analysis,
+                   'technical': StockService.calculate_technical_indicators}
+        pending = [
+            (ticker, kind, _info_pool.submit(StockService._analyze_in_worker, app, method, ticker))
+            for ticker in tickers
+            for kind, method in methods.items()
+            if analysis[ticker][kind] is None
+        ]
+        for ticker, kind, future in pending:
+            analysis[ticker][kind] = future.result()
+        return analysis
 
-            return processed_info
+    @staticmethod
+    def _analyze_in_worker(app, method, ticker: str) -> Optional[Dict[str, Any]]:
+        """Run an analysis method in a worker thread with its own app context"""
+        with app.app_context():
+            try:
+                return method(ticker)
+            except Exception as e:
+                logger.error(f"Error analyzing {ticker}: {str(e)}")
+                return None
 
-        except Exception as e:
-            logger.error(f"Error fetching stock info for {ticker}: {str(e)}")
-            return None
+    @staticmethod
+    def _fetch_stock_info(app, ticker: str) -> Optional[Dict[str, Any]]:
+        """Fetch stock info in a worker thread with its own app context and session"""
+        with app.app_context():
+            try:
+                return StockService.get_stock_info(ticker)
+            except Exception as e:
+                logger.error(f"Error fetching stock info for {ticker}: {str(e)}")
+                return None
 
     @staticmethod
+    @shared_cached('history', HISTORY_CACHE_TTL)
     def get_price_history(ticker: str, period: str = "1y") -> Optional[Dict[str, Any]]:
         """Get historical price data using the new HistoricalDataService"""
         try:
@@ -113,6 +235,7 @@ class StockService:
             return None
 
     @staticmethod
+    @shared_cached('technical', ANALYSIS_CACHE_TTL)
     def calculate_technical_indicators(ticker: str) -> Optional[Dict[str, Any]]:
         """Calculate technical indicators for a stock using historical data"""
         try:
@@ -224,6 +347,7 @@ class StockService:
         return 'normal'
 
     @staticmethod
+    @shared_cached('fundamental', ANALYSIS_CACHE_TTL)
     def get_fundamental_analysis(ticker: str) -> Optional[Dict[str, Any]]:
         """Perform fundamental analysis"""
         try:
@@ -391,7 +515,7 @@ class StockService:
         try:
             url = "https://finnhub.io/api/v1/stock/recommendation"
             params = {'symbol': ticker.upper(), 'token': api_key}
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             
             # Handle rate limit or forbidden
             if response.status_code == 403:
@@ -447,7 +571,7 @@ class StockService:
         try:
             url = "https://finnhub.io/api/v1/stock/price-target"
             params = {'symbol': ticker.upper(), 'token': api_key}
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             
             # Handle rate limit or forbidden
             if response.status_code == 403:
@@ -499,7 +623,7 @@ class StockService:
                 'from': from_date,
                 'token': api_key
             }
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
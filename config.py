@@ -4,6 +4,26 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _engine_options(database_url, pool_recycle=1800):
+    """SQLAlchemy engine options (connection pool) for the configured database"""
+    if not database_url or database_url.startswith('sqlite'):
+        # Flask-SQLAlchemy already applies StaticPool and check_same_thread
+        # for in-memory SQLite; file databases keep the driver defaults
+        return {}
+
+    if os.environ.get('DB_USE_PGBOUNCER', 'False').lower() == 'true':
+        # PgBouncer in transaction mode does the pooling; avoid double pooling
+        from sqlalchemy.pool import NullPool
+        return {'poolclass': NullPool}
+
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', pool_recycle)),
+        'pool_pre_ping': True,
+    }
+
 class Config:
     # Flask
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
@@ -22,17 +42,39 @@ class Config:
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(DATABASE_URL)
 
     # JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
+    # HMAC-SHA256: PyJWT signs with the stdlib hmac module (OpenSSL), so no
+    # extra crypto backend is needed; RS*/ES* would require PyJWT[crypto]
+    JWT_ALGORITHM = 'HS256'
+
+    # Argon2id cost for password hashes; calibrate to ~100ms per hash on the
+    # target hardware. Hashes made with other settings are upgraded on login.
+    ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', 2))
+    ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', 65536))  # KiB
+    ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', 1))
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
 
-    # Redis/Cache
-    CACHE_TYPE = "redis" if os.environ.get('REDIS_URL') else "simple"
+    # Redis/Cache (shared across Gunicorn workers when REDIS_URL is set)
+    CACHE_TYPE = "RedisCache" if os.environ.get('REDIS_URL') else "SimpleCache"
     CACHE_REDIS_URL = os.environ.get('REDIS_URL')
+    CACHE_KEY_PREFIX = 'stockanalyzer:'
     CACHE_DEFAULT_TIMEOUT = int(os.environ.get('STOCKS_CACHE_TIMEOUT', 3600))
 
+    # Access-Control-Max-Age (read by Flask-CORS): browsers reuse a preflight
+    # for this many seconds instead of sending OPTIONS before every API call
+    CORS_MAX_AGE = int(os.environ.get('CORS_MAX_AGE', 600))
+
+    # Response compression (read by Flask-Compress): responses of at least
+    # COMPRESS_MIN_SIZE bytes are sent Brotli- or gzip-encoded; streamed
+    # responses (Server-Sent Events) are left alone so events are not held back
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_STREAMS = False
+
     # Email
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
@@ -48,6 +90,17 @@ class Config:
     # App Settings
     PORTFOLIO_UPDATE_INTERVAL = int(os.environ.get('PORTFOLIO_UPDATE_INTERVAL', 300))
     ALERT_CHECK_INTERVAL = int(os.environ.get('ALERT_CHECK_INTERVAL', 60))
+    # Warm the AI analysis inputs in the background when a stock page is loaded
+    STOCK_PREFETCH = os.environ.get('STOCK_PREFETCH', 'True').lower() == 'true'
+
+    # Logging: LOG_TO_FILE=true/false forces logs/stockanalyzer.log on or off;
+    # unset means file logging except under Gunicorn
+    LOG_TO_FILE = (os.environ['LOG_TO_FILE'].lower() in ('1', 'true')
+                   if os.environ.get('LOG_TO_FILE') else None)
+
+    # Background scheduler (historical data collection)
+    SCHEDULER_MAX_WORKERS = int(os.environ.get('SCHEDULER_MAX_WORKERS', 5))
+    SCHEDULER_MISFIRE_GRACE_TIME = int(os.environ.get('SCHEDULER_MISFIRE_GRACE_TIME', 60))
 
     # Supported Markets
     SUPPORTED_MARKETS = ['USA', 'DAX']
@@ -69,15 +122,16 @@ class ProductionConfig(Config):
     # CORS for production
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
     # Ensure proper database connection
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-    }
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(Config.DATABASE_URL, pool_recycle=300)
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
     WTF_CSRF_ENABLED = False
+    ARGON2_TIME_COST = 1
+    ARGON2_MEMORY_COST = 8192
+    STOCK_PREFETCH = False
 
 config = {
     'development': DevelopmentConfig,
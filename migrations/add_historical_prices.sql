@@ -26,9 +26,8 @@ CREATE TABLE IF NOT EXISTS historical_prices (
 );
 
 -- Create indexes for performance
-CREATE INDEX IF NOT EXISTS idx_ticker ON historical_prices(ticker);
+-- (ticker and ticker + date lookups use the uq_ticker_date index)
 CREATE INDEX IF NOT EXISTS idx_date ON historical_prices(date);
-CREATE INDEX IF NOT EXISTS idx_ticker_date ON historical_prices(ticker, date);
 
 -- Create the data_collection_metadata table
 CREATE TABLE IF NOT EXISTS data_collection_metadata (
@@ -85,9 +84,7 @@ CREATE TABLE IF NOT EXISTS historical_prices (
     UNIQUE (ticker, date)
 );
 
-CREATE INDEX IF NOT EXISTS idx_ticker ON historical_prices(ticker);
 CREATE INDEX IF NOT EXISTS idx_date ON historical_prices(date);
-CREATE INDEX IF NOT EXISTS idx_ticker_date ON historical_prices(ticker, date);
 
 CREATE TABLE IF NOT EXISTS data_collection_metadata (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -0,0 +1,38 @@
+"""Make stock_cache unique per (ticker, data_type)
+
+Revision ID: 3b7e1c9d4a20
+Revises: 0d559f6f9562
+Create Date: 2025-10-06 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e1c9d4a20'
+down_revision = '0d559f6f9562'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # StockCache.set_cache_bulk upserts with ON CONFLICT (ticker, data_type),
+    # which needs a matching unique constraint instead of a unique ticker index
+    op.execute("UPDATE stock_cache SET data_type = 'quote' WHERE data_type IS NULL")
+
+    with op.batch_alter_table('stock_cache', schema=None) as batch_op:
+        batch_op.drop_index('ix_stock_cache_ticker')
+        batch_op.alter_column('data_type', existing_type=sa.String(length=50), nullable=False)
+        batch_op.create_unique_constraint('uq_ticker_datatype', ['ticker', 'data_type'])
+        batch_op.create_index('idx_ticker_datatype', ['ticker', 'data_type'], unique=False)
+        batch_op.create_index('idx_ticker_expires', ['ticker', 'expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('stock_cache', schema=None) as batch_op:
+        batch_op.drop_index('idx_ticker_expires')
+        batch_op.drop_index('idx_ticker_datatype')
+        batch_op.drop_constraint('uq_ticker_datatype', type_='unique')
+        batch_op.alter_column('data_type', existing_type=sa.String(length=50), nullable=True)
+        batch_op.create_index('ix_stock_cache_ticker', ['ticker'], unique=True)
@@ -0,0 +1,38 @@
+"""Store stock_cache.data as JSONB on PostgreSQL
+
+Revision ID: 5e9c3f1a7b64
+Revises: c41a7e9b2d08
+Create Date: 2025-10-06 17:20:08.551937
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9c3f1a7b64'
+down_revision = 'c41a7e9b2d08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # JSONB is PostgreSQL-only; other databases keep the generic JSON column
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.alter_column('stock_cache', 'data',
+                    existing_type=sa.JSON(),
+                    type_=postgresql.JSONB(astext_type=sa.Text()),
+                    existing_nullable=False,
+                    postgresql_using='data::jsonb')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.alter_column('stock_cache', 'data',
+                    existing_type=postgresql.JSONB(astext_type=sa.Text()),
+                    type_=sa.JSON(),
+                    existing_nullable=False,
+                    postgresql_using='data::json')
@@ -0,0 +1,30 @@
+"""Add composite indexes for active alert lookups
+
+Revision ID: 8f2d6a4c1e57
+Revises: 3b7e1c9d4a20
+Create Date: 2025-10-06 11:03:17.902145
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2d6a4c1e57'
+down_revision = '3b7e1c9d4a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('alerts', schema=None) as batch_op:
+        batch_op.create_index('idx_alerts_user_active',
+                              ['user_id', 'is_active', 'is_triggered', 'ticker'], unique=False)
+        batch_op.create_index('idx_alerts_ticker_active', ['ticker', 'is_active'], unique=False,
+                              postgresql_where=sa.text('is_active AND NOT is_triggered'))
+
+
+def downgrade():
+    with op.batch_alter_table('alerts', schema=None) as batch_op:
+        batch_op.drop_index('idx_alerts_ticker_active')
+        batch_op.drop_index('idx_alerts_user_active')
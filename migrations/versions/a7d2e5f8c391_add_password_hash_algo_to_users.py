@@ -0,0 +1,30 @@
+"""Add password_hash_algo to users
+
+Revision ID: a7d2e5f8c391
+Revises: 5e9c3f1a7b64
+Create Date: 2025-10-07 10:12:45.208816
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d2e5f8c391'
+down_revision = '5e9c3f1a7b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing hashes were written by werkzeug; they move to argon2 on next login
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('password_hash_algo', sa.String(length=16),
+                                      nullable=False, server_default='werkzeug'))
+
+
+def downgrade():
+    # argon2 hashes cannot be verified once the column is gone; users with one
+    # will need a password reset
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('password_hash_algo')
@@ -0,0 +1,42 @@
+"""Add denormalized content counters to users
+
+Revision ID: b5f0c2e8d613
+Revises: e3b8d1f6a925
+Create Date: 2025-10-09 16:05:12.774310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5f0c2e8d613'
+down_revision = 'e3b8d1f6a925'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('portfolio_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('watchlist_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('alerts_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_invested', sa.Float(), nullable=False, server_default='0'))
+
+    # Backfill from the existing rows; the ORM listeners keep them current from here
+    op.execute("""
+        UPDATE users SET
+            portfolio_count = (SELECT COUNT(*) FROM portfolios WHERE portfolios.user_id = users.id),
+            watchlist_count = (SELECT COUNT(*) FROM watchlists WHERE watchlists.user_id = users.id),
+            alerts_count = (SELECT COUNT(*) FROM alerts WHERE alerts.user_id = users.id),
+            total_invested = (SELECT COALESCE(SUM(total_invested), 0) FROM portfolios
+                              WHERE portfolios.user_id = users.id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('total_invested')
+        batch_op.drop_column('alerts_count')
+        batch_op.drop_column('watchlist_count')
+        batch_op.drop_column('portfolio_count')
@@ -0,0 +1,35 @@
+"""Drop redundant historical_prices indexes
+
+Revision ID: c41a7e9b2d08
+Revises: 8f2d6a4c1e57
+Create Date: 2025-10-06 15:42:51.318604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41a7e9b2d08'
+down_revision = '8f2d6a4c1e57'
+branch_labels = None
+depends_on = None
+
+
+# historical_prices is created by migrations/add_historical_prices.sql or
+# create_historical_tables.py, so it may not exist in every database
+def _has_historical_prices():
+    return sa.inspect(op.get_bind()).has_table('historical_prices')
+
+
+def upgrade():
+    # Both are covered by the uq_ticker_date unique index on (ticker, date)
+    if _has_historical_prices():
+        op.execute('DROP INDEX IF EXISTS idx_ticker_date')
+        op.execute('DROP INDEX IF EXISTS idx_ticker')
+
+
+def downgrade():
+    if _has_historical_prices():
+        op.execute('CREATE INDEX IF NOT EXISTS idx_ticker ON historical_prices (ticker)')
+        op.execute('CREATE INDEX IF NOT EXISTS idx_ticker_date ON historical_prices (ticker, date)')
@@ -0,0 +1,34 @@
+"""Add indexes for transaction history and user activity lookups
+
+Revision ID: e3b8d1f6a925
+Revises: a7d2e5f8c391
+Create Date: 2025-10-09 14:21:45.318072
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b8d1f6a925'
+down_revision = 'a7d2e5f8c391'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('idx_transactions_user_date', ['user_id', 'transaction_date'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('idx_users_last_login', ['last_login'], unique=False)
+        batch_op.create_index('idx_users_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('idx_users_created_at')
+        batch_op.drop_index('idx_users_last_login')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('idx_transactions_user_date')
@@ -8,6 +8,15 @@ def app():
     """Create application for testing"""
     app = create_app('testing')
 
+    # Auth caches are module-level; user ids repeat across test databases
+    from app.middleware.admin_required import invalidate_admin_cache
+    invalidate_admin_cache()
+    User.invalidate_cache()
+    from app.services import PortfolioService
+    PortfolioService.clear_risk_analytics_cache()
+    from app.routes.screener import clear_screen_cache
+    clear_screen_cache()
+
     with app.app_context():
         db.create_all()
         yield app
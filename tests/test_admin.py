@@ -0,0 +1,239 @@
+import pytest
+from app import db
+from app.models import User
+
+def _register(client, email, username):
+    """Register a user and return auth headers"""
+    response = client.post('/api/auth/register', json={
+        'email': email,
+        'username': username,
+        'password': 'password123'
+    })
+    data = response.get_json()
+    return data['user']['id'], {'Authorization': f'Bearer {data["access_token"]}'}
+
+def _make_admin(user_id):
+    user = db.session.get(User, user_id)
+    user.is_admin = True
+    db.session.commit()
+
+def test_admin_stats_requires_admin(client):
+    """Test that non-admin users are rejected"""
+    _, headers = _register(client, 'plain@example.com', 'plainuser')
+
+    response = client.get('/api/admin/stats', headers=headers)
+    assert response.status_code == 403
+
+def test_admin_stats_missing_token(client):
+    """Test that requests without a token are rejected"""
+    response = client.get('/api/admin/stats')
+    assert response.status_code == 401
+
+def test_admin_repeated_requests(client):
+    """Test that cached verification still exposes the JWT identity"""
+    admin_id, admin_headers = _register(client, 'admin@example.com', 'adminuser')
+    _make_admin(admin_id)
+
+    for _ in range(3):
+        response = client.get('/api/admin/stats', headers=admin_headers)
+        assert response.status_code == 200
+
+    # Self-deletion check relies on get_jwt_identity() after a cache hit
+    response = client.delete(f'/api/admin/users/{admin_id}', headers=admin_headers)
+    assert response.status_code == 400
+    assert 'Cannot delete your own account' in response.get_json()['error']
+
+def test_admin_demotion_invalidates_cache(client):
+    """Test that toggling admin status takes effect immediately"""
+    admin_id, admin_headers = _register(client, 'admin1@example.com', 'admin1')
+    other_id, other_headers = _register(client, 'admin2@example.com', 'admin2')
+    _make_admin(admin_id)
+    _make_admin(other_id)
+
+    # Warm the cache for the second admin
+    assert client.get('/api/admin/stats', headers=other_headers).status_code == 200
+
+    response = client.post(f'/api/admin/users/{other_id}/toggle-admin', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()['user']['is_admin'] is False
+
+    response = client.get('/api/admin/stats', headers=other_headers)
+    assert response.status_code == 403
+
+def test_admin_delete_user_cascades(client):
+    """Test that deleting a user removes their portfolio, watchlist and alerts"""
+    from app.models import Portfolio, Watchlist, Alert
+
+    admin_id, admin_headers = _register(client, 'admin@example.com', 'adminuser')
+    user_id, _ = _register(client, 'member@example.com', 'member')
+    _make_admin(admin_id)
+
+    db.session.add_all([
+        Portfolio(user_id=user_id, ticker='AAPL', shares=1, avg_price=100, total_invested=100),
+        Watchlist(user_id=user_id, ticker='MSFT'),
+        Alert(user_id=user_id, ticker='TSLA', alert_type='PRICE_ABOVE', target_value=300)
+    ])
+    db.session.commit()
+
+    response = client.delete(f'/api/admin/users/{user_id}', headers=admin_headers)
+    assert response.status_code == 200
+    assert Portfolio.query.filter_by(user_id=user_id).count() == 0
+    assert Watchlist.query.filter_by(user_id=user_id).count() == 0
+    assert Alert.query.filter_by(user_id=user_id).count() == 0
+
+def test_admin_users_cursor_pagination(client):
+    """Test that cursor pages continue where the first page stopped"""
+    admin_id, admin_headers = _register(client, 'admin@example.com', 'adminuser')
+    _make_admin(admin_id)
+    for i in range(4):
+        _register(client, f'user{i}@example.com', f'user{i}')
+
+    response = client.get('/api/admin/users?per_page=2', headers=admin_headers)
+    first = response.get_json()
+    assert first['total'] == 5
+    assert first['next_cursor'] == first['users'][-1]['id']
+
+    seen = [u['id'] for u in first['users']]
+    cursor = first['next_cursor']
+    while cursor:
+        response = client.get(f'/api/admin/users?per_page=2&cursor={cursor}', headers=admin_headers)
+        assert response.status_code == 200
+        page = response.get_json()
+        assert 'total' not in page
+        seen += [u['id'] for u in page['users']]
+        cursor = page['next_cursor']
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(set(seen)) == 5
+
+def test_admin_check_uses_token_claim(client):
+    """Test that /check trusts a non-admin claim and re-reads the flag for admins"""
+    user_id, headers = _register(client, 'claims@example.com', 'claimsuser')
+
+    response = client.get('/api/admin/check', headers=headers)
+    assert response.status_code == 403
+
+    # Tokens issued after promotion carry the admin claim
+    _make_admin(user_id)
+    response = client.post('/api/auth/login', json={
+        'email': 'claims@example.com',
+        'password': 'password123'
+    })
+    admin_headers = {'Authorization': f'Bearer {response.get_json()["access_token"]}'}
+
+    response = client.get('/api/admin/check', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()['username'] == 'claimsuser'
+
+    # Demotion still applies to tokens that claim admin
+    user = db.session.get(User, user_id)
+    user.is_admin = False
+    db.session.commit()
+    response = client.get('/api/admin/check', headers=admin_headers)
+    assert response.status_code == 403
+
+def test_admin_users_is_admin_filter(client):
+    """Test boolean query parameters in the user list filter"""
+    admin_id, admin_headers = _register(client, 'admin@example.com', 'adminuser')
+    _make_admin(admin_id)
+    _register(client, 'plain@example.com', 'plainuser')
+
+    for value, expected in (('true', ['adminuser']), ('1', ['adminuser']),
+                            ('no', ['plainuser']), ('False', ['plainuser'])):
+        response = client.get(f'/api/admin/users?is_admin={value}', headers=admin_headers)
+        assert [u['username'] for u in response.get_json()['users']] == expected
+
+    response = client.get('/api/admin/users', headers=admin_headers)
+    assert response.get_json()['total'] == 2
+
+def test_admin_users_include_stats(client):
+    """Test that the user list carries each user's portfolio, watchlist and alert stats"""
+    from app.models import Portfolio, Watchlist, Alert
+
+    admin_id, admin_headers = _register(client, 'admin@example.com', 'adminuser')
+    user_id, _ = _register(client, 'member@example.com', 'member')
+    _make_admin(admin_id)
+
+    db.session.add_all([
+        Portfolio(user_id=user_id, ticker='AAPL', shares=1, avg_price=100, total_invested=100),
+        Portfolio(user_id=user_id, ticker='MSFT', shares=1, avg_price=250.5, total_invested=250.5),
+        Watchlist(user_id=user_id, ticker='TSLA'),
+        Alert(user_id=user_id, ticker='TSLA', alert_type='PRICE_ABOVE', target_value=300)
+    ])
+    db.session.commit()
+
+    users = client.get('/api/admin/users', headers=admin_headers).get_json()['users']
+    stats = {u['username']: (u['portfolio_count'], u['total_portfolio_value'],
+                             u['watchlist_count'], u['alerts_count']) for u in users}
+    assert stats == {'member': (2, 350.5, 1, 1), 'adminuser': (0, 0.0, 0, 0)}
+
+def test_admin_user_details_stats(client):
+    """Test that user details sum the portfolio and count related rows"""
+    from app.models import Portfolio, Transaction, Watchlist
+
+    admin_id, admin_headers = _register(client, 'admin@example.com', 'adminuser')
+    user_id, _ = _register(client, 'member@example.com', 'member')
+    _make_admin(admin_id)
+
+    db.session.add_all([
+        Portfolio(user_id=user_id, ticker='AAPL', shares=1, avg_price=100, total_invested=100),
+        Portfolio(user_id=user_id, ticker='MSFT', shares=2, avg_price=50, total_invested=100),
+        Transaction(user_id=user_id, ticker='AAPL', transaction_type='BUY',
+                    shares=1, price=100, total_amount=100),
+        Watchlist(user_id=user_id, ticker='TSLA')
+    ])
+    db.session.commit()
+
+    data = client.get(f'/api/admin/users/{user_id}', headers=admin_headers).get_json()
+    assert data['portfolio'] == {'positions': 2, 'total_value': 200.0,
+                                 'total_invested': 200.0, 'total_return': 0.0}
+    assert (data['transactions_count'], data['watchlist_count'], data['alerts_count']) == (1, 1, 0)
+
+    data = client.get(f'/api/admin/users/{admin_id}', headers=admin_headers).get_json()
+    assert data['portfolio']['positions'] == 0 and data['portfolio']['total_value'] == 0.0
+
+def test_user_counters_follow_content_changes(app, sample_user):
+    """Test that the user counter columns track inserts, cost updates and deletes"""
+    from app.models import Portfolio, Watchlist
+
+    with app.app_context():
+        user = db.session.get(User, sample_user.id)
+        position = Portfolio(user_id=user.id, ticker='AAPL', shares=2, avg_price=50, total_invested=100)
+        item = Watchlist(user_id=user.id, ticker='TSLA')
+        db.session.add_all([position, item])
+        db.session.commit()
+        assert (user.portfolio_count, user.watchlist_count, user.total_invested) == (1, 1, 100)
+
+        position.total_invested = 150
+        db.session.delete(item)
+        db.session.commit()
+        assert (user.portfolio_count, user.watchlist_count, user.total_invested) == (1, 0, 150)
+
+        db.session.delete(position)
+        db.session.commit()
+        assert (user.portfolio_count, user.total_invested) == (0, 0)
+
+def test_admin_stats_counts_cached(client):
+    """Test that system stats count users and content and are briefly cached"""
+    admin_id, admin_headers = _register(client, 'admin@example.com', 'adminuser')
+    _make_admin(admin_id)
+    _register(client, 'member@example.com', 'member')
+
+    stats = client.get('/api/admin/stats', headers=admin_headers).get_json()
+    assert (stats['total_users'], stats['admin_count'], stats['new_users_week']) == (2, 1, 2)
+    assert stats['total_portfolios'] == 0 and stats['total_alerts'] == 0
+
+    _register(client, 'late@example.com', 'lateuser')
+    assert client.get('/api/admin/stats', headers=admin_headers).get_json() == stats
+
+def test_admin_user_queries_without_lazy_loads(app, sample_user):
+    """Test that admin user listings and details serialize under raiseload('*')"""
+    from app.services.admin_service import AdminService
+
+    with app.app_context():
+        db.session.expunge_all()
+        users = AdminService.get_users()['users']
+        assert [u['id'] for u in users] == [sample_user.id]
+
+        db.session.expunge_all()
+        assert AdminService.get_user_details(sample_user.id)['id'] == sample_user.id
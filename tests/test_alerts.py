@@ -0,0 +1,135 @@
+import pytest
+from app import db
+from app.models import Alert, check_triggers_bulk
+
+def _alert(user_id, ticker, alert_type, target_value, **kwargs):
+    alert = Alert(user_id=user_id, ticker=ticker, alert_type=alert_type,
+                  target_value=target_value, **kwargs)
+    db.session.add(alert)
+    return alert
+
+def test_check_triggers_bulk(app, sample_user):
+    """Test vectorized alert evaluation against a price map"""
+    with app.app_context():
+        above_hit = _alert(sample_user.id, 'AAPL', 'PRICE_ABOVE', 150.00)
+        above_miss = _alert(sample_user.id, 'AAPL', 'PRICE_ABOVE', 200.00)
+        below_hit = _alert(sample_user.id, 'MSFT', 'PRICE_BELOW', 310.00)
+        percent = _alert(sample_user.id, 'MSFT', 'PERCENT_CHANGE', 5.00)
+        unpriced = _alert(sample_user.id, 'TSLA', 'PRICE_ABOVE', 1.00)
+        inactive = _alert(sample_user.id, 'AAPL', 'PRICE_ABOVE', 1.00, is_active=False)
+        db.session.commit()
+
+        alerts = Alert.query.all()
+        triggered = check_triggers_bulk(alerts, {'AAPL': 160.00, 'MSFT': 300.00})
+        db.session.commit()
+
+        assert {a.id for a in triggered} == {above_hit.id, below_hit.id}
+
+        db.session.expire_all()
+        assert db.session.get(Alert, above_hit.id).is_triggered is True
+        assert db.session.get(Alert, above_hit.id).triggered_at is not None
+        assert db.session.get(Alert, below_hit.id).is_triggered is True
+        assert db.session.get(Alert, above_miss.id).is_triggered is False
+        assert db.session.get(Alert, above_miss.id).current_value == 160.00
+        assert db.session.get(Alert, percent.id).current_value == 300.00
+        assert db.session.get(Alert, percent.id).is_triggered is False
+        assert db.session.get(Alert, unpriced.id).last_checked is None
+        assert db.session.get(Alert, inactive.id).is_triggered is False
+
+def test_check_triggers_bulk_empty(app):
+    """Test that nothing is written without alerts"""
+    with app.app_context():
+        assert check_triggers_bulk([], {'AAPL': 150.00}) == []
+
+def test_alert_to_dict_aliases():
+    """Test generated to_dict keeps the frontend aliases"""
+    alert = Alert(ticker='AAPL', alert_type='PRICE_ABOVE', target_value=150.456, current_value=None)
+    data = alert.to_dict()
+    assert data['condition_type'] == 'above'
+    assert data['target_value'] == data['target_price'] == 150.46
+    assert data['current_value'] is None and data['last_price'] is None
+    assert data['triggered_at'] is None
+
+def test_get_user_alerts_without_lazy_loads(app, sample_user):
+    """Test that alerts serialize under raiseload('*')"""
+    from app.services.alert_service import AlertService
+
+    with app.app_context():
+        _alert(sample_user.id, 'AAPL', 'PRICE_ABOVE', 150.00)
+        _alert(sample_user.id, 'MSFT', 'PRICE_BELOW', 300.00, is_active=False)
+        db.session.commit()
+        db.session.expunge_all()
+
+        alerts = AlertService.get_user_alerts(sample_user.id)
+        assert {a['ticker'] for a in alerts} == {'AAPL', 'MSFT'}
+        assert [a['ticker'] for a in AlertService.get_user_alerts(sample_user.id, active_only=True)] == ['AAPL']
+
+def test_check_alerts_fetches_each_ticker_once(app, sample_user, monkeypatch):
+    """Test that check_alerts prices every distinct ticker once"""
+    from collections import Counter
+    from app.services.alert_service import AlertService
+    from app.services.stock_service import StockService
+
+    calls = Counter()
+
+    def fake_stock_info(ticker):
+        calls[ticker] += 1
+        return {'current_price': {'AAPL': 160.00, 'MSFT': 300.00}[ticker]}
+
+    monkeypatch.setattr(StockService, 'get_stock_info', staticmethod(fake_stock_info))
+    monkeypatch.setattr(AlertService, '_send_alert_notification', staticmethod(lambda alert: None))
+
+    with app.app_context():
+        hit = _alert(sample_user.id, 'AAPL', 'PRICE_ABOVE', 150.00)
+        _alert(sample_user.id, 'AAPL', 'PRICE_ABOVE', 200.00)
+        _alert(sample_user.id, 'MSFT', 'PRICE_ABOVE', 400.00)
+        db.session.commit()
+
+        triggered = AlertService.check_alerts()
+
+        assert [a.id for a in triggered] == [hit.id]
+    assert calls == {'AAPL': 1, 'MSFT': 1}
+
+def test_check_alerts_in_batches(app, sample_user, monkeypatch):
+    """Test that check_alerts walks every batch and skips triggered alerts"""
+    from app.services.alert_service import AlertService
+    from app.services.stock_service import StockService
+
+    monkeypatch.setattr(StockService, 'get_stock_infos',
+                        staticmethod(lambda tickers: {t: {'current_price': 100.00} for t in tickers}))
+    monkeypatch.setattr(AlertService, '_send_alert_notification', staticmethod(lambda alert: None))
+
+    with app.app_context():
+        hits = [_alert(sample_user.id, f'T{i}', 'PRICE_ABOVE', 50.00) for i in range(5)]
+        _alert(sample_user.id, 'MISS', 'PRICE_ABOVE', 500.00)
+        db.session.commit()
+
+        triggered = AlertService.check_alerts(batch_size=2)
+        assert sorted(a.id for a in triggered) == sorted(a.id for a in hits)
+
+        # Already triggered alerts are not selected again
+        assert AlertService.check_alerts(batch_size=2) == []
+
+def test_check_alerts_notifies_after_batch_commit(app, sample_user, monkeypatch):
+    """Test that notifications go out after their batch commits and are then marked sent"""
+    from sqlalchemy import event
+    from app.services.alert_service import AlertService
+    from app.services.stock_service import StockService
+
+    steps = []
+    monkeypatch.setattr(StockService, 'get_stock_infos',
+                        staticmethod(lambda tickers: {t: {'current_price': 100.00} for t in tickers}))
+    monkeypatch.setattr(AlertService, '_send_alert_notification',
+                        staticmethod(lambda alert: steps.append(('notify', alert.ticker)) or True))
+
+    with app.app_context():
+        for ticker in ('T0', 'T1', 'T2'):
+            _alert(sample_user.id, ticker, 'PRICE_ABOVE', 50.00)
+        db.session.commit()
+        event.listen(db.session(), 'after_commit', lambda session: steps.append(('commit',)))
+
+        assert len(AlertService.check_alerts(batch_size=2)) == 3
+
+        assert steps == [('commit',), ('notify', 'T0'), ('notify', 'T1'), ('commit',),
+                         ('commit',), ('notify', 'T2'), ('commit',)]
+        assert all(alert.notification_sent for alert in Alert.query.all())
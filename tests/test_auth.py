@@ -1,4 +1,5 @@
 import pytest
+from app import db
 from app.models import User
 
 def test_user_registration(client):
@@ -34,6 +35,23 @@ def test_duplicate_email_registration(client):
     assert response.status_code == 400
     assert 'Email already registered' in response.get_json()['error']
 
+def test_duplicate_username_registration(client):
+    """Test registration with duplicate username"""
+    user_data = {
+        'email': 'first@example.com',
+        'username': 'sameuser',
+        'password': 'password123'
+    }
+
+    response = client.post('/api/auth/register', json=user_data)
+    assert response.status_code == 201
+
+    # Duplicate username
+    user_data['email'] = 'second@example.com'
+    response = client.post('/api/auth/register', json=user_data)
+    assert response.status_code == 400
+    assert 'Username already taken' in response.get_json()['error']
+
 def test_user_login(client):
     """Test user login"""
     # Register user first
@@ -85,6 +103,22 @@ def test_update_profile(client, auth_headers):
     assert data['user']['preferred_currency'] == 'EUR'
     assert data['user']['email_notifications'] == False
 
+def test_update_profile_username_taken(client, auth_headers, sample_user):
+    """Test that profile updates reject another user's username"""
+    response = client.put('/api/auth/profile', headers=auth_headers, json={
+        'username': 'sampleuser'
+    })
+    assert response.status_code == 400
+    assert 'Username already taken' in response.get_json()['error']
+
+    # Keeping your own email is not a conflict
+    response = client.put('/api/auth/profile', headers=auth_headers, json={
+        'email': 'test@example.com',
+        'username': 'renameduser'
+    })
+    assert response.status_code == 200
+    assert response.get_json()['user']['username'] == 'renameduser'
+
 def test_change_password(client, auth_headers):
     """Test changing password"""
     response = client.post('/api/auth/change-password', headers=auth_headers, json={
@@ -118,4 +152,62 @@ def test_token_refresh(client):
     })
 
     assert response.status_code == 200
-    assert 'access_token' in response.get_json()
\ No newline at end of file
+    assert 'access_token' in response.get_json()
+
+
+def test_cached_jwt_loads_current_user(app, auth_headers):
+    """Test that get_current_user() works on both a fresh and a cached token verification"""
+    from flask_jwt_extended import get_current_user
+    from app.middleware.jwt_cache import clear_jwt_cache, verify_jwt_cached
+
+    clear_jwt_cache()
+    for _ in range(2):
+        # A fresh app context per request, so g starts empty as it would
+        with app.app_context(), app.test_request_context('/api/auth/profile', headers=auth_headers):
+            user_id = verify_jwt_cached()
+            assert get_current_user().id == user_id
+            assert get_current_user().username == 'testuser'
+
+def test_user_row_cache(app, sample_user):
+    """Test that the auth loader cache serves reads and drops updated users"""
+    with app.app_context():
+        first = User.get_cached(sample_user.id)
+        assert first.username == 'sampleuser'
+
+        cached = User.get_cached(sample_user.id)
+        assert cached is not first
+        assert cached.email == first.email
+        assert cached not in db.session
+
+        user = db.session.get(User, sample_user.id)
+        user.username = 'renamed'
+        db.session.commit()
+
+        assert User.get_cached(sample_user.id).username == 'renamed'
+
+def test_legacy_password_hash_upgraded(app):
+    """Test that werkzeug hashes still verify and are rehashed with argon2"""
+    from werkzeug.security import generate_password_hash
+
+    with app.app_context():
+        user = User(email='legacy@example.com', username='legacy',
+                    password_hash=generate_password_hash('oldpass123'),
+                    password_hash_algo='werkzeug')
+        db.session.add(user)
+        db.session.commit()
+
+        assert not user.check_password('wrongpass')
+        assert user.password_hash_algo == 'werkzeug'
+
+        assert user.check_password('oldpass123')
+        db.session.commit()
+        assert user.password_hash_algo == 'argon2'
+        assert user.password_hash.startswith('$argon2id$')
+        assert user.check_password('oldpass123')
+
+def test_password_hasher_uses_config(app, sample_user):
+    """Test that argon2 work factors come from the app config"""
+    with app.app_context():
+        user = db.session.get(User, sample_user.id)
+        assert '$m=8192,t=1,p=1$' in user.password_hash
+        assert user.check_password('samplepass123')
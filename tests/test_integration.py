@@ -166,6 +166,106 @@ def test_watchlist_price_tracking(app, sample_user):
         assert watchlist_item.price_change == 20.00
         assert watchlist_item.price_change_percent == 10.0
 
+def test_watchlist_prices_fetched_in_batch(client, auth_headers, monkeypatch):
+    """Test that the watchlist refreshes all prices with one batched lookup"""
+    from app.routes.watchlist import refresh_watchlist_prices
+    from app.services import StockService
+
+    user = User.query.filter_by(email='test@example.com').first()
+    db.session.add_all([
+        Watchlist(user_id=user.id, ticker='TSLA', added_price=200.0, current_price=200.0),
+        Watchlist(user_id=user.id, ticker='MSFT', added_price=300.0, current_price=300.0),
+    ])
+    db.session.commit()
+
+    calls = []
+
+    def fake_infos(tickers):
+        calls.append(sorted(tickers))
+        return {'TSLA': {'current_price': 220.0}, 'MSFT': None}
+
+    monkeypatch.setattr(StockService, 'get_stock_infos', staticmethod(fake_infos))
+
+    from sqlalchemy import event
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        refresh_watchlist_prices(user.id)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert calls == [['MSFT', 'TSLA']]
+    # One read of the items and one UPDATE
+    assert sum(s.startswith('UPDATE watchlists') for s in statements) == 1
+    assert sum(s.startswith('SELECT watchlists') for s in statements) == 1
+
+    response = client.get('/api/watchlist/', headers=auth_headers)
+    assert response.status_code == 200
+    prices = {item['ticker']: item['current_price'] for item in response.get_json()['items']}
+    assert prices == {'TSLA': 220.0, 'MSFT': 300.0}
+
+def test_watchlist_refreshes_stale_prices_in_background(client, auth_headers, monkeypatch):
+    """Test that stale prices are served at once and refreshed in the background"""
+    import time
+    from datetime import timedelta
+    from app.services import StockService
+
+    user = User.query.filter_by(email='test@example.com').first()
+    item = Watchlist(user_id=user.id, ticker='TSLA', added_price=200.0, current_price=200.0,
+                     last_updated=datetime.utcnow() - timedelta(hours=1))
+    db.session.add(item)
+    db.session.commit()
+
+    calls = []
+
+    def fake_infos(tickers):
+        calls.append(tickers)
+        return {'TSLA': {'current_price': 220.0}}
+
+    monkeypatch.setattr(StockService, 'get_stock_infos', staticmethod(fake_infos))
+
+    data = client.get('/api/watchlist/', headers=auth_headers).get_json()
+    assert data['items'][0]['current_price'] == 200.0
+    assert data['prices_refreshing'] is True
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        db.session.expire_all()
+        if db.session.get(Watchlist, item.id).current_price == 220.0:
+            break
+        time.sleep(0.01)
+
+    data = client.get('/api/watchlist/', headers=auth_headers).get_json()
+    assert data['items'][0]['current_price'] == 220.0
+    assert data['prices_refreshing'] is False
+    assert calls == [['TSLA']]
+
+def test_watchlist_rejects_duplicate_ticker(client, auth_headers, monkeypatch):
+    """Test that a ticker already on the watchlist is rejected before any lookup"""
+    from app.services import StockService
+
+    calls = []
+
+    def fake_stock_info(ticker):
+        calls.append(ticker)
+        return {'company_name': 'Tesla Inc.', 'current_price': 200.0}
+
+    monkeypatch.setattr(StockService, 'get_stock_info', staticmethod(fake_stock_info))
+
+    response = client.post('/api/watchlist/', headers=auth_headers, json={'ticker': 'tsla'})
+    assert response.status_code == 201
+    user_id = User.query.filter_by(email='test@example.com').one().id
+    assert Watchlist.contains(user_id, 'TSLA')
+    assert not Watchlist.contains(user_id, 'MSFT')
+
+    response = client.post('/api/watchlist/', headers=auth_headers, json={'ticker': 'TSLA'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Stock already in watchlist'
+    assert calls == ['TSLA']
+
 def test_concurrent_transactions(app, sample_user):
     """Test handling concurrent transactions"""
     from app.services import PortfolioService
@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 from app import db
 from app.models import Portfolio, Transaction
 
@@ -153,6 +154,7 @@ def test_transaction_validation(client, auth_headers):
                           headers=auth_headers,
                           json={'ticker': 'AAPL'})
     assert response.status_code == 400
+    assert response.get_json()['fields'] == ['price', 'shares', 'transaction_type']
 
     # Invalid transaction type
     response = client.post('/api/portfolio/transaction',
@@ -163,4 +165,332 @@ def test_transaction_validation(client, auth_headers):
                               'shares': 10,
                               'price': 150.00
                           })
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+def test_portfolio_to_dict_rounding():
+    """Test generated to_dict rounds prices and defaults empty values"""
+    item = Portfolio(ticker='AAPL', shares=1.5, avg_price=150.456, total_invested=None)
+    data = item.to_dict()
+    assert list(data)[:3] == ['id', 'ticker', 'shares']
+    assert data['avg_price'] == 150.46
+    assert data['total_invested'] == 0
+    assert data['last_updated'] is None
+
+def test_request_timestamp_shared(app, sample_user):
+    """Test that rows written in one request share the request timestamp"""
+    with app.test_request_context():
+        app.preprocess_request()
+        first = Transaction(user_id=sample_user.id, ticker='AAPL', transaction_type='BUY',
+                            shares=1, price=100, total_amount=100)
+        second = Transaction(user_id=sample_user.id, ticker='MSFT', transaction_type='BUY',
+                             shares=1, price=300, total_amount=300)
+        db.session.add_all([first, second])
+        db.session.commit()
+
+        assert first.created_at == second.created_at
+        assert first.transaction_date == first.created_at
+
+        from flask import g
+        from app.models.timestamps import request_now_iso
+        assert request_now_iso() == g.request_now.isoformat()
+        assert request_now_iso() is request_now_iso()
+
+def test_transaction_invalid_ticker(client, auth_headers):
+    """Test that over-long tickers are rejected before any lookup"""
+    response = client.post('/api/portfolio/transaction',
+                          headers=auth_headers,
+                          json={
+                              'ticker': 'X' * 21,
+                              'transaction_type': 'BUY',
+                              'shares': 1,
+                              'price': 10.00
+                          })
+    assert response.status_code == 400
+
+def test_portfolio_fetches_missing_quotes_concurrently(app, sample_portfolio, monkeypatch):
+    """Test that uncached quotes are fetched in worker threads and applied"""
+    import threading
+    from app.services import PortfolioService
+    from app.services.stock_service import StockService
+
+    prices = {'AAPL': 160.00, 'MSFT': 310.00, 'GOOGL': 150.00}
+    threads = set()
+
+    def fake_stock_info(ticker):
+        threads.add(threading.current_thread().name)
+        return {'current_price': prices.get(ticker)}
+
+    monkeypatch.setattr(StockService, 'get_stock_info', staticmethod(fake_stock_info))
+
+    with app.app_context():
+        portfolio = PortfolioService.get_portfolio(sample_portfolio['user_id'])
+
+    items = {item['ticker']: item for item in portfolio['items']}
+    for ticker, item in items.items():
+        assert item['current_price'] == prices[ticker]
+    assert len(items) == 2
+    assert all(name.startswith('stock-info') for name in threads)
+
+def test_portfolio_routes_cached_token(client, auth_headers):
+    """Test that repeated requests with one token resolve the same user"""
+    client.post('/api/portfolio/transaction', headers=auth_headers, json={
+        'ticker': 'AAPL', 'transaction_type': 'BUY', 'shares': 1, 'price': 100.00
+    })
+
+    for _ in range(3):
+        response = client.get('/api/portfolio/transactions', headers=auth_headers)
+        assert response.status_code == 200
+        assert len(response.get_json()['transactions']) == 1
+
+    response = client.get('/api/portfolio/transactions',
+                          headers={'Authorization': 'Bearer not-a-token'})
+    assert response.status_code == 422
+    response = client.get('/api/portfolio/transactions')
+    assert response.status_code == 401
+
+def test_portfolio_rejects_non_integer_identity(app, client):
+    """Test that a signed token without a numeric user id is refused with 401"""
+    from flask_jwt_extended import create_access_token
+
+    with app.test_request_context():
+        token = create_access_token(identity='not-a-number')
+
+    # The JWT user loader cannot resolve it, so the view never runs
+    response = client.get('/api/portfolio/', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 401
+
+def test_portfolio_transactions_etag(client, auth_headers):
+    """Test that unchanged GET responses are answered with 304"""
+    client.post('/api/portfolio/transaction', headers=auth_headers, json={
+        'ticker': 'AAPL', 'transaction_type': 'BUY', 'shares': 1, 'price': 100.00
+    })
+
+    response = client.get('/api/portfolio/transactions', headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert 'private' in response.headers['Cache-Control']
+
+    response = client.get('/api/portfolio/transactions',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+    # A new transaction changes the body and therefore the ETag
+    client.post('/api/portfolio/transaction', headers=auth_headers, json={
+        'ticker': 'MSFT', 'transaction_type': 'BUY', 'shares': 1, 'price': 300.00
+    })
+    response = client.get('/api/portfolio/transactions',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+
+def test_etag_of_compressed_response_revalidates(client, auth_headers):
+    """Test that ETags with a content-coding suffix (from Flask-Compress) still give 304"""
+    client.post('/api/portfolio/transaction', headers=auth_headers, json={
+        'ticker': 'AAPL', 'transaction_type': 'BUY', 'shares': 1, 'price': 100.00
+    })
+    etag = client.get('/api/portfolio/transactions', headers=auth_headers).headers['ETag']
+    bare = etag.split(':')[0].rstrip('"') + '"'
+
+    for tag in (f'{bare[:-1]}:gzip"', f'{bare[:-1]}:br"', f'W/{bare[:-1]}:gzip"'):
+        response = client.get('/api/portfolio/transactions',
+                              headers={**auth_headers, 'If-None-Match': tag})
+        assert response.status_code == 304
+
+def test_compressed_response_revalidates(client, auth_headers):
+    """Test that a gzip response's ETag is answered with 304 when sent back"""
+    pytest.importorskip('flask_compress')
+    for ticker in ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'NFLX'):
+        client.post('/api/portfolio/transaction', headers=auth_headers, json={
+            'ticker': ticker, 'transaction_type': 'BUY', 'shares': 1, 'price': 100.00,
+            'notes': 'x' * 200
+        })
+
+    headers = {**auth_headers, 'Accept-Encoding': 'gzip'}
+    response = client.get('/api/portfolio/transactions', headers=headers)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'].endswith(':gzip"')
+
+    response = client.get('/api/portfolio/transactions',
+                          headers={**headers, 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+def test_jsonify_writes_orjson_bytes(app):
+    """jsonify responses are encoded in one pass with numpy values and a trailing newline"""
+    np = pytest.importorskip('numpy')
+    with app.test_request_context():
+        response = app.json.response({'volatility': np.float64(0.25), 'tickers': ['AAPL']})
+    assert response.mimetype == 'application/json'
+    assert response.get_data() == b'{"tickers":["AAPL"],"volatility":0.25}\n'
+
+def test_add_transaction_empty_json_body(client, auth_headers):
+    """An empty JSON body is treated as {} and reports the missing fields"""
+    response = client.post('/api/portfolio/transaction',
+                          headers=auth_headers,
+                          data=b'',
+                          content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Missing required fields: price, shares, ticker, transaction_type'
+
+def test_get_transactions_limit_bounds(client, auth_headers, monkeypatch):
+    """The transactions limit is clamped and rejects non-integers"""
+    from app.services import PortfolioService
+    limits = []
+    monkeypatch.setattr(PortfolioService, 'get_transactions',
+                        lambda user_id, ticker, limit: limits.append(limit) or [])
+
+    assert client.get('/api/portfolio/transactions?limit=10000000', headers=auth_headers).status_code == 200
+    assert client.get('/api/portfolio/transactions?limit=0', headers=auth_headers).status_code == 200
+    assert limits == [500, 1]
+
+    response = client.get('/api/portfolio/transactions?limit=lots', headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'limit must be an integer'
+
+def test_risk_analytics_cached_and_coalesced(app, monkeypatch):
+    """Concurrent risk requests share one calculation and the result is reused until invalidated"""
+    import threading
+    from app.services import PortfolioService
+
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_risk_analytics(user_id):
+        calls.append(user_id)
+        started.set()
+        release.wait(5)
+        return {'sharpe_ratio': 1.5}
+
+    monkeypatch.setattr(PortfolioService, 'get_risk_analytics', fake_risk_analytics)
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(PortfolioService.get_risk_analytics_cached(7)))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(PortfolioService.get_risk_analytics_cached(7)))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == [{'sharpe_ratio': 1.5}, {'sharpe_ratio': 1.5}]
+    assert PortfolioService.get_risk_analytics_cached(7) == {'sharpe_ratio': 1.5}
+    assert calls == [7]
+
+    PortfolioService.invalidate_risk_analytics(7)
+    PortfolioService.get_risk_analytics_cached(7)
+    assert calls == [7, 7]
+
+def test_cors_preflight_cacheable(client):
+    """Preflight responses tell browsers how long they may be reused"""
+    response = client.options('/api/portfolio/transactions', headers={
+        'Origin': 'https://app.example.com',
+        'Access-Control-Request-Method': 'GET',
+        'Access-Control-Request-Headers': 'Authorization'
+    })
+    assert response.status_code == 200
+    assert response.headers['Access-Control-Max-Age'] == '600'
+
+def test_portfolio_blueprint_requires_token(client):
+    """Every portfolio route is guarded by the blueprint's token check"""
+    assert client.get('/api/portfolio/').status_code == 401
+    assert client.get('/api/portfolio/risk-analytics').status_code == 401
+    assert client.post('/api/portfolio/transaction', json={}).status_code == 401
+
+def test_risk_metrics_match_individual_calculations():
+    """The fused calculate_all_metrics agrees with the per-metric methods"""
+    import numpy as np
+    from app.services.risk_analytics import RiskAnalytics
+
+    rng = np.random.default_rng(42)
+    returns = rng.normal(0.0005, 0.01, 180)
+    values = 10000 * np.cumprod(1 + returns)
+    market = rng.normal(0.0004, 0.009, 200)
+
+    metrics = RiskAnalytics.calculate_all_metrics(values, returns, market)
+    beta = RiskAnalytics.calculate_beta(returns, market)
+    expected = {
+        'sharpe_ratio': RiskAnalytics.calculate_sharpe_ratio(returns),
+        'sortino_ratio': RiskAnalytics.calculate_sortino_ratio(returns),
+        'var_95': RiskAnalytics.calculate_var(returns, 0.95),
+        'var_99': RiskAnalytics.calculate_var(returns, 0.99),
+        'cvar_95': RiskAnalytics.calculate_cvar(returns, 0.95),
+        'volatility': float(returns.std() * np.sqrt(252)),
+        'beta': beta,
+        'alpha': RiskAnalytics.calculate_alpha(returns, market, beta),
+        'information_ratio': RiskAnalytics.calculate_information_ratio(returns, market),
+        **RiskAnalytics.calculate_max_drawdown(values),
+    }
+    for key, value in expected.items():
+        assert metrics[key] == pytest.approx(value), key
+
+    # Longest stretch below the running peak
+    drawdown = RiskAnalytics.calculate_max_drawdown(np.array([10.0, 9, 11, 10, 9, 12, 11]))
+    assert drawdown['max_drawdown_duration'] == 2
+    assert drawdown['current_drawdown'] == pytest.approx(-1 / 12)
+
+def test_drawdown_kernel_matches_numpy():
+    """The single-pass drawdown kernel agrees with the NumPy calculation"""
+    import numpy as np
+    from app.services import risk_analytics
+    from app.services.risk_analytics import RiskAnalytics
+
+    rng = np.random.default_rng(7)
+    values = 10000 * np.cumprod(1 + rng.normal(0.0003, 0.012, 500))
+
+    max_drawdown, max_duration, current_drawdown = risk_analytics._drawdown_loop(values)
+    with patch.object(risk_analytics, '_drawdown_kernel', None):
+        expected = RiskAnalytics.calculate_max_drawdown(values)
+
+    assert max_drawdown == pytest.approx(expected['max_drawdown'])
+    assert max_duration == expected['max_drawdown_duration']
+    assert current_drawdown == pytest.approx(expected['current_drawdown'])
+
+@pytest.mark.parametrize('values', [
+    [0.0, 0.0, 5.0, 4.0, 6.0],       # leading zero peak
+    [0.0, -1.0, 2.0, 1.0],           # below a zero peak
+    [10.0, 9.0, float('nan'), 12.0, 11.0],
+    [10.0, 8.0, 9.0, float('nan')],
+])
+def test_drawdown_kernel_matches_numpy_edge_cases(values):
+    """Zero peaks and NaN values come out of the kernel as they do from NumPy"""
+    import numpy as np
+    from app.services import risk_analytics
+    from app.services.risk_analytics import RiskAnalytics
+
+    values = np.array(values)
+    max_drawdown, max_duration, current_drawdown = risk_analytics._drawdown_loop(values)
+    with patch.object(risk_analytics, '_drawdown_kernel', None), np.errstate(all='ignore'):
+        expected = RiskAnalytics.calculate_max_drawdown(values)
+
+    assert max_drawdown == pytest.approx(expected['max_drawdown'], nan_ok=True)
+    assert max_duration == expected['max_drawdown_duration']
+    assert current_drawdown == pytest.approx(expected['current_drawdown'], nan_ok=True)
+
+def test_queue_logging_defers_handlers():
+    """Records reach the original handlers through the listener thread"""
+    import atexit
+    import logging
+    from app.log_queue import enable_queue_logging
+
+    class Collect(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(self.format(record))
+
+    logger = logging.getLogger('test_queue_logging')
+    collector = Collect()
+    logger.addHandler(collector)
+    listener = enable_queue_logging(logger)
+    try:
+        assert collector not in logger.handlers
+        logger.warning('queued %s', 'message')
+    finally:
+        atexit.unregister(listener.stop)
+        listener.stop()
+        logger.handlers.clear()
+
+    assert collector.messages == ['queued message']
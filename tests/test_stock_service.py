@@ -157,4 +157,589 @@ def test_caching(mock_cache, app):
 
             # FallbackDataService should not be called if cache hit
             mock_quote.assert_not_called()
-            assert result['current_price'] == 150.00
\ No newline at end of file
+            assert result['current_price'] == 150.00
+
+
+def test_stock_cache_bulk_upsert(app):
+    """Test that bulk cache writes insert new rows and update existing ones"""
+    from app.models import StockCache
+
+    with app.app_context():
+        StockCache.set_cache('AAPL', {'current_price': 150.00}, 'info')
+        assert StockCache.get_cached('AAPL', 'info')['current_price'] == 150.00
+
+        written = StockCache.set_cache_bulk([
+            {'ticker': 'AAPL', 'data': {'current_price': 155.00}, 'data_type': 'info'},
+            {'ticker': 'MSFT', 'data': {'current_price': 300.00}, 'data_type': 'info'},
+            {'ticker': 'MSFT', 'data': {'current_price': 301.00}, 'data_type': 'info'}
+        ])
+
+        assert written == 2
+        assert StockCache.query.count() == 2
+        assert StockCache.get_cached('AAPL', 'info')['current_price'] == 155.00
+        assert StockCache.get_cached('MSFT', 'info')['current_price'] == 301.00
+
+def test_historical_price_bulk_copy(app):
+    """Test that bulk price inserts skip existing dates and updates still apply"""
+    from app.models import HistoricalPrice
+    from app.services.historical_data_service import HistoricalDataService
+
+    with app.app_context():
+        inserted = HistoricalPrice.bulk_copy([
+            {'ticker': 'AAPL', 'date': '2024-01-02', 'close': 185.64, 'volume': 82488700},
+            {'ticker': 'AAPL', 'date': '2024-01-03', 'close': 184.25}
+        ])
+        assert inserted == 2
+
+        stored = HistoricalDataService._store_data('AAPL', [
+            {'date': '2024-01-03', 'close': 184.00},
+            {'date': '2024-01-04', 'close': 181.91}
+        ], 'twelve_data')
+
+        assert stored
+        assert HistoricalPrice.query.filter_by(ticker='AAPL').count() == 3
+        jan3 = HistoricalPrice.query.filter_by(ticker='AAPL', date=HistoricalPrice.parse_date('2024-01-03')).one()
+        assert jan3.close == 184.00
+        assert jan3.source == 'twelve_data'
+
+def test_stock_cache_shared_cache(app):
+    """Test that cache reads are shared via Flask-Caching and invalidated on write"""
+    from flask import g
+    from app import db
+    from app.models import StockCache
+
+    with app.app_context():
+        StockCache.set_cache('AAPL', {'current_price': 150.00}, 'info')
+        g.pop('_stockcache', None)
+        assert StockCache.get_cached('AAPL', 'info')['current_price'] == 150.00
+
+        # Served from the shared cache without touching the table
+        StockCache.query.delete()
+        db.session.commit()
+        g.pop('_stockcache', None)
+        assert StockCache.get_cached('AAPL', 'info')['current_price'] == 150.00
+
+        StockCache.set_cache('AAPL', {'current_price': 151.00}, 'info')
+        g.pop('_stockcache', None)
+        assert StockCache.get_cached('AAPL', 'info')['current_price'] == 151.00
+
+def test_stock_cache_shared_invalidation_after_commit(app, monkeypatch):
+    """Test that shared cache entries are only dropped once the new row is committed"""
+    from app import cache, db
+    from app.models import StockCache
+
+    seen = []
+    delete_many = cache.delete_many
+
+    def checking_delete_many(*keys):
+        # A reader in another worker at this point must find the new row
+        with db.engine.connect() as conn:
+            seen.append(conn.execute(db.select(StockCache.data)).scalar_one())
+        return delete_many(*keys)
+
+    with app.app_context():
+        StockCache.set_cache('AAPL', {'current_price': 150.00}, 'info')
+        monkeypatch.setattr(cache, 'delete_many', checking_delete_many)
+        StockCache.set_cache('AAPL', {'current_price': 151.00}, 'info')
+
+    assert seen == [{'current_price': 151.00}]
+
+def test_stock_cache_write_through(app):
+    """Test that a write is visible to the same request without a SELECT"""
+    from app.models import StockCache
+
+    with app.app_context():
+        StockCache.set_cache('MSFT', {'current_price': 300.00}, 'quote')
+        StockCache.query.delete()
+
+        assert StockCache.get_cached('MSFT', 'quote')['current_price'] == 300.00
+
+def test_ticker_url_converter(app):
+    """Test that ticker URL segments are normalized and length-checked"""
+    from app.models.tickers import normalize_ticker
+
+    assert normalize_ticker(' sap.de ') == 'SAP.DE'
+    assert normalize_ticker('X' * 21) is None
+
+    with app.test_request_context():
+        adapter = app.url_map.bind('localhost')
+        endpoint, args = adapter.match('/api/stock/aapl/history')
+        assert endpoint == 'stock.get_price_history'
+        assert args == {'ticker': 'AAPL'}
+        assert app.test_client().get('/api/stock/' + 'X' * 21).status_code == 404
+
+def test_stock_cache_bulk_lookup(app):
+    """Test that bulk lookups return hits and misses and fill the request cache"""
+    from flask import g
+    from app.models import StockCache
+
+    with app.app_context():
+        StockCache.set_cache_bulk([
+            {'ticker': 'AAPL', 'data': {'current_price': 150.00}, 'data_type': 'info'},
+            {'ticker': 'MSFT', 'data': {'current_price': 300.00}, 'data_type': 'info'}
+        ])
+        g.pop('_stockcache', None)
+
+        cached = StockCache.get_cached_bulk(['AAPL', 'MSFT', 'TSLA', 'AAPL'], 'info')
+        assert cached == {
+            'AAPL': {'current_price': 150.00},
+            'MSFT': {'current_price': 300.00},
+            'TSLA': None
+        }
+        assert ('TSLA', 'info') in g._stockcache
+        assert StockCache.get_cached('MSFT', 'info')['current_price'] == 300.00
+
+def test_financial_score_cached(app):
+    """Test that financial scores are served from the cache after one API call"""
+    from app.services.fmp_service import FMPService
+
+    payload = [{'symbol': 'AAPL', 'piotroskiScore': 8, 'altmanZScore': 5.2}]
+    with app.app_context():
+        with patch.object(FMPService, '_make_request', return_value=payload) as mock_request:
+            first = FMPService.get_financial_score('aapl')
+            second = FMPService.get_financial_score('AAPL')
+
+        assert first == second
+        assert second['piotroskiScore'] == 8
+        assert mock_request.call_count == 1
+
+def test_financial_ratios_cached(app):
+    """Test that TTM ratios are served from the cache after one API call"""
+    from app.services.fmp_service import FMPService
+
+    payload = [{'currentRatioTTM': 1.1, 'returnOnEquityTTM': 1.5}]
+    with app.app_context():
+        with patch.object(FMPService, '_make_request', return_value=payload) as mock_request:
+            assert FMPService.get_financial_ratios('MSFT') == payload[0]
+            assert FMPService.get_financial_ratios('msft') == payload[0]
+
+        assert mock_request.call_count == 1
+
+def test_financial_route_reuses_encoded_body(app):
+    """Test that the ratios endpoint serves a repeated ticker from the response cache"""
+    from app.services.fmp_service import FMPService
+
+    client = app.test_client()
+    with patch.object(FMPService, 'get_financial_ratios',
+                      return_value={'currentRatioTTM': 1.1}) as mock_ratios:
+        first = client.get('/api/financial/ratios/nvda')
+        second = client.get('/api/financial/ratios/NVDA')
+
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert second.get_json() == {'currentRatioTTM': 1.1}
+    assert mock_ratios.call_count == 1
+
+def test_screener_criteria_parsing(client):
+    """Test screener criteria defaults, coercion and validation"""
+    from app.routes.screener import parse_criteria
+
+    criteria = parse_criteria({'min_pe_ratio': '5', 'sectors': 'Technology',
+                               'only_profitable': 'true', 'limit': 500, 'max_beta': None})
+    assert criteria['min_pe_ratio'] == 5.0
+    assert criteria['sectors'] == ['Technology']
+    assert criteria['only_profitable'] is True
+    assert criteria['prefer_value'] is False
+    assert criteria['limit'] == 100
+    assert criteria['market'] == 'USA'
+    assert 'max_beta' not in criteria
+
+    response = client.post('/api/screener/', json={'min_price': 'cheap'})
+    assert response.status_code == 400
+
+def test_apply_preset_screen_lookup(client):
+    """Test that presets are found by URL name and unknown names give 404"""
+    with patch('app.routes.screener.ScreenerService.screen_stocks', return_value=[]) as mock_screen:
+        response = client.post('/api/screener/presets/Value_Stocks')
+        assert response.status_code == 200
+        assert response.get_json()['preset'] == 'Value Stocks'
+        assert mock_screen.call_args[0][0]['max_pe_ratio'] == 15
+
+    response = client.post('/api/screener/presets/no_such_preset')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Preset not found'}
+    assert client.post('/api/screener/presets/no_such_preset').data == response.data
+
+def test_screen_results_cached_by_criteria(client):
+    """Identical screens reuse the cached result regardless of key order"""
+    results = [{'ticker': 'AAPL', 'market_cap': 3e12}]
+    with patch('app.routes.screener.ScreenerService.screen_stocks', return_value=results) as mock_screen:
+        first = client.post('/api/screener/', json={'min_price': 10, 'sort_by': 'price'})
+        second = client.post('/api/screener/', json={'sort_by': 'price', 'min_price': 10.0})
+        client.post('/api/screener/', json={'min_price': 20})
+
+    assert first.get_json()['results'] == second.get_json()['results'] == results
+    assert mock_screen.call_count == 2
+
+def test_static_screener_responses(client):
+    """Test that sectors and presets are served from pre-encoded bodies"""
+    first = client.get('/api/screener/sectors')
+    second = client.get('/api/screener/sectors')
+    assert first.status_code == 200
+    assert first.data == second.data
+    assert 'Technology' in second.get_json()['sectors']
+
+    response = client.get('/api/screener/presets')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert any(p['name'] == 'Value Stocks' for p in response.get_json()['presets'])
+
+def test_batch_quotes_fetched_concurrently(client, monkeypatch):
+    """Test that batch quotes fetch each distinct ticker once on the worker pool"""
+    import threading
+
+    calls = []
+
+    def fake_stock_info(ticker):
+        calls.append((ticker, threading.current_thread().name))
+        return {'company_name': ticker, 'current_price': 110.0, 'previous_close': 100.0}
+
+    monkeypatch.setattr(StockService, 'get_stock_info', staticmethod(fake_stock_info))
+
+    response = client.post('/api/stock/batch', json={'tickers': ['AAPL', 'MSFT', 'AAPL']})
+    assert response.status_code == 200
+    quotes = response.get_json()['quotes']
+    assert set(quotes) == {'AAPL', 'MSFT'}
+    assert quotes['MSFT']['change_percent'] == pytest.approx(10.0)
+    assert sorted(ticker for ticker, _ in calls) == ['AAPL', 'MSFT']
+    assert all(name.startswith('stock-info') for _, name in calls)
+
+def test_batch_quotes_change_without_previous_close(client, monkeypatch):
+    """Test that batch quotes report no percent change without a previous close"""
+    infos = {
+        'AAPL': {'current_price': 110.0, 'previous_close': 100.0},
+        'MSFT': {'current_price': 50.0, 'previous_close': None},
+        'NVDA': {'current_price': None, 'previous_close': 20.0},
+    }
+    monkeypatch.setattr(StockService, 'get_stock_info', staticmethod(lambda ticker: infos[ticker]))
+
+    response = client.post('/api/stock/batch', json={'tickers': list(infos)})
+    quotes = response.get_json()['quotes']
+    assert quotes['AAPL']['change'] == pytest.approx(10.0)
+    assert quotes['MSFT']['change'] == pytest.approx(50.0)
+    assert quotes['MSFT']['change_percent'] == 0
+    assert quotes['NVDA']['change'] == pytest.approx(-20.0)
+    assert quotes['NVDA']['change_percent'] == pytest.approx(-100.0)
+
+def test_stock_info_prefetches_analysis_inputs(app, client, monkeypatch):
+    """Test that a stock page load warms the AI analysis inputs once"""
+    import threading
+    import time
+    from app import cache
+    from app.services.news_service import NewsService
+    from app.services.short_data_service import ShortDataService
+    from app.services.shared_cache import shared_cache_key, shared_cached
+
+    fetched = []
+    done = threading.Semaphore(0)
+
+    def record(name, value):
+        def fetch(*args, **kwargs):
+            fetched.append(name)
+            done.release()
+            return value
+        return fetch
+
+    app.config['STOCK_PREFETCH'] = True
+    monkeypatch.setattr(StockService, 'get_stock_info', staticmethod(lambda ticker: {'ticker': ticker}))
+    monkeypatch.setattr(StockService, 'calculate_technical_indicators', staticmethod(lambda ticker: None))
+    monkeypatch.setattr(StockService, 'get_fundamental_analysis', staticmethod(lambda ticker: None))
+    monkeypatch.setattr(NewsService, 'get_aggregated_sentiment',
+                        staticmethod(shared_cached('news_sentiment', 60)(record('news', {'score': 0.1}))))
+    monkeypatch.setattr(ShortDataService, 'get_short_data',
+                        classmethod(shared_cached('short', 60)(record('short', {'short_interest': 5}))))
+
+    assert client.get('/api/stock/PFX').status_code == 200
+    assert client.get('/api/stock/PFX').status_code == 200
+    assert done.acquire(timeout=5) and done.acquire(timeout=5)
+    assert sorted(fetched) == ['news', 'short']
+
+    with app.app_context():
+        # The fetch returns just before its result is stored
+        keys = [shared_cache_key('news_sentiment', 'PFX', 7), shared_cache_key('short', 'PFX')]
+        deadline = time.monotonic() + 5
+        while None in cache.get_many(*keys) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert NewsService.get_aggregated_sentiment('PFX', days=7) == {'score': 0.1}
+        assert ShortDataService.get_short_data('PFX') == {'short_interest': 5}
+    assert sorted(fetched) == ['news', 'short']
+
+def test_ai_analysis_fetches_inputs_concurrently(client, monkeypatch):
+    """Test that the AI analysis inputs are fetched on the analysis pool"""
+    import threading
+    from app.services import AIService, ai_service
+    from app.services.news_service import NewsService
+    from app.services.short_data_service import ShortDataService
+
+    threads = {}
+
+    def record(name, value):
+        def fetch(*args, **kwargs):
+            threads[name] = threading.current_thread().name
+            return value
+        return fetch
+
+    monkeypatch.setattr(StockService, 'get_stock_info',
+                        staticmethod(lambda ticker: {'ticker': ticker, 'current_price': 100.0, 'volume': 1000}))
+    monkeypatch.setattr(StockService, 'calculate_technical_indicators', staticmethod(record('technical', {'rsi': 50})))
+    monkeypatch.setattr(StockService, 'get_fundamental_analysis', staticmethod(record('fundamental', {'score': 70})))
+    monkeypatch.setattr(NewsService, 'get_aggregated_sentiment', staticmethod(record('news', {'score': 0.2})))
+    monkeypatch.setattr(ShortDataService, 'get_short_data', record('short', None))
+
+    captured = {}
+
+    def fake_analyze(self, stock_data, technical, fundamental, short_data, news_sentiment):
+        captured.update(technical=technical, fundamental=fundamental, news=news_sentiment)
+        return {'recommendation': 'HOLD'}
+
+    monkeypatch.setattr(AIService, 'analyze_stock_with_ai', fake_analyze)
+    monkeypatch.setattr(AIService, '__init__', lambda self: None)
+    monkeypatch.setattr(ai_service, '_shared_ai_service', None)
+
+    response = client.get('/api/stock/AAPL/analyze-with-ai')
+    assert response.status_code == 200
+    assert response.get_json()['news_sentiment'] == {'score': 0.2}
+    assert captured == {'technical': {'rsi': 50}, 'fundamental': {'score': 70}, 'news': {'score': 0.2}}
+    assert set(threads) == {'technical', 'fundamental', 'news', 'short'}
+    assert all(name.startswith('stock-analysis') for name in threads.values())
+
+def test_ai_recommendations_analyzed_concurrently(client, monkeypatch):
+    """Test that recommendation inputs missing from the cache are computed on the info pool"""
+    import threading
+
+    threads = set()
+    scores = {'AAPL': 90, 'MSFT': 80, 'GOOGL': 80, 'AMZN': 80, 'NVDA': 80,
+              'META': 20, 'TSLA': 20, 'JPM': 20}
+
+    def fake_fundamental(ticker):
+        threads.add(threading.current_thread().name)
+        return {'overall_score': scores.get(ticker, 50)}
+
+    monkeypatch.setattr(StockService, 'get_stock_info',
+                        staticmethod(lambda ticker: {'company_name': ticker, 'current_price': 10.0}))
+    # Decorated like the real methods, which the route looks up in bulk
+    from app.services.shared_cache import shared_cached
+    monkeypatch.setattr(StockService, 'get_fundamental_analysis',
+                        staticmethod(shared_cached('fundamental', 60)(fake_fundamental)))
+    monkeypatch.setattr(StockService, 'calculate_technical_indicators',
+                        staticmethod(shared_cached('technical', 60)(lambda ticker: None)))
+
+    response = client.post('/api/stock/ai-recommendations')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['analyzed_count'] == 15
+    assert data['top_buys'][0]['ticker'] == 'AAPL'
+    assert data['top_buys'][0]['market'] == 'US'
+    assert len(data['top_buys']) == 5 and len(data['top_sells']) == 3
+    assert data['using_mock_data'] is False
+    assert threads and all(name.startswith('stock-info') for name in threads)
+
+    # A second request finds every fundamental in the shared cache
+    threads.clear()
+    assert client.post('/api/stock/ai-recommendations').status_code == 200
+    assert not threads
+
+def test_ai_recommendations_stream(client, monkeypatch):
+    """Test that streamed recommendations arrive as events before the summary"""
+    import json
+    from app.services.shared_cache import shared_cached
+
+    scores = {'AAPL': 90, 'MSFT': 80, 'GOOGL': 80, 'AMZN': 80, 'NVDA': 80,
+              'META': 20, 'TSLA': 20, 'JPM': 20}
+    monkeypatch.setattr(StockService, 'get_stock_info',
+                        staticmethod(lambda ticker: {'company_name': ticker, 'current_price': 10.0}))
+    monkeypatch.setattr(StockService, 'get_fundamental_analysis',
+                        staticmethod(shared_cached('fundamental', 60)(
+                            lambda ticker: {'overall_score': scores.get(ticker, 50)})))
+    monkeypatch.setattr(StockService, 'calculate_technical_indicators',
+                        staticmethod(shared_cached('technical', 60)(lambda ticker: None)))
+
+    response = client.post('/api/stock/ai-recommendations/stream')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+
+    events = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        event, data = block.split('\n')
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+
+    assert [name for name, _ in events] == ['recommendation'] * 15 + ['summary']
+    summary = events[-1][1]
+    assert summary['analyzed_count'] == 15
+    assert summary['top_buys'][0]['ticker'] == 'AAPL'
+    assert len(summary['top_buys']) == 5 and len(summary['top_sells']) == 3
+
+def test_recommendation_screens_run_concurrently(client):
+    """Test that the three recommendation screens run on the analysis pool"""
+    import threading
+
+    threads = []
+
+    def fake_screen(criteria):
+        threads.append(threading.current_thread().name)
+        return [{'ticker': criteria['sort_by']}] * 4
+
+    with patch('app.services.screener_service.ScreenerService.screen_stocks', side_effect=fake_screen):
+        response = client.get('/api/stock/recommendations')
+
+    assert response.status_code == 200
+    recommendations = response.get_json()['recommendations']
+    assert len(recommendations['value_picks']) == 3
+    assert recommendations['dividend_picks'][0]['ticker'] == 'dividend_yield'
+    assert len(threads) == 3 and all(name.startswith('stock-analysis') for name in threads)
+
+def test_compare_stocks_fetches_concurrently(client, monkeypatch):
+    """Test that compare fans every ticker's calls out to the analysis pool"""
+    import threading
+
+    threads = set()
+
+    def record(value):
+        def fetch(ticker, *args):
+            threads.add(threading.current_thread().name)
+            return value(ticker) if callable(value) else value
+        return fetch
+
+    history = {'data': [{'date': '2025-01-01', 'close': 100, 'volume': 5},
+                        {'date': '2025-01-02', 'close': 110, 'volume': 6}]}
+    monkeypatch.setattr(StockService, 'get_stock_info',
+                        staticmethod(record(lambda t: None if t == 'BAD' else {'company_name': t})))
+    monkeypatch.setattr(StockService, 'get_fundamental_analysis', staticmethod(record({'overall_score': 60})))
+    monkeypatch.setattr(StockService, 'calculate_technical_indicators', staticmethod(record({'rsi': 55})))
+    monkeypatch.setattr(StockService, 'get_price_history', staticmethod(record(history)))
+
+    response = client.post('/api/stock/compare', json={'tickers': ['AAPL', 'BAD', 'MSFT']})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [row['ticker'] for row in data['comparison']] == ['AAPL', 'MSFT']
+    assert data['price_histories'][1]['data'][1]['normalized'] == pytest.approx(10.0)
+    assert data['price_histories'][0]['data'][1] == {
+        'date': '2025-01-02', 'close': 110.0, 'normalized': pytest.approx(10.0), 'volume': 6
+    }
+    assert threads and all(name.startswith('stock-analysis') for name in threads)
+
+def test_search_stocks_uses_cached_info(client):
+    """Test that search matches known tickers and reads their cached info in bulk"""
+    from app.models import StockCache
+    StockCache.set_cache('AAPL', {'company_name': 'Apple Inc.', 'exchange': 'NASDAQ',
+                                  'sector': 'Technology'}, 'info')
+
+    response = client.get('/api/stock/search?q=aap')
+    assert response.status_code == 200
+    assert response.get_json()['results'] == [{
+        'ticker': 'AAPL', 'company_name': 'Apple Inc.', 'exchange': 'NASDAQ', 'sector': 'Technology'
+    }]
+
+    # Known suggestions stay available without cached info or provider calls
+    StockCache.query.delete()
+    with patch.object(StockService, 'get_stock_info') as mock_info:
+        results = client.get('/api/stock/search?q=aap').get_json()['results']
+        assert results[0]['company_name'] == 'Apple Inc.'
+        results = client.get('/api/stock/search?q=sap.de').get_json()['results']
+        assert results == [{'ticker': 'SAP.DE', 'company_name': 'SAP.DE', 'exchange': 'XETRA', 'sector': None}]
+        mock_info.assert_not_called()
+
+    assert client.get('/api/stock/search?q=a').status_code == 400
+
+def test_price_history_shared_cache(app):
+    """Test that price history is memoized across positional and keyword calls"""
+    history = {'data': [{'date': '2025-01-01', 'close': 100}], 'source': 'test'}
+    with patch('app.services.historical_data_service.HistoricalDataService.get_historical_data',
+               return_value=history) as mock_history:
+        assert StockService.get_price_history('AAPL', '6mo') == history
+        assert StockService.get_price_history('AAPL', period='6mo') == history
+        assert mock_history.call_count == 1
+
+        StockService.get_price_history('AAPL')
+        assert mock_history.call_count == 2
+
+def test_provider_calls_share_http_session():
+    """Test that provider calls reuse one pooled keep-alive session"""
+    from app.services import news_service, stock_service
+    from app.services.http_client import UPSTREAM_CONCURRENCY, http_session
+
+    assert stock_service.http_session is http_session
+    assert news_service.http_session is http_session
+    assert http_session.get_adapter('https://finnhub.io')._pool_maxsize == UPSTREAM_CONCURRENCY
+
+def test_upstream_requests_capped_per_host(monkeypatch):
+    """Test that concurrent requests to one host wait for a free slot"""
+    import threading
+    import time
+    import requests
+    from app.services.http_client import ThrottledSession
+
+    active = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def fake_request(self, method, url, *args, **kwargs):
+        with lock:
+            active[url] = active.get(url, 0) + 1
+            peak[url] = max(peak.get(url, 0), active[url])
+        time.sleep(0.02)
+        with lock:
+            active[url] -= 1
+
+    monkeypatch.setattr(requests.Session, 'request', fake_request)
+    session = ThrottledSession(2)
+    urls = ['https://a.example/q', 'https://b.example/q'] * 6
+    threads = [threading.Thread(target=session.get, args=(url,)) for url in urls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == {'https://a.example/q': 2, 'https://b.example/q': 2}
+
+def test_ai_service_shared():
+    """Test that AI analysis reuses one service instance"""
+    from app.services.ai_service import get_ai_service
+
+    assert get_ai_service() is get_ai_service()
+
+def test_large_responses_compressed(client, monkeypatch):
+    """Test that large JSON responses are gzip-encoded for clients that accept it"""
+    import gzip
+    import json
+    pytest.importorskip('flask_compress')
+
+    points = [{'date': f'2025-01-{day:02d}', 'close': 100.0 + day, 'volume': 1000} for day in range(1, 29)]
+    monkeypatch.setattr(StockService, 'get_price_history',
+                        staticmethod(lambda ticker, period='1y': {'data': points * 10}))
+
+    response = client.get('/api/stock/AAPL/history', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data))['data'][0] == points[0]
+
+    response = client.get('/api/stock/AAPL/history')
+    assert 'Content-Encoding' not in response.headers
+
+def test_stock_info_misses_share_one_fetch(app, monkeypatch):
+    """Test that concurrent cache misses for one ticker fetch it only once"""
+    import threading
+    import time
+
+    calls = []
+
+    def slow_load(ticker):
+        calls.append(ticker)
+        time.sleep(0.1)
+        return {'ticker': ticker, 'current_price': 10.0}
+
+    monkeypatch.setattr(StockService, '_load_stock_info', staticmethod(slow_load))
+    results = []
+
+    def fetch():
+        with app.app_context():
+            results.append(StockService.get_stock_info('COAL'))
+
+    threads = [threading.Thread(target=fetch) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ['COAL']
+    assert results == [{'ticker': 'COAL', 'current_price': 10.0}] * 5
+    assert len({id(result) for result in results}) == 5